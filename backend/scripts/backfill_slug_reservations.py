@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Create SLUG#{slug} reservation items for blogs written before slugs were reserved.
+
+Blogs now claim their slug in the same transaction that writes them, and
+slug lookups read only the reservation. Run this once after deploying, before
+relying on slug URLs. Reservations that already exist are left alone, and two
+blogs sharing a slug (possible under the old check) are reported instead of
+overwritten. Safe to re-run.
+
+Usage: DATA_TABLE=<table> python scripts/backfill_slug_reservations.py [--dry-run]
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from db.codec import to_item
+from db.dynamodb import dynamodb, get_table_name, BLOG_PREFIX, SLUG_PREFIX, METADATA_SK
+
+
+def backfill(dry_run):
+    table_name = get_table_name('DATA_TABLE')
+    scan_kwargs = {
+        'TableName': table_name,
+        'FilterExpression': 'SK = :meta AND begins_with(PK, :blog) AND attribute_exists(slug)',
+        'ProjectionExpression': 'blogId, slug',
+        'ExpressionAttributeValues': {':meta': {'S': METADATA_SK}, ':blog': {'S': BLOG_PREFIX}}
+    }
+
+    scanned = created = conflicts = 0
+    while True:
+        response = dynamodb.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            scanned += 1
+            blog_id, slug = item['blogId']['S'], item['slug']['S']
+            if not slug or dry_run:
+                continue
+            try:
+                dynamodb.put_item(
+                    TableName=table_name,
+                    Item=to_item({'PK': f'{SLUG_PREFIX}{slug}', 'SK': METADATA_SK, 'blogId': blog_id}),
+                    ConditionExpression='attribute_not_exists(PK)'
+                )
+                created += 1
+            except dynamodb.exceptions.ConditionalCheckFailedException:
+                owner = dynamodb.get_item(
+                    TableName=table_name,
+                    Key={'PK': {'S': f'{SLUG_PREFIX}{slug}'}, 'SK': {'S': METADATA_SK}},
+                    ConsistentRead=True
+                )['Item']['blogId']['S']
+                if owner != blog_id:
+                    conflicts += 1
+                    print(f"Slug '{slug}' is reserved by {owner}; {blog_id} needs a new slug")
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    if dry_run:
+        print(f"Scanned {scanned} blogs (dry run, nothing written)")
+    else:
+        print(f"Scanned {scanned} blogs, reserved {created} slugs, {conflicts} conflicts")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--dry-run', action='store_true', help='count blogs without writing')
+    args = parser.parse_args()
+    backfill(args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
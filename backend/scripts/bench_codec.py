@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-item cost of db.codec versus the boto3 resource-layer path.
+
+The old path deserialized wire items with boto3's TypeDeserializer (what
+Table.get_item does internally) and then walked the result again with
+decimal_to_int. The codec decodes wire format straight to JSON-ready values.
+
+Ratios depend on the host and vary between runs. On a shared single-core
+host (Python 3.11) decoding measured 2.4-3.3x faster, encoding 2.5-4.4x.
+
+Usage: python scripts/bench_codec.py [iterations]
+"""
+
+import sys
+import os
+import timeit
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from db.codec import from_item, to_item, INTERNAL_KEYS
+from db.models import Blog
+
+
+ROUNDS = 7
+
+
+def decimal_to_int(obj):
+    """The recursive post-processing pass the codec replaces"""
+    if isinstance(obj, Decimal):
+        return int(obj)
+    elif isinstance(obj, dict):
+        return {k: decimal_to_int(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [decimal_to_int(item) for item in obj]
+    return obj
+
+
+def sample_blog():
+    srcset = ', '.join(f'https://cdn.example.com/hero-{w}w.webp {w}w' for w in (320, 640, 960, 1280))
+    return Blog(
+        blog_id='3f2b8c4e-1d2a-4c5b-9e8f-0a1b2c3d4e5f',
+        created_at=1700000000,
+        title='Designing a single-table DynamoDB schema',
+        slug='designing-a-single-table-dynamodb-schema',
+        content='<p>' + 'lorem ipsum dolor sit amet ' * 400 + '</p>',
+        featured_image_url='https://cdn.example.com/hero.jpg',
+        tags=['aws', 'dynamodb', 'serverless', 'python'],
+        category='engineering',
+        author='admin@example.com',
+        reading_time=6,
+        likes_count=42,
+        seo_description='How the portfolio backend stores everything in one table.',
+        image_variants={
+            'https://cdn.example.com/hero.jpg': {
+                'width': 1600,
+                'height': 900,
+                'placeholder': 'data:image/webp;base64,UklGRiIAAABXRUJQVlA4IBYAAAAwAQCdASoBAAEADsD+JaQAA3AAAAAA',
+                'srcset': {'webp': srcset}
+            }
+        }
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    blog = sample_blog()
+    keys = {'PK': f'BLOG#{blog.blog_id}', 'SK': 'METADATA', 'GSI1PK': 'BLOG#ALL#0', 'GSI1SK': blog.created_at}
+    wire = blog.to_item(**keys)
+
+    deserializer = TypeDeserializer()
+    serializer = TypeSerializer()
+
+    def resource_decode():
+        item = {k: deserializer.deserialize(v) for k, v in wire.items()}
+        for key in INTERNAL_KEYS:
+            item.pop(key, None)
+        return decimal_to_int(item)
+
+    def codec_decode():
+        return from_item(wire)
+
+    def resource_encode():
+        return {k: serializer.serialize(v) for k, v in {**blog.to_dict(), **keys}.items()}
+
+    def codec_encode():
+        return blog.to_item(**keys)
+
+    def dict_encode():
+        return to_item({**blog.to_dict(), **keys})
+
+    assert resource_decode() == codec_decode()
+
+    cases = [
+        ('decode', 'TypeDeserializer + decimal_to_int', resource_decode),
+        ('decode', 'codec.from_item', codec_decode),
+        ('encode', 'TypeSerializer', resource_encode),
+        ('encode', 'codec.to_item (dict)', dict_encode),
+        ('encode', 'Blog.to_item (slotted model)', codec_encode),
+    ]
+
+    # Rounds interleave the cases, so a noisy neighbour slows every case alike rather than skewing one ratio
+    best = [float('inf')] * len(cases)
+    for _ in range(ROUNDS):
+        for index, (_, _, fn) in enumerate(cases):
+            best[index] = min(best[index], timeit.timeit(fn, number=iterations))
+
+    print(f"Per-item cost, best of {ROUNDS} rounds of {iterations} iterations")
+    print("=" * 60)
+    baseline = {}
+    for (direction, name, _), elapsed in zip(cases, best):
+        per_item = elapsed / iterations * 1e6
+        baseline.setdefault(direction, per_item)
+        speedup = baseline[direction] / per_item
+        print(f"{direction:<7} {name:<36} {per_item:8.2f} us  {speedup:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
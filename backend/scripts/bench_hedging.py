@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Latency-injection benchmark: plain versus hedged GetItem.
+
+Replaces the DynamoDB client with a stand-in whose get_item sleeps for a
+latency drawn from a long-tailed distribution: mostly a few milliseconds,
+sometimes tens, and occasionally a stall like a slow partition or a
+connection stuck in retransmit. It then times DynamoDBClient.get_blog_by_id
+with hedging off and on, and prints p50/p99/p99.9 and the extra request rate.
+
+Usage: python scripts/bench_hedging.py [calls]
+"""
+
+import sys
+import os
+import time
+import random
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('DATA_TABLE', 'bench')
+
+import db.dynamodb as dynamodb_module
+from db.dynamodb import DynamoDBClient
+
+
+# (probability, low, high) latency bands in seconds
+LATENCY_PROFILE = [
+    (0.93, 0.003, 0.008),
+    (0.05, 0.010, 0.030),
+    (0.02, 0.150, 0.400),
+]
+
+
+class SlowClient:
+    """get_item with injected latency; counts requests sent"""
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.requests = 0
+
+    def latency(self):
+        roll = self.random.random()
+        for probability, low, high in LATENCY_PROFILE:
+            if roll < probability:
+                return self.random.uniform(low, high)
+            roll -= probability
+        return LATENCY_PROFILE[-1][2]
+
+    def get_item(self, TableName, Key):
+        self.requests += 1
+        time.sleep(self.latency())
+        return {'Item': {'PK': Key['PK'], 'SK': Key['SK'], 'blogId': {'S': 'bench'}}}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(label, hedge, calls):
+    dynamodb_module.HEDGE_READS = hedge
+    db = DynamoDBClient()
+    db.client = SlowClient(seed=7)
+
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        db.get_blog_by_id('bench')
+        samples.append((time.perf_counter() - started) * 1000)
+
+    extra = (db.client.requests - calls) / calls * 100
+    print(f"{label:<8} p50 {percentile(samples, 0.5):7.2f} ms   p99 {percentile(samples, 0.99):7.2f} ms   "
+          f"p99.9 {percentile(samples, 0.999):7.2f} ms   extra requests {extra:5.1f}%")
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{calls} GetItems per run\n")
+    run('plain', False, calls)
+    run('hedged', True, calls)
+
+
+if __name__ == '__main__':
+    main()
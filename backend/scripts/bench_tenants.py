@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Load test: tenant isolation between one hot portfolio and many cold ones.
+
+Drives the portfolio handler against a real Redis (REDIS_URL, e.g. a local
+redis-server) and a DynamoDB stand-in that sleeps a few milliseconds per
+request and counts Queries per tenant. Reader threads hammer every tenant
+while a writer edits the hot tenant's sections and periodically drops its
+whole cache namespace. Cold tenants should keep a near-100% hit rate and an
+unchanged p99: the hot tenant's writes only touch its own cache hash.
+
+Usage: REDIS_URL=redis://localhost:6379 python scripts/bench_tenants.py [seconds] [cold-tenants]
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import threading
+from collections import Counter, defaultdict
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('DATA_TABLE', 'bench')
+os.environ.setdefault('JWT_SECRET', 'bench-only-secret-of-at-least-32-bytes')
+os.environ.setdefault('REDIS_SSL', 'false')
+
+from db.codec import to_item
+from handlers import portfolio
+from utils.jwt_handler import generate_tokens
+
+
+HOT_TENANT = 'hot'
+# DynamoDB latency per request, seconds
+QUERY_LATENCY = (0.004, 0.012)
+
+
+class StandInTable:
+    """Just enough of the DynamoDB client for portfolio reads and section writes; counts Queries by tenant"""
+
+    class exceptions:
+        class ConditionalCheckFailedException(Exception):
+            pass
+
+    def __init__(self):
+        self.queries = Counter()
+        self.lock = threading.Lock()
+
+    def pause(self):
+        time.sleep(random.uniform(*QUERY_LATENCY))
+
+    def query(self, TableName, KeyConditionExpression, ExpressionAttributeValues, **kwargs):
+        self.pause()
+        tenant = ExpressionAttributeValues[':pk']['S'].split('#', 1)[1]
+        with self.lock:
+            self.queries[tenant] += 1
+        return {'Items': [to_item({'PK': f'PORTFOLIO#{tenant}', 'SK': 'PROFILE', 'bio': f'{tenant} bio'})]}
+
+    def update_item(self, TableName, Key, ReturnValues, **kwargs):
+        self.pause()
+        names = kwargs['ExpressionAttributeNames']
+        values = {names[f'#{name[1:]}']: value for name, value in kwargs['ExpressionAttributeValues'].items()}
+        return {'Attributes': {**Key, **values}}
+
+    def get_item(self, TableName, Key, **kwargs):
+        self.pause()
+        return {'Item': to_item({'email': 'bench@example.com', 'tenants': [HOT_TENANT]})}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def request(method, tenant, path='/portfolio', section=None, body=None, headers=None):
+    params = {'tenant': tenant}
+    if section:
+        params['section'] = section
+    return portfolio.lambda_handler({
+        'httpMethod': method,
+        'path': f'/t/{tenant}{path}',
+        'pathParameters': params,
+        'headers': headers or {},
+        'body': json.dumps(body) if body is not None else None
+    }, None)
+
+
+def run(seconds, cold_tenants, hot_writes):
+    tenants = [HOT_TENANT] + [f'cold-{n}' for n in range(cold_tenants)]
+    table = StandInTable()
+    portfolio.db.client = table
+    auth = {'Authorization': f"Bearer {generate_tokens('bench@example.com')['access_token']}"}
+
+    for tenant in tenants:
+        portfolio.redis_client.invalidate_tenant_cache(tenant)
+        request('GET', tenant)
+    table.queries.clear()
+
+    samples = defaultdict(list)
+    stop = time.monotonic() + seconds
+
+    def reader(seed):
+        rng = random.Random(seed)
+        while time.monotonic() < stop:
+            # Half the traffic goes to the hot tenant
+            tenant = HOT_TENANT if rng.random() < 0.5 else rng.choice(tenants[1:])
+            started = time.perf_counter()
+            request('GET', tenant)
+            samples[tenant == HOT_TENANT].append((time.perf_counter() - started) * 1000)
+
+    def writer():
+        writes = 0
+        while hot_writes and time.monotonic() < stop:
+            request('PUT', HOT_TENANT, '/portfolio/profile', 'profile', {'bio': f'edit {writes}'}, auth)
+            writes += 1
+            if writes % 10 == 0:
+                portfolio.redis_client.invalidate_tenant_cache(HOT_TENANT)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(8)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    cold_queries = sum(count for tenant, count in table.queries.items() if tenant != HOT_TENANT)
+    label = 'hot tenant writing' if hot_writes else 'no writes'
+    print(f"{label}:")
+    for hot, name in ((True, 'hot '), (False, 'cold')):
+        reads = samples[hot]
+        queries = table.queries[HOT_TENANT] if hot else cold_queries
+        print(f"  {name} reads {len(reads):6d}   p50 {percentile(reads, 0.5):6.2f} ms   "
+              f"p99 {percentile(reads, 0.99):6.2f} ms   DynamoDB queries {queries}")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    cold_tenants = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(f"{seconds:.0f} s per run, 1 hot and {cold_tenants} cold tenants, 8 reader threads\n")
+    run(seconds, cold_tenants, hot_writes=False)
+    run(seconds, cold_tenants, hot_writes=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Chaos check: RedisClient latency when Redis is slow, hanging or down.
+
+Runs a minimal RESP server on localhost as a stand-in for Upstash and injects
+a delay before every reply. Each scenario times N cache reads through
+RedisClient.get and prints p50/p99/max plus the breaker state. Slow and dead
+backends should cost at most a socket timeout for the first
+REDIS_BREAKER_THRESHOLD calls. After that, reads short-circuit in
+microseconds until the half-open probe.
+
+Usage: python scripts/chaos_redis.py [calls-per-scenario]
+"""
+
+import sys
+import os
+import time
+import socket
+import threading
+import socketserver
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+os.environ.setdefault('REDIS_SOCKET_TIMEOUT', '0.2')
+os.environ.setdefault('REDIS_CONNECT_TIMEOUT', '0.2')
+os.environ.setdefault('REDIS_BREAKER_COOLDOWN', '1')
+os.environ['REDIS_SSL'] = 'false'
+
+
+class StandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    delay = 0.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connections = set()
+
+    def kill(self):
+        """Stop listening and drop every open connection, like a crashed server"""
+        self.shutdown()
+        self.server_close()
+        for connection in list(self.connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    """Answers every command like an empty Redis, after the server's injected delay"""
+
+    def setup(self):
+        super().setup()
+        self.server.connections.add(self.connection)
+
+    def read_command(self):
+        header = self.rfile.readline()
+        if not header:
+            return None
+        if not header.startswith(b'*'):
+            return header.split()
+        args = []
+        for _ in range(int(header[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        nil = b'$-1\r\n'
+        while True:
+            command = self.read_command()
+            if command is None:
+                return
+            time.sleep(self.server.delay)
+            name = command[0].upper() if command else b''
+            if name == b'HELLO' and command[1:2] == [b'3']:
+                # Newer clients negotiate RESP3 on connect
+                nil = b'_\r\n'
+                reply = b'%1\r\n+proto\r\n:3\r\n'
+            elif name == b'PING':
+                reply = b'+PONG\r\n'
+            elif name in (b'GET', b'HGET'):
+                reply = nil
+            elif name == b'MGET':
+                reply = b'*%d\r\n' % (len(command) - 1) + nil * (len(command) - 1)
+            else:
+                reply = b'+OK\r\n'
+            try:
+                self.wfile.write(reply)
+            except OSError:
+                return
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(name, client, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        client.get('blogs:chaos')
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"{name:<28} p50 {percentile(samples, 0.5):8.2f} ms   p99 {percentile(samples, 0.99):8.2f} ms   "
+          f"max {max(samples):8.2f} ms   breaker {client.breaker.state}")
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    port = free_port()
+    server = StandIn(('127.0.0.1', port), RespHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ['REDIS_URL'] = f'redis://default:pw@127.0.0.1:{port}'
+
+    from db.redis import RedisClient, SOCKET_TIMEOUT, BREAKER_THRESHOLD, BREAKER_COOLDOWN
+    print(f"socket timeout {SOCKET_TIMEOUT * 1000:.0f} ms, threshold {BREAKER_THRESHOLD}, "
+          f"cooldown {BREAKER_COOLDOWN:.0f} s, {calls} reads per scenario\n")
+
+    client = RedisClient()
+    run('healthy', client, calls)
+
+    server.delay = 0.05
+    run('slow (50 ms, under timeout)', client, calls)
+
+    server.delay = 5.0
+    run('hanging (5 s per reply)', client, calls)
+
+    server.delay = 0.0
+    time.sleep(BREAKER_COOLDOWN)
+    run('recovered after cooldown', client, calls)
+
+    server.kill()
+    time.sleep(BREAKER_COOLDOWN)
+    run('down (connection refused)', client, calls)
+
+
+if __name__ == '__main__':
+    main()
@@ -37,6 +37,10 @@ def create_admin_user():
         print("Passwords do not match!")
         return
     
+    # Tenants this admin may edit; only admins of 'default' can edit the main portfolio and the blog
+    tenants = input("Tenants this admin manages (comma separated, include 'default' for the main portfolio and blog; blank for 'default' only): ")
+    tenants = [tenant.strip().lower() for tenant in tenants.split(',') if tenant.strip()] or ['default']
+    
     # Hash password
     password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
     
@@ -56,7 +60,8 @@ def create_admin_user():
                 'email': email,
                 'password_hash': password_hash,
                 'created_at': current_time,
-                'last_login': 0
+                'last_login': 0,
+                'tenants': tenants
             }
         )
         print(f"\n✓ Admin user '{email}' created successfully!")
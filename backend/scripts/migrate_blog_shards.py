@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Re-key blog items onto the write-sharded BlogsByDate index.
+
+Moves every blog's GSI1PK from the legacy single partition (BLOG#ALL), or from
+another shard count, to BLOG#ALL#{crc32(blogId) % shards}. Run it after deploying
+the sharded code, and again whenever BLOG_LIST_SHARDS changes. Items already
+on the right shard are skipped, so the script can be re-run safely.
+
+Usage: DATA_TABLE=<table> python scripts/migrate_blog_shards.py [--shards N] [--dry-run]
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from db.dynamodb import dynamodb, get_table_name, blog_list_shard, BLOG_ALL_PREFIX, BLOG_LIST_SHARDS, METADATA_SK
+
+
+def migrate(shards, dry_run):
+    table_name = get_table_name('DATA_TABLE')
+    scan_kwargs = {
+        'TableName': table_name,
+        'FilterExpression': 'SK = :meta AND begins_with(GSI1PK, :all)',
+        'ProjectionExpression': 'PK, SK, GSI1PK, blogId',
+        'ExpressionAttributeValues': {':meta': {'S': METADATA_SK}, ':all': {'S': BLOG_ALL_PREFIX}}
+    }
+
+    scanned = moved = 0
+    while True:
+        response = dynamodb.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            scanned += 1
+            target = blog_list_shard(item['blogId']['S'], shards)
+            if item['GSI1PK']['S'] == target:
+                continue
+            moved += 1
+            print(f"{item['blogId']['S']}: {item['GSI1PK']['S']} -> {target}")
+            if not dry_run:
+                dynamodb.update_item(
+                    TableName=table_name,
+                    Key={'PK': item['PK'], 'SK': item['SK']},
+                    UpdateExpression='SET GSI1PK = :shard',
+                    ConditionExpression='attribute_exists(PK)',
+                    ExpressionAttributeValues={':shard': {'S': target}}
+                )
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    action = 'would move' if dry_run else 'moved'
+    print(f"Scanned {scanned} blogs, {action} {moved} onto {shards} shards")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--shards', type=int, default=BLOG_LIST_SHARDS,
+                        help='shard count to migrate to (default: BLOG_LIST_SHARDS)')
+    parser.add_argument('--dry-run', action='store_true', help='report moves without writing')
+    args = parser.parse_args()
+    if args.shards < 1:
+        parser.error('--shards must be at least 1')
+    if args.shards != BLOG_LIST_SHARDS:
+        print(f"Warning: deployed functions read {BLOG_LIST_SHARDS} shards; set BLOG_LIST_SHARDS={args.shards} to match")
+    migrate(args.shards, args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
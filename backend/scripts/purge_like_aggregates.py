@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Delete the retired like aggregates from every blog partition.
+
+The daily like compaction wrote LIKES#D#{YYYYMMDD} and LIKES#TOTAL items next to
+each blog. Nothing reads them any more (likes_count on the blog item is the
+permanent total), and the delete cascade only removes them once their blog is
+deleted. Run this once after deploying; it only deletes, so it is safe to re-run.
+
+Usage: DATA_TABLE=<table> python scripts/purge_like_aggregates.py [--dry-run]
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from db.dynamodb import DynamoDBClient, get_table_name, BLOG_PREFIX, MAX_BATCH_WRITE_ITEMS
+
+# SK prefix of the retired LIKES#D# and LIKES#TOTAL items
+LIKE_AGGREGATE_PREFIX = 'LIKES#'
+
+
+def purge(dry_run):
+    db = DynamoDBClient()
+    table_name = get_table_name('DATA_TABLE')
+    scan_kwargs = {
+        'TableName': table_name,
+        'FilterExpression': 'begins_with(PK, :blog) AND begins_with(SK, :likes)',
+        'ProjectionExpression': 'PK, SK',
+        'ExpressionAttributeValues': {':blog': {'S': BLOG_PREFIX}, ':likes': {'S': LIKE_AGGREGATE_PREFIX}}
+    }
+
+    found = 0
+    pending = []
+    while True:
+        response = db.client.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            found += 1
+            pending.append({'PK': item['PK'], 'SK': item['SK']})
+            if len(pending) == MAX_BATCH_WRITE_ITEMS:
+                if not dry_run:
+                    db.delete_items(pending)
+                pending = []
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    if pending and not dry_run:
+        db.delete_items(pending)
+
+    action = 'Would delete' if dry_run else 'Deleted'
+    print(f"{action} {found} like aggregate items")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--dry-run', action='store_true', help='count the items without deleting them')
+    args = parser.parse_args()
+    purge(args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
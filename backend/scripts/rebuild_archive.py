@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Rebuild the year/month archive from the published blog list.
+
+Writes an archive entry for every published blog, removes entries for posts
+that are no longer published (or moved month), and replaces the per-month
+counts with exact totals. Run it once after deploying the archive, or any
+time the counts are suspected to have drifted. Safe to re-run.
+
+Usage: DATA_TABLE=<table> python scripts/rebuild_archive.py [--dry-run]
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from db.codec import to_item
+from db.dynamodb import (
+    DynamoDBClient, get_table_name, archive_month,
+    BLOG_SUMMARY_FIELDS, STATS_PK, ARCHIVE_SK, TIMESTAMP_WIDTH
+)
+
+
+def rebuild(dry_run):
+    db = DynamoDBClient()
+    table_name = get_table_name('DATA_TABLE')
+
+    expected = {}
+    for blog in db.iter_blogs(BLOG_SUMMARY_FIELDS + ('created_at',)):
+        published_at = blog.get('published_at') or blog['created_at']
+        month = archive_month(published_at)
+        summary = {field: blog[field] for field in BLOG_SUMMARY_FIELDS if field in blog}
+        expected.setdefault(month, {})[f'{published_at:0{TIMESTAMP_WIDTH}d}#{blog["blogId"]}'] = {
+            **summary, 'published_at': published_at
+        }
+
+    # Stale entries can only sit in months the old counts know about
+    stale = 0
+    for month in set(db.get_archive_counts()) | set(expected):
+        after = None
+        while True:
+            page = db.get_archive_month(month, limit=100, after=after)
+            for entry in page['items']:
+                sk = f"{entry['published_at']:0{TIMESTAMP_WIDTH}d}#{entry['blogId']}"
+                if sk not in expected.get(month, {}):
+                    stale += 1
+                    print(f"{month}: removing {entry['blogId']}")
+                    if not dry_run:
+                        db.delete_archive_entry(entry['blogId'], entry['published_at'])
+            after = page['next']
+            if not after:
+                break
+
+    counts = {month: len(entries) for month, entries in expected.items()}
+    if not dry_run:
+        for entries in expected.values():
+            for summary in entries.values():
+                db.put_archive_entry(summary)
+        db.client.put_item(
+            TableName=table_name,
+            Item=to_item({**counts, 'PK': STATS_PK, 'SK': ARCHIVE_SK})
+        )
+
+    action = 'would write' if dry_run else 'wrote'
+    print(f"Archive: {action} {sum(counts.values())} entries over {len(counts)} months, {stale} stale")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--dry-run', action='store_true', help='report changes without writing')
+    args = parser.parse_args()
+    rebuild(args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
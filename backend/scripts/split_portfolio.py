@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Split the legacy single-item portfolio (PORTFOLIO#default / METADATA) into section items.
+
+The portfolio is now stored as PROFILE and ABOUT items plus one PROJECT#{id}
+or EXPERIENCE#{id} item per entry, all in the PORTFOLIO#default partition,
+and reads assemble it with one Query. Run this once after deploying: it
+writes the section items from the old document (entries keep their ids, or
+get new ones, and their order) and then deletes it. Safe to re-run; once the
+old item is gone there is nothing to do.
+
+Usage: DATA_TABLE=<table> python scripts/split_portfolio.py [--dry-run]
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from db.codec import from_item
+from db.dynamodb import (
+    DynamoDBClient, dynamodb, get_table_name, item_key, PORTFOLIO_PREFIX, METADATA_SK, PORTFOLIO_SECTIONS,
+    PORTFOLIO_LIST_SECTIONS
+)
+
+
+def split(dry_run, user_id='default'):
+    table_name = get_table_name('DATA_TABLE')
+    key = item_key(f'{PORTFOLIO_PREFIX}{user_id}', METADATA_SK)
+    response = dynamodb.get_item(TableName=table_name, Key=key, ConsistentRead=True)
+    if 'Item' not in response:
+        print("No legacy portfolio item; nothing to split")
+        return
+
+    portfolio = from_item(response['Item'])
+    counts = {section: len(portfolio.get(section) or []) for section in PORTFOLIO_LIST_SECTIONS}
+    if dry_run:
+        print(f"Would split the portfolio into profile, about, {counts['projects']} projects "
+              f"and {counts['experience']} experience entries (dry run, nothing written)")
+        return
+
+    # The legacy update writes every section the document carries
+    db = DynamoDBClient()
+    db.update_portfolio(user_id, {
+        attr: portfolio[attr]
+        for _, attrs in PORTFOLIO_SECTIONS.values() for attr in attrs if portfolio.get(attr) is not None
+    })
+    dynamodb.delete_item(TableName=table_name, Key=key)
+    print(f"Split the portfolio into profile, about, {counts['projects']} projects "
+          f"and {counts['experience']} experience entries; removed the legacy item")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--dry-run', action='store_true', help='report what would be written without writing')
+    args = parser.parse_args()
+    split(args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Bulk export and import for the single table.
+
+  export FILE            Parallel segmented Scan of the whole table into
+                         gzip-compressed JSONL, one item (wire format) per line.
+  import FILE            Load an export with a pool of BatchWriteItem workers.
+  import-markdown DIR    Create or update blogs from a directory of Markdown
+                         (or HTML) files with a front matter header.
+
+Export streams: scan workers hand pages to a bounded queue that a single
+writer drains, so memory stays flat however large the table is.
+
+Import reads the file lazily in 25-item batches. Unprocessed items are
+retried with backoff, and a shared AIMD rate limit (items per second) halves
+whenever DynamoDB throttles or leaves items unprocessed and creeps back up
+while writes succeed. Progress is checkpointed to FILE.checkpoint as the last
+line below which every batch is committed; --resume continues from there.
+Derived items (summaries, archive entries, site counters, stream markers)
+are skipped unless --include-derived is given: the stream processor rebuilds
+them from the imported blogs, and re-importing counters would double them.
+
+Usage:
+  DATA_TABLE=<table> python scripts/table_io.py export backup.jsonl.gz [--segments 8]
+  DATA_TABLE=<table> python scripts/table_io.py import backup.jsonl.gz [--workers 8] [--rate 500] [--resume]
+  DATA_TABLE=<table> python scripts/table_io.py import-markdown posts/ --author admin@example.com [--dry-run]
+"""
+
+import sys
+import os
+import re
+import gzip
+import json
+import time
+import queue
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from botocore.exceptions import ClientError
+
+from db.dynamodb import (
+    DynamoDBClient, dynamodb, get_table_name, MAX_BATCH_WRITE_ITEMS,
+    STATS_PK, STREAM_EVENT_PREFIX, ARCHIVE_PREFIX, SUMMARY_SK
+)
+from db.models import get_timestamp
+from handlers.blogs_utils import new_blog, blog_changes
+
+
+THROTTLE_ERRORS = ('ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded')
+PROGRESS_EVERY = 10000
+
+
+def open_lines(path, mode):
+    """Text handle on a JSONL file, gzip-compressed when the name ends in .gz"""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+# Export
+
+def export(path, segments):
+    table_name = get_table_name('DATA_TABLE')
+    # Bounded, so fast scanners wait for the writer instead of buffering the table
+    pages = queue.Queue(maxsize=segments * 2)
+
+    def scan_segment(segment):
+        try:
+            scan_kwargs = {'TableName': table_name, 'Segment': segment, 'TotalSegments': segments}
+            while True:
+                response = dynamodb.scan(**scan_kwargs)
+                pages.put(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    return
+                scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        finally:
+            pages.put(None)
+
+    written = 0
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=segments) as pool, open_lines(path, 'w') as out:
+        futures = [pool.submit(scan_segment, segment) for segment in range(segments)]
+        finished = 0
+        while finished < segments:
+            items = pages.get()
+            if items is None:
+                finished += 1
+                continue
+            for item in items:
+                out.write(json.dumps(item, separators=(',', ':')) + '\n')
+            previous, written = written, written + len(items)
+            if written // PROGRESS_EVERY != previous // PROGRESS_EVERY:
+                print(f"Exported {written} items")
+        for future in futures:
+            # Re-raise the first scan failure, after every worker has stopped
+            future.result()
+
+    print(f"Exported {written} items to {path} in {time.monotonic() - started:.1f}s")
+
+
+# Import
+
+class RateLimit:
+    """Shared items-per-second budget: halved on throttling, raised additively on success"""
+
+    def __init__(self, rate, maximum):
+        self.rate = rate
+        self.maximum = maximum
+        self.next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, items):
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self.next_slot - now)
+            self.next_slot = max(now, self.next_slot) + items / self.rate
+        if wait:
+            time.sleep(wait)
+
+    def throttled(self):
+        with self._lock:
+            self.rate = max(1.0, self.rate / 2)
+
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(self.maximum, self.rate + 1)
+
+
+class Checkpoint:
+    """Highest line below which every batch is committed, written atomically to path"""
+
+    def __init__(self, path, start):
+        self.path = path
+        self.line = start
+        self.done = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def load(path):
+        try:
+            with open(path) as f:
+                return json.load(f)['line']
+        except FileNotFoundError:
+            return 0
+
+    def complete(self, first_line, next_line):
+        with self._lock:
+            self.done[first_line] = next_line
+            advanced = False
+            while self.line in self.done:
+                self.line = self.done.pop(self.line)
+                advanced = True
+            if advanced:
+                temp = f"{self.path}.tmp"
+                with open(temp, 'w') as f:
+                    json.dump({'line': self.line}, f)
+                os.replace(temp, self.path)
+
+
+def is_derived(item):
+    pk, sk = item['PK']['S'], item['SK']['S']
+    return pk == STATS_PK or pk.startswith((STREAM_EVENT_PREFIX, ARCHIVE_PREFIX)) or sk == SUMMARY_SK
+
+
+def write_batch(table_name, items, limit):
+    """BatchWriteItem one batch, retrying unprocessed items and throttling under the shared rate limit"""
+    pending = {table_name: [{'PutRequest': {'Item': item}} for item in items]}
+    attempt = 0
+    while pending:
+        limit.acquire(len(pending[table_name]))
+        try:
+            response = dynamodb.batch_write_item(RequestItems=pending)
+        except ClientError as e:
+            if e.response['Error']['Code'] not in THROTTLE_ERRORS:
+                raise
+            limit.throttled()
+        else:
+            pending = response.get('UnprocessedItems') or {}
+            if not pending:
+                limit.succeeded()
+                return
+            limit.throttled()
+        attempt += 1
+        time.sleep(min(0.05 * 2 ** attempt, 5.0))
+
+
+def batches(path, start, include_derived):
+    """Yield (first_line, next_line, items) for each run of lines holding up to MAX_BATCH_WRITE_ITEMS items"""
+    first, items = None, []
+    with open_lines(path, 'r') as f:
+        for number, line in enumerate(f):
+            if number < start:
+                continue
+            if first is None:
+                first = number
+            item = json.loads(line)
+            if include_derived or not is_derived(item):
+                items.append(item)
+            if len(items) == MAX_BATCH_WRITE_ITEMS:
+                yield first, number + 1, items
+                first, items = None, []
+        if first is not None:
+            yield first, number + 1, items
+
+
+def import_file(path, workers, rate, resume, include_derived):
+    table_name = get_table_name('DATA_TABLE')
+    checkpoint_path = f"{path}.checkpoint"
+    start = Checkpoint.load(checkpoint_path) if resume else 0
+    if start:
+        print(f"Resuming from line {start}")
+    checkpoint = Checkpoint(checkpoint_path, start)
+    limit = RateLimit(rate, rate * 4)
+    # Bounds the batches read ahead of the workers
+    slots = threading.Semaphore(workers * 2)
+
+    imported = 0
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+
+        def run(first, next_line, items):
+            try:
+                if items:
+                    write_batch(table_name, items, limit)
+                checkpoint.complete(first, next_line)
+            finally:
+                slots.release()
+
+        for first, next_line, items in batches(path, start, include_derived):
+            slots.acquire()
+            futures.append(pool.submit(run, first, next_line, items))
+            previous, imported = imported, imported + len(items)
+            if imported // PROGRESS_EVERY != previous // PROGRESS_EVERY:
+                print(f"Imported {imported} items (line {checkpoint.line}, {limit.rate:.0f} items/s)")
+            # Surface a failed worker early instead of reading the rest of the file
+            for future in [future for future in futures if future.done()]:
+                future.result()
+                futures.remove(future)
+
+        for future in futures:
+            future.result()
+
+    print(f"Imported {imported} items from {path} in {time.monotonic() - started:.1f}s")
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+
+# Markdown import
+
+FRONT_MATTER = re.compile(r'\A---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+BLOG_FIELDS = ('title', 'slug', 'tags', 'category', 'status', 'published_at', 'featured_image_url', 'seo_description')
+
+
+def parse_front_matter(text):
+    """Split `key: value` front matter from the body; tags accept `[a, b]` or `a, b`"""
+    match = FRONT_MATTER.match(text)
+    if not match:
+        return {}, text
+    meta = {}
+    for line in match.group(1).splitlines():
+        key, sep, value = line.partition(':')
+        if not sep or key.strip() not in BLOG_FIELDS:
+            continue
+        meta[key.strip()] = value.strip().strip('"\'')
+    if 'tags' in meta:
+        meta['tags'] = [tag.strip().strip('"\'') for tag in meta['tags'].strip('[]').split(',') if tag.strip()]
+    if 'published_at' in meta:
+        value = meta['published_at']
+        meta['published_at'] = int(value) if value.isdigit() else int(
+            datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+        )
+    return meta, text[match.end():]
+
+
+def render(path, body):
+    """HTML for a post body: .html is stored as is, Markdown needs the `markdown` package"""
+    if path.endswith('.html'):
+        return body
+    try:
+        import markdown
+    except ImportError:
+        sys.exit("Importing .md files needs the markdown package: pip install markdown")
+    return markdown.markdown(body, extensions=['fenced_code', 'tables'])
+
+
+def import_markdown(directory, author, dry_run):
+    db = DynamoDBClient()
+    now = get_timestamp()
+    posts = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(('.md', '.html')):
+            continue
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            meta, body = parse_front_matter(f.read())
+        meta.setdefault('title', os.path.splitext(name)[0].replace('-', ' ').title())
+        posts.append({**meta, 'content': render(name, body)})
+
+    # Posts whose slug already exists update that blog, so re-running the import is safe
+    drafts = [new_blog(post, author, now) for post in posts]
+    slugs = [blog['slug'] for blog in drafts]
+    duplicates = sorted({slug for slug in slugs if slugs.count(slug) > 1})
+    if duplicates:
+        sys.exit(f"Several files share the slug(s): {', '.join(duplicates)}")
+    owners = db.get_slug_owners(slugs)
+    existing = db.batch_get_blogs(list(owners.values())) if owners else {}
+
+    creates, updates = [], []
+    for post, blog in zip(posts, drafts):
+        current = existing.get(owners.get(blog['slug']))
+        if current:
+            updates.append(({**current, **blog_changes(current, post, now)}, current))
+        else:
+            creates.append(blog)
+        print(f"{'update' if current else 'create'}: {blog['slug']}")
+
+    if not dry_run:
+        db.bulk_write_blogs(creates, updates, [])
+    action = 'would write' if dry_run else 'wrote'
+    print(f"Markdown import: {action} {len(creates)} new and {len(updates)} updated blogs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = commands.add_parser('export', help='scan the table into gzip JSONL')
+    export_parser.add_argument('file')
+    export_parser.add_argument('--segments', type=int, default=8, help='parallel scan segments (default 8)')
+
+    import_parser = commands.add_parser('import', help='load an export with parallel BatchWriteItem')
+    import_parser.add_argument('file')
+    import_parser.add_argument('--workers', type=int, default=8, help='writer threads (default 8)')
+    import_parser.add_argument('--rate', type=float, default=500, help='starting items per second (default 500)')
+    import_parser.add_argument('--resume', action='store_true', help='continue from FILE.checkpoint')
+    import_parser.add_argument('--include-derived', action='store_true',
+                               help='also load summaries, archive entries, counters and stream markers')
+
+    markdown_parser = commands.add_parser('import-markdown', help='create or update blogs from Markdown files')
+    markdown_parser.add_argument('directory')
+    markdown_parser.add_argument('--author', required=True, help='author email stored on the posts')
+    markdown_parser.add_argument('--dry-run', action='store_true', help='report changes without writing')
+
+    args = parser.parse_args()
+    if args.command == 'export':
+        if args.segments < 1:
+            parser.error('--segments must be at least 1')
+        export(args.file, args.segments)
+    elif args.command == 'import':
+        if args.workers < 1 or args.rate <= 0:
+            parser.error('--workers and --rate must be positive')
+        import_file(args.file, args.workers, args.rate, args.resume, args.include_derived)
+    else:
+        import_markdown(args.directory, args.author, args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Single-pass codec between DynamoDB wire format and JSON-ready values.
+
+Used with the low-level boto3 client, so items never pass through the
+resource layer's Decimal representation. Numbers decode to int when they are
+integral and float otherwise.
+"""
+from decimal import Decimal
+from typing import Any, Dict, Iterable
+
+
+# Key attributes that are never part of an entity's public representation
+INTERNAL_KEYS = frozenset({
+    'PK', 'SK',
+    'GSI1PK', 'GSI1SK',
+    'GSI2PK', 'GSI2SK',
+    'GSI3PK', 'GSI3SK',
+    'GSI4PK', 'GSI4SK',
+})
+
+
+def _number(text: str):
+    if '.' in text or 'e' in text or 'E' in text:
+        return float(text)
+    return int(text)
+
+
+def _encode_number(value) -> Dict[str, str]:
+    return {'N': repr(value) if isinstance(value, float) else str(value)}
+
+
+def _encode_map(value: Dict) -> Dict[str, Any]:
+    return {'M': {k: serialize(v) for k, v in value.items()}}
+
+
+def _encode_list(value) -> Dict[str, Any]:
+    return {'L': [serialize(v) for v in value]}
+
+
+_ENCODERS = {
+    str: lambda v: {'S': v},
+    bool: lambda v: {'BOOL': v},
+    int: _encode_number,
+    float: _encode_number,
+    Decimal: _encode_number,
+    type(None): lambda v: {'NULL': True},
+    dict: _encode_map,
+    list: _encode_list,
+    tuple: _encode_list,
+    bytes: lambda v: {'B': v},
+}
+
+
+def serialize(value: Any) -> Dict[str, Any]:
+    """Encode a Python value as a DynamoDB AttributeValue"""
+    encoder = _ENCODERS.get(type(value))
+    if encoder is None:
+        # Subclasses (e.g. IntEnum, OrderedDict) take the slower isinstance path
+        for base, candidate in _ENCODERS.items():
+            if isinstance(value, base):
+                encoder = candidate
+                break
+        else:
+            raise TypeError(f"Cannot serialize {type(value).__name__} to DynamoDB")
+    return encoder(value)
+
+
+_DECODERS = {
+    'S': lambda v: v,
+    'N': _number,
+    'BOOL': lambda v: v,
+    'NULL': lambda v: None,
+    'M': lambda v: {k: deserialize(x) for k, x in v.items()},
+    'L': lambda v: [deserialize(x) for x in v],
+    'B': lambda v: v,
+    'SS': list,
+    'NS': lambda v: [_number(x) for x in v],
+    'BS': list,
+}
+
+
+def deserialize(attr: Dict[str, Any]) -> Any:
+    """Decode a DynamoDB AttributeValue to a JSON-ready value"""
+    for tag, value in attr.items():
+        return _DECODERS[tag](value)
+    return None
+
+
+def to_item(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Encode a mapping as a DynamoDB item, skipping None values"""
+    return {k: serialize(v) for k, v in data.items() if v is not None}
+
+
+def from_item(item: Dict[str, Dict[str, Any]], drop: Iterable[str] = INTERNAL_KEYS) -> Dict[str, Any]:
+    """Decode a DynamoDB item, dropping key attributes in the same pass"""
+    return {k: deserialize(v) for k, v in item.items() if k not in drop}
+
+
+def to_values(values: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Encode ExpressionAttributeValues"""
+    return {k: serialize(v) for k, v in values.items()}
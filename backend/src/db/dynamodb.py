@@ -1,371 +1,1692 @@
 import os
+import heapq
+import zlib
 import boto3
-from boto3.dynamodb.conditions import Key, Attr
-from typing import Dict, List, Optional
-from decimal import Decimal
-import json
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 import time
+from datetime import datetime, timezone
 
+from db.codec import from_item, to_item, to_values, serialize
+from db.models import BLOG_PUBLISHED, BLOG_SCHEDULED, generate_sortable_id
+from utils.deadline import DeadlineExceededError
+from utils.errors import SlugTakenError
+from utils.hedging import LatencyTracker, hedged_call
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+
+# Initialize low-level DynamoDB client (items go through db.codec, not the resource layer).
+# Adaptive retries back off client-side under throttling; short timeouts keep a stuck
+# connection from eating the request budget; the pool covers hedged and parallel reads.
+dynamodb = boto3.client('dynamodb', config=Config(
+    retries={'mode': 'adaptive', 'max_attempts': int(os.environ.get('DYNAMODB_MAX_ATTEMPTS', '3'))},
+    connect_timeout=float(os.environ.get('DYNAMODB_CONNECT_TIMEOUT', '1')),
+    read_timeout=float(os.environ.get('DYNAMODB_READ_TIMEOUT', '3')),
+    max_pool_connections=int(os.environ.get('DYNAMODB_POOL_SIZE', '25'))
+))
+
+# Hedge single-item and portfolio reads after the recent p95 latency (HEDGE_READS=false sends one request)
+HEDGE_READS = os.environ.get('HEDGE_READS', 'true').lower() == 'true'
 
 # Constants for key prefixes
-BLOG_ALL_PREFIX = 'BLOG#ALL'
+BLOG_ALL_PREFIX = 'BLOG#ALL'  # BlogsByDate partitions are BLOG#ALL#{shard}
 PORTFOLIO_PREFIX = 'PORTFOLIO#'
+PORTFOLIO_PROFILE_SK = 'PROFILE'
+PORTFOLIO_ABOUT_SK = 'ABOUT'
+PROJECT_PREFIX = 'PROJECT#'
+EXPERIENCE_PREFIX = 'EXPERIENCE#'
 BLOG_PREFIX = 'BLOG#'
 USER_PREFIX = 'USER#'
+TOKEN_FAMILY_PREFIX = 'TOKENFAMILY#'
 LIKE_PREFIX = 'LIKE#'
+LIKED_PREFIX = 'LIKED#'
 SLUG_PREFIX = 'SLUG#'
+COMMENT_PREFIX = 'COMMENT#'
+PENDING_COMMENT_PREFIX = 'PENDING#'
+PENDING_COMMENTS_PK = 'COMMENT#PENDING'
+SCHEDULED_BLOGS_PK = 'BLOG#SCHEDULED'
+VIEWS_PREFIX = 'VIEWS#'
+STATS_PK = 'STATS#GLOBAL'
+ARCHIVE_PREFIX = 'ARCHIVE#'
+ARCHIVE_SK = 'ARCHIVE'
+STREAM_EVENT_PREFIX = 'STREAM#'
+# Retired derived list summary: leftover items are skipped by exports and removed with their blog
+SUMMARY_SK = 'SUMMARY'
+CASCADE_SK = 'CASCADE'
 METADATA_SK = 'METADATA'
 
+# GSI4SK is a string: scheduled publish times are zero-padded so they sort numerically
+TIMESTAMP_WIDTH = 12
+
+STREAM_MARKER_TTL = 48 * 60 * 60
+# Raw like items expire this long after they are written
+LIKE_TTL = 30 * 24 * 60 * 60
+# Finished cascade progress items are kept this long for inspection
+CASCADE_PROGRESS_TTL = 7 * 24 * 60 * 60
+
+# TransactWriteItems accepts at most 100 actions
+MAX_TRANSACTION_ITEMS = 100
+# Attempts at a write that keeps racing others (blog renames, transaction conflicts)
+WRITE_ATTEMPTS = 3
+# Transaction cancellation reasons that a retry can get past
+RETRYABLE_CANCELLATIONS = {'TransactionConflict', 'ThrottlingError'}
+# Conditional UpdateItems in flight at once for non-atomic bulk updates
+BULK_UPDATE_CONCURRENCY = 8
+
+# Counters only move by ADD in the like and comment writes; blog updates never write them back
+BLOG_COUNTER_FIELDS = ('likes_count', 'comments_count')
+# Publication-state index keys, recomputed whenever a blog's status changes
+BLOG_STATE_KEYS = ('GSI1PK', 'GSI1SK', 'GSI4PK', 'GSI4SK')
+
+# BatchGetItem accepts at most 100 keys
+MAX_BATCH_GET_KEYS = 100
+
+# BatchWriteItem accepts at most 25 puts/deletes
+MAX_BATCH_WRITE_ITEMS = 25
+
+# Blog attributes needed to render a card (everything but the body)
+BLOG_SUMMARY_FIELDS = (
+    'blogId', 'title', 'slug', 'featured_image_url', 'seo_description', 'tags', 'category',
+    'author', 'reading_time', 'likes_count', 'comments_count', 'created_at', 'published_at',
+    'image_variants'
+)
+
+# Attributes that make up a BlogsByDate pagination key
+BLOG_LIST_KEY_ATTRS = ('PK', 'SK', 'GSI1PK', 'GSI1SK')
+
+# BlogsByDate is write-sharded over this many partition keys so list traffic is
+# spread out; changing it requires re-running scripts/migrate_blog_shards.py
+BLOG_LIST_SHARDS = int(os.environ.get('BLOG_LIST_SHARDS', '4'))
+
+# Runs the per-shard queries of a scatter-gather read in parallel
+_shard_pool = ThreadPoolExecutor(max_workers=max(BLOG_LIST_SHARDS, 1))
+# Runs the conditional updates of a non-atomic bulk write in parallel
+_write_pool = ThreadPoolExecutor(max_workers=BULK_UPDATE_CONCURRENCY)
 
-def get_table(table_name_env_var):
-    """Get DynamoDB table by environment variable name"""
+
+def get_table_name(table_name_env_var):
+    """Get DynamoDB table name by environment variable name"""
     table_name = os.environ.get(table_name_env_var)
     if not table_name:
         raise ValueError(f"Environment variable {table_name_env_var} not set")
-    return dynamodb.Table(table_name)
+    return table_name
+
+
+def item_key(pk: str, sk: str = METADATA_SK) -> Dict:
+    """Primary key in wire format"""
+    return {'PK': {'S': pk}, 'SK': {'S': sk}}
+
+
+def archive_month(published_at: int) -> str:
+    """Archive bucket (UTC YYYY-MM) of a publish time"""
+    return datetime.fromtimestamp(published_at, timezone.utc).strftime('%Y-%m')
+
+
+def projection(fields: Optional[tuple]) -> Dict:
+    """ProjectionExpression request parameters for a fieldset (empty for the whole item)"""
+    if not fields:
+        return {}
+    return {
+        'ProjectionExpression': ', '.join(f'#f{n}' for n in range(len(fields))),
+        'ExpressionAttributeNames': {f'#f{n}': field for n, field in enumerate(fields)}
+    }
+
+
+# Portfolio sections: name -> (sort key, or sort key prefix of a list section's items; portfolio attributes)
+PORTFOLIO_SECTIONS = {
+    'profile': (PORTFOLIO_PROFILE_SK, ('profile_pic_url', 'bio', 'email', 'social_links')),
+    'about': (PORTFOLIO_ABOUT_SK, ('about_content',)),
+    'projects': (PROJECT_PREFIX, ('projects',)),
+    'experience': (EXPERIENCE_PREFIX, ('experience',)),
+}
+PORTFOLIO_LIST_SECTIONS = ('projects', 'experience')
+
 
+def portfolio_section_of(sk: str) -> Optional[str]:
+    """Section a portfolio item belongs to, by its sort key"""
+    for section, (key, _) in PORTFOLIO_SECTIONS.items():
+        if sk == key or (section in PORTFOLIO_LIST_SECTIONS and sk.startswith(key)):
+            return section
+    return None
 
-def decimal_to_int(obj):
-    """Convert Decimal to int for JSON serialization"""
-    if isinstance(obj, Decimal):
-        return int(obj)
-    elif isinstance(obj, dict):
-        return {k: decimal_to_int(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [decimal_to_int(item) for item in obj]
-    return obj
+
+def portfolio_sections_for(fields: Optional[tuple] = None) -> tuple:
+    """Sections holding a fieldset's attributes (every section when fields is None)"""
+    if fields is None:
+        return tuple(PORTFOLIO_SECTIONS)
+    sections = tuple(
+        section for section, (_, attrs) in PORTFOLIO_SECTIONS.items()
+        if 'updated_at' in fields or set(attrs) & set(fields)
+    )
+    return sections or ('profile',)
+
+
+def portfolio_section_value(section: str, items: List[Dict]) -> Any:
+    """
+    Cached/API value of a section from its decoded items: the attributes (with
+    updated_at) for profile and about, the ordered entries for list sections
+    """
+    if section in PORTFOLIO_LIST_SECTIONS:
+        return sorted(items, key=lambda item: (item.get('sort_order', 0), item.get('id', '')))
+    defaults = {attr: ({} if attr == 'social_links' else '') for attr in PORTFOLIO_SECTIONS[section][1]}
+    return {**defaults, 'updated_at': 0, **(items[0] if items else {})}
+
+
+def assemble_portfolio(user_id: str, sections: Dict[str, Any]) -> Dict:
+    """The portfolio document from section values ({section: value}); updated_at is the latest section edit"""
+    portfolio = {'userId': user_id}
+    updated = [0]
+    for section, value in sections.items():
+        if section in PORTFOLIO_LIST_SECTIONS:
+            portfolio[section] = value
+            updated.extend(item.get('updated_at', 0) for item in value)
+        else:
+            portfolio.update({attr: value[attr] for attr in PORTFOLIO_SECTIONS[section][1]})
+            updated.append(value.get('updated_at', 0))
+    portfolio['updated_at'] = max(updated)
+    return portfolio
+
+
+def set_expression(data: Dict, **extra) -> Dict:
+    """UpdateItem parameters that SET each attribute of data (placeholders, so any attribute name works)"""
+    data = {**data, **extra}
+    return {
+        'UpdateExpression': 'SET ' + ', '.join(f'#a{n} = :a{n}' for n in range(len(data))),
+        'ExpressionAttributeNames': {f'#a{n}': attr for n, attr in enumerate(data)},
+        'ExpressionAttributeValues': {f':a{n}': serialize(value) for n, value in enumerate(data.values())}
+    }
+
+
+def blog_update_expression(blog_id: str, changes: Dict, check_slug: bool = False, slug: Optional[str] = None) -> Dict:
+    """
+    UpdateItem parameters writing only `changes` to an existing blog: SET for
+    values, REMOVE for None, plus the index keys a slug or status change moves.
+    Counters are dropped. With check_slug the update also requires the stored
+    slug to still be `slug` (None: no slug), so a rename can safely release
+    the old reservation.
+    """
+    sets = {
+        attr: value for attr, value in changes.items()
+        if value is not None and attr not in BLOG_COUNTER_FIELDS and attr != 'blogId'
+    }
+    removes = [attr for attr, value in changes.items() if value is None and attr not in BLOG_COUNTER_FIELDS]
+    if 'slug' in sets:
+        sets['GSI2PK'] = f"{SLUG_PREFIX}{sets['slug']}"
+    if 'status' in sets:
+        # validate_publication pairs every status with its published_at
+        if sets['status'] == BLOG_PUBLISHED:
+            sets.update(GSI1PK=blog_list_shard(blog_id), GSI1SK=sets['published_at'])
+        elif sets['status'] == BLOG_SCHEDULED:
+            sets.update(GSI4PK=SCHEDULED_BLOGS_PK, GSI4SK=f"{sets['published_at']:0{TIMESTAMP_WIDTH}d}")
+        removes += [attr for attr in BLOG_STATE_KEYS if attr not in sets]
+
+    names = {f'#a{n}': attr for n, attr in enumerate(sets)}
+    names.update({f'#r{n}': attr for n, attr in enumerate(removes)})
+    values = {f':a{n}': serialize(value) for n, value in enumerate(sets.values())}
+    expression = 'SET ' + ', '.join(f'#a{n} = :a{n}' for n in range(len(sets)))
+    if removes:
+        expression += ' REMOVE ' + ', '.join(f'#r{n}' for n in range(len(removes)))
+
+    condition = 'attribute_exists(PK)'
+    if check_slug:
+        names['#slug'] = 'slug'
+        if slug is None:
+            condition += ' AND attribute_not_exists(#slug)'
+        else:
+            condition += ' AND #slug = :slug'
+            values[':slug'] = {'S': slug}
+    return {
+        'UpdateExpression': expression,
+        'ConditionExpression': condition,
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values
+    }
+
+
+def blog_changes_between(blog: Dict, previous: Dict) -> Dict:
+    """Attributes that differ between a merged blog and the blog it was merged from (None: removed)"""
+    return {
+        attr: blog.get(attr) for attr in dict.fromkeys((*blog, *previous))
+        if blog.get(attr) != previous.get(attr) and attr not in BLOG_COUNTER_FIELDS
+    }
+
+
+def blog_list_shard(blog_id: str, shards: int = BLOG_LIST_SHARDS) -> str:
+    """BlogsByDate partition key for a blog; stable, so updates never move it"""
+    return f'{BLOG_ALL_PREFIX}#{zlib.crc32(blog_id.encode("utf-8")) % shards}'
 
 
 class DynamoDBClient:
     """
     Single-table DynamoDB client with optimized queries (no scans)
-    
+
     Key Structure:
-    - PK: Entity identifier (e.g., "PORTFOLIO#default", "BLOG#{blogId}", "USER#{email}", "LIKE#{blogId}#{timestamp}#{ip}")
+    - PK: Entity identifier (e.g., "PORTFOLIO#default", "BLOG#{blogId}", "USER#{email}", "LIKE#{blogId}#{timestamp}#{ip}",
+      "LIKED#{blogId}#{ip}" marking that a visitor has liked a post until their like expires)
     - SK: Sort key (e.g., "METADATA", timestamp, slug)
-    
-    GSI1 (BlogsByDate): GSI1PK="BLOG#ALL", GSI1SK=created_at (for listing blogs)
+
+    GSI1 (BlogsByDate): GSI1PK="BLOG#ALL#{shard}", GSI1SK=created_at (for listing blogs;
+        write-sharded by blogId hash, read by scatter-gather over every shard)
     GSI2 (BlogBySlug): GSI2PK="SLUG#{slug}", GSI2SK=blogId (for slug lookups)
     GSI3 (LikesByBlog): GSI3PK="LIKE#{blogId}", GSI3SK="{timestamp}#{ip}" (for likes)
+    GSI4 (PendingItems): sparse, only items awaiting action, e.g. GSI4PK="COMMENT#PENDING", GSI4SK=commentId,
+        or GSI4PK="BLOG#SCHEDULED", GSI4SK=zero-padded published_at for posts waiting to go live
+
+    GSI1 is sparse too: only published blogs carry its keys, so drafts and
+    scheduled posts never appear in (or are filtered out of) list queries.
+
+    Archive entries (derived, maintained by the stream processor) group published blogs by month: PK="ARCHIVE#{YYYY-MM}",
+    SK="{published_at}#{blogId}" holding the list fields, with per-month counts on
+    PK="STATS#GLOBAL", SK="ARCHIVE" (one attribute per month).
+
+    After a blog is deleted, SK="CASCADE" in its partition tracks the background
+    removal of its likes, comments and view aggregates.
+
+    View aggregates also live in the blog's partition: SK="VIEWS#D#{YYYYMMDD}" and "VIEWS#M#{YYYYMM}".
+
+    Comments live in their blog's partition: SK="COMMENT#{commentId}" once approved,
+    SK="PENDING#{commentId}" while awaiting moderation. Comment IDs sort by creation time.
+
+    Refresh tokens: PK="TOKENFAMILY#{familyId}", SK="METADATA" holds the ID of the one
+    valid token in a login's rotation chain, expiring (TTL) with it.
     """
-    
+
     def __init__(self):
-        self.table = get_table('DATA_TABLE')
-    
+        self.client = dynamodb
+        self.table_name = get_table_name('DATA_TABLE')
+        self.read_latency = LatencyTracker()
+        # Queries return more data than GetItem, so they hedge on their own latencies
+        self.query_latency = LatencyTracker()
+        self.read_stats = {}
+
+    def _get_item(self, key: Dict, fields: Optional[tuple] = None) -> Optional[Dict]:
+        """GetItem (projected to fields), hedged and bounded by the request deadline; returns the wire item or None"""
+        def call():
+            return self.client.get_item(TableName=self.table_name, Key=key, **projection(fields))
+        response = hedged_call(call, self.read_latency, self.read_stats) if HEDGE_READS else call()
+        return response.get('Item')
+
+    def _query_page(self, query_kwargs: Dict) -> Dict:
+        """One Query page, hedged and bounded by the request deadline like _get_item"""
+        query_kwargs = dict(query_kwargs)
+
+        def call():
+            return self.client.query(**query_kwargs)
+        return hedged_call(call, self.query_latency, self.read_stats) if HEDGE_READS else call()
+
     # Portfolio operations
-    def get_portfolio(self, user_id: str = 'default') -> Optional[Dict]:
-        """Get portfolio data - Query operation"""
+    def get_portfolio_sections(self, user_id: str = 'default', sections: Optional[tuple] = None) -> Dict[str, Any]:
+        """
+        Section values ({section: value}, defaults for sections never saved) - one
+        hedged Query: the whole portfolio partition, or just one section's key range
+        """
+        sections = tuple(sections or PORTFOLIO_SECTIONS)
+        key_condition, values = 'PK = :pk', {':pk': f'{PORTFOLIO_PREFIX}{user_id}'}
+        if len(sections) == 1:
+            key_condition += ' AND begins_with(SK, :sk)'
+            values[':sk'] = PORTFOLIO_SECTIONS[sections[0]][0]
+
+        items = {section: [] for section in sections}
+        query_kwargs = {
+            'TableName': self.table_name,
+            'KeyConditionExpression': key_condition,
+            'ExpressionAttributeValues': to_values(values)
+        }
         try:
-            response = self.table.get_item(
-                Key={
-                    'PK': f'{PORTFOLIO_PREFIX}{user_id}',
-                    'SK': METADATA_SK
-                }
-            )
-            item = response.get('Item')
-            if item:
-                # Remove internal keys before returning
-                item.pop('PK', None)
-                item.pop('SK', None)
-                item.pop('GSI1PK', None)
-                item.pop('GSI1SK', None)
-                item.pop('GSI2PK', None)
-                item.pop('GSI2SK', None)
-                item.pop('GSI3PK', None)
-                item.pop('GSI3SK', None)
-                return decimal_to_int(item)
-            return None
+            while True:
+                response = self._query_page(query_kwargs)
+                for item in response.get('Items', []):
+                    section = portfolio_section_of(item['SK']['S'])
+                    if section in items:
+                        items[section].append(from_item(item))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             print(f"Error getting portfolio: {str(e)}")
+            raise
+        return {section: portfolio_section_value(section, section_items) for section, section_items in items.items()}
+
+    def get_portfolio(self, user_id: str = 'default', fields: Optional[tuple] = None) -> Dict:
+        """Get portfolio data assembled from its section items, optionally only some fields - one Query"""
+        portfolio = assemble_portfolio(user_id, self.get_portfolio_sections(user_id, portfolio_sections_for(fields)))
+        return {field: portfolio[field] for field in fields if field in portfolio} if fields else portfolio
+
+    def update_portfolio_section(self, user_id: str, section: str, data: Dict) -> Dict:
+        """Update the profile or about section - UpdateItem returning the new section (no follow-up read)"""
+        data = {attr: value for attr, value in data.items() if attr in PORTFOLIO_SECTIONS[section][1]}
+        try:
+            response = self.client.update_item(
+                TableName=self.table_name,
+                Key=item_key(f'{PORTFOLIO_PREFIX}{user_id}', PORTFOLIO_SECTIONS[section][0]),
+                ReturnValues='ALL_NEW',
+                **set_expression(data, updated_at=int(time.time()))
+            )
+            return portfolio_section_value(section, [from_item(response['Attributes'])])
+        except Exception as e:
+            print(f"Error updating portfolio section: {str(e)}")
+            raise
+
+    def _portfolio_item(self, user_id: str, section: str, entry: Dict) -> Dict:
+        """Wire item of a project/experience entry"""
+        return to_item({
+            **entry,
+            'PK': f'{PORTFOLIO_PREFIX}{user_id}',
+            'SK': f'{PORTFOLIO_SECTIONS[section][0]}{entry["id"]}'
+        })
+
+    def create_portfolio_item(self, user_id: str, section: str, entry: Dict) -> Dict:
+        """Add a project/experience entry (entry carries its id and sort_order) - conditional PutItem"""
+        entry = {**entry, 'updated_at': int(time.time())}
+        try:
+            self.client.put_item(
+                TableName=self.table_name,
+                Item=self._portfolio_item(user_id, section, entry),
+                ConditionExpression='attribute_not_exists(PK)'
+            )
+            return entry
+        except Exception as e:
+            print(f"Error creating portfolio item: {str(e)}")
+            raise
+
+    def update_portfolio_item(self, user_id: str, section: str, item_id: str, data: Dict) -> Optional[Dict]:
+        """Update one project/experience entry; None if it does not exist - UpdateItem returning the new entry"""
+        try:
+            response = self.client.update_item(
+                TableName=self.table_name,
+                Key=item_key(f'{PORTFOLIO_PREFIX}{user_id}', f'{PORTFOLIO_SECTIONS[section][0]}{item_id}'),
+                ConditionExpression='attribute_exists(PK)',
+                ReturnValues='ALL_NEW',
+                **set_expression(data, updated_at=int(time.time()))
+            )
+            return from_item(response['Attributes'])
+        except self.client.exceptions.ConditionalCheckFailedException:
             return None
-    
-    def update_portfolio(self, user_id: str, data: Dict) -> Dict:
-        """Update portfolio data"""
-        # Remove None values
-        update_data = {k: v for k, v in data.items() if v is not None}
-        
-        # Build update expression
-        update_expr = "SET "
-        expr_attr_names = {}
-        expr_attr_values = {}
-        
-        for i, (key, value) in enumerate(update_data.items(), 1):
-            update_expr += f"#{key} = :val{i}, "
-            expr_attr_names[f"#{key}"] = key
-            expr_attr_values[f":val{i}"] = value
-        
-        update_expr += "#updated_at = :updated_at"
-        expr_attr_names["#updated_at"] = "updated_at"
-        expr_attr_values[":updated_at"] = int(time.time())
-        
-        try:
-            self.table.update_item(
-                Key={
-                    'PK': f'{PORTFOLIO_PREFIX}{user_id}',
-                    'SK': METADATA_SK
-                },
-                UpdateExpression=update_expr,
-                ExpressionAttributeNames=expr_attr_names,
-                ExpressionAttributeValues=expr_attr_values
+        except Exception as e:
+            print(f"Error updating portfolio item: {str(e)}")
+            raise
+
+    def delete_portfolio_item(self, user_id: str, section: str, item_id: str) -> Optional[Dict]:
+        """Delete one project/experience entry; returns it, or None if it did not exist - conditional DeleteItem"""
+        try:
+            response = self.client.delete_item(
+                TableName=self.table_name,
+                Key=item_key(f'{PORTFOLIO_PREFIX}{user_id}', f'{PORTFOLIO_SECTIONS[section][0]}{item_id}'),
+                ConditionExpression='attribute_exists(PK)',
+                ReturnValues='ALL_OLD'
             )
-            return self.get_portfolio(user_id)
+            return from_item(response['Attributes'])
+        except self.client.exceptions.ConditionalCheckFailedException:
+            return None
         except Exception as e:
-            print(f"Error updating portfolio: {str(e)}")
+            print(f"Error deleting portfolio item: {str(e)}")
             raise
-    
+
+    def replace_portfolio_list(self, user_id: str, section: str, entries: List[Dict]) -> List[Dict]:
+        """
+        Make a list section hold exactly `entries`, in order (entries without an
+        id get one): one Query for the current keys, then BatchWriteItem puts and deletes
+        """
+        now = int(time.time())
+        entries = [
+            {**entry, 'id': entry.get('id') or generate_sortable_id(), 'sort_order': order, 'updated_at': now}
+            for order, entry in enumerate(entries)
+        ]
+        current = {item['id'] for item in self.get_portfolio_sections(user_id, (section,))[section]}
+        kept = {entry['id'] for entry in entries}
+        requests = [{'PutRequest': {'Item': self._portfolio_item(user_id, section, entry)}} for entry in entries]
+        requests += [
+            {'DeleteRequest': {'Key': item_key(f'{PORTFOLIO_PREFIX}{user_id}', f'{PORTFOLIO_SECTIONS[section][0]}{item_id}')}}
+            for item_id in current - kept
+        ]
+        self._batch_write(requests)
+        return entries
+
+    def update_portfolio(self, user_id: str, data: Dict) -> Dict:
+        """
+        Update portfolio data given as one document (any of the section attributes).
+        Each section it touches is written on its own; returns the whole portfolio.
+        """
+        sections = {}
+        for section, (_, attrs) in PORTFOLIO_SECTIONS.items():
+            if section in PORTFOLIO_LIST_SECTIONS:
+                if data.get(section) is not None:
+                    sections[section] = self.replace_portfolio_list(user_id, section, data[section])
+            else:
+                values = {attr: data[attr] for attr in attrs if data.get(attr) is not None}
+                if values:
+                    sections[section] = self.update_portfolio_section(user_id, section, values)
+
+        # Sections left alone are read back in one Query
+        untouched = tuple(section for section in PORTFOLIO_SECTIONS if section not in sections)
+        if untouched:
+            sections.update(self.get_portfolio_sections(user_id, untouched))
+        return assemble_portfolio(user_id, {section: sections[section] for section in PORTFOLIO_SECTIONS})
+
     # Blog operations
-    def create_blog(self, blog_data: Dict) -> Dict:
-        """Create a new blog post"""
-        blog_id = blog_data.get('blogId')
-        created_at = blog_data.get('created_at', int(time.time()))
-        slug = blog_data.get('slug', '')
-        
-        # Prepare item with all keys
-        item = {
+    def _blog_item(self, blog: Dict) -> Dict:
+        """Blog attributes plus the key attributes for its publication state, in wire format"""
+        blog_id = blog.get('blogId')
+        keys = {
             'PK': f'{BLOG_PREFIX}{blog_id}',
             'SK': METADATA_SK,
-            'GSI1PK': BLOG_ALL_PREFIX,
-            'GSI1SK': created_at,
-            'GSI2PK': f'{SLUG_PREFIX}{slug}',
-            'GSI2SK': blog_id,
-            **blog_data
+            'GSI2PK': f"{SLUG_PREFIX}{blog.get('slug', '')}",
+            'GSI2SK': blog_id
         }
-        
+        status = blog.get('status', BLOG_PUBLISHED)
+        if status == BLOG_PUBLISHED:
+            keys['GSI1PK'] = blog_list_shard(blog_id)
+            keys['GSI1SK'] = blog.get('published_at') or blog.get('created_at', int(time.time()))
+        elif status == BLOG_SCHEDULED:
+            keys['GSI4PK'] = SCHEDULED_BLOGS_PK
+            keys['GSI4SK'] = f"{blog['published_at']:0{TIMESTAMP_WIDTH}d}"
+        return to_item({**blog, **keys})
+
+    def _slug_actions(self, claims: Dict[str, str], releases: Dict[str, str]) -> List[Dict]:
+        """
+        TransactWriteItems actions for slug reservations: claims and releases map
+        slug -> blogId. A claim succeeds if the slug is free, already the blog's,
+        or released by another blog in the same write (a hand-over). A release
+        only removes a reservation that still belongs to its blog.
+        """
+        actions = []
+        for slug, blog_id in claims.items():
+            condition = 'attribute_not_exists(PK) OR blogId = :id'
+            values = {':id': {'S': blog_id}}
+            if slug in releases:
+                condition += ' OR blogId = :from'
+                values[':from'] = {'S': releases[slug]}
+            actions.append({'Put': {
+                'TableName': self.table_name,
+                'Item': to_item({'PK': f'{SLUG_PREFIX}{slug}', 'SK': METADATA_SK, 'blogId': blog_id}),
+                'ConditionExpression': condition,
+                'ExpressionAttributeValues': values
+            }})
+        for slug, blog_id in releases.items():
+            if slug in claims:
+                continue
+            actions.append({'Delete': {
+                'TableName': self.table_name,
+                'Key': item_key(f'{SLUG_PREFIX}{slug}'),
+                'ConditionExpression': 'attribute_not_exists(PK) OR blogId = :id',
+                'ExpressionAttributeValues': {':id': {'S': blog_id}}
+            }})
+        return actions
+
+    def _write_with_slugs(self, actions: List[Dict]):
+        """Run a transaction whose actions after the first reserve slugs; a failed reservation raises SlugTakenError"""
         try:
-            self.table.put_item(Item=item)
+            self.client.transact_write_items(TransactItems=actions)
+        except self.client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get('CancellationReasons', [])
+            if any(reason.get('Code') == 'ConditionalCheckFailed' for reason in reasons[1:]):
+                raise SlugTakenError()
+            raise
+
+    def create_blog(self, blog_data: Dict) -> Dict:
+        """Create a new blog post and reserve its slug in one transaction (SlugTakenError if the slug is taken)"""
+        try:
+            self._write_with_slugs([
+                {'Put': {
+                    'TableName': self.table_name,
+                    'Item': self._blog_item(blog_data),
+                    'ConditionExpression': 'attribute_not_exists(PK)'
+                }},
+                *self._slug_actions({blog_data['slug']: blog_data['blogId']}, {})
+            ])
             # Return clean data
-            return decimal_to_int(blog_data)
+            return blog_data
+        except SlugTakenError:
+            raise
         except Exception as e:
             print(f"Error creating blog: {str(e)}")
             raise
-    
-    def get_blog_by_id(self, blog_id: str) -> Optional[Dict]:
-        """Get blog by ID - GetItem operation"""
+
+    def get_blog_by_id(self, blog_id: str, fields: Optional[tuple] = None) -> Optional[Dict]:
+        """Get blog by ID, optionally only some fields - GetItem operation"""
         try:
-            response = self.table.get_item(
-                Key={
-                    'PK': f'{BLOG_PREFIX}{blog_id}',
-                    'SK': METADATA_SK
-                }
-            )
-            item = response.get('Item')
+            item = self._get_item(item_key(f'{BLOG_PREFIX}{blog_id}'), fields)
             if item:
-                # Remove internal keys
-                item.pop('PK', None)
-                item.pop('SK', None)
-                item.pop('GSI1PK', None)
-                item.pop('GSI1SK', None)
-                item.pop('GSI2PK', None)
-                item.pop('GSI2SK', None)
-                item.pop('GSI3PK', None)
-                item.pop('GSI3SK', None)
-                return decimal_to_int(item)
+                return from_item(item)
             return None
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             print(f"Error getting blog: {str(e)}")
             return None
-    
-    def get_blog_by_slug(self, slug: str) -> Optional[Dict]:
-        """Get blog by slug - Query GSI2 operation"""
+
+    def batch_get_blogs(self, blog_ids: List[str], fields: Optional[tuple] = None) -> Dict[str, Dict]:
+        """Get many blogs by ID - BatchGetItem, retrying unprocessed keys; returns {blogId: blog}"""
+        blogs = {}
+        unique_ids = list(dict.fromkeys(blog_ids))
+        for i in range(0, len(unique_ids), MAX_BATCH_GET_KEYS):
+            request = {
+                'Keys': [item_key(f'{BLOG_PREFIX}{blog_id}') for blog_id in unique_ids[i:i + MAX_BATCH_GET_KEYS]],
+                **projection(fields)
+            }
+
+            pending = {self.table_name: request}
+            attempt = 0
+            while pending:
+                try:
+                    response = self.client.batch_get_item(RequestItems=pending)
+                except Exception as e:
+                    print(f"Error batch getting blogs: {str(e)}")
+                    raise
+                for item in response.get('Responses', {}).get(self.table_name, []):
+                    blog = from_item(item)
+                    blogs[blog['blogId']] = blog
+                pending = response.get('UnprocessedKeys') or {}
+                if pending:
+                    attempt += 1
+                    time.sleep(min(0.05 * 2 ** attempt, 1.0))
+        return blogs
+
+    def resolve_slug(self, slug: str) -> Optional[str]:
+        """Blog ID reserving a slug - strongly consistent GetItem on SLUG#{slug}"""
+        response = self.client.get_item(
+            TableName=self.table_name,
+            Key=item_key(f'{SLUG_PREFIX}{slug}'),
+            ProjectionExpression='blogId',
+            ConsistentRead=True
+        )
+        item = response.get('Item')
+        return item['blogId']['S'] if item else None
+
+    def get_blog_by_slug(self, slug: str, fields: Optional[tuple] = None) -> Optional[Dict]:
+        """Get blog by slug - GetItem on its reservation, then GetItem for the blog"""
         try:
-            response = self.table.query(
-                IndexName='BlogBySlug',
-                KeyConditionExpression=Key('GSI2PK').eq(f'{SLUG_PREFIX}{slug}')
-            )
-            items = response.get('Items', [])
-            if items:
-                item = items[0]
-                # Get the actual blog using the blogId from GSI2SK
-                blog_id = item.get('GSI2SK')
-                return self.get_blog_by_id(blog_id)
-            return None
+            blog_id = self.resolve_slug(slug)
+            return self.get_blog_by_id(blog_id, fields) if blog_id else None
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             print(f"Error getting blog by slug: {str(e)}")
             return None
-    
-    def get_all_blogs(self, limit: int = 50, last_key: Optional[Dict] = None) -> Dict:
-        """Get all blogs sorted by date - Query GSI1 operation (NO SCAN)"""
+
+    def get_slug_owners(self, slugs: List[str]) -> Dict[str, str]:
+        """Blog IDs reserving each taken slug - consistent BatchGetItem of SLUG# items; returns {slug: blogId}"""
+        owners = {}
+        unique_slugs = list(dict.fromkeys(slugs))
+        for i in range(0, len(unique_slugs), MAX_BATCH_GET_KEYS):
+            pending = {self.table_name: {
+                'Keys': [item_key(f'{SLUG_PREFIX}{slug}') for slug in unique_slugs[i:i + MAX_BATCH_GET_KEYS]],
+                'ProjectionExpression': 'PK, blogId',
+                'ConsistentRead': True
+            }}
+            attempt = 0
+            while pending:
+                try:
+                    response = self.client.batch_get_item(RequestItems=pending)
+                except Exception as e:
+                    print(f"Error getting slug owners: {str(e)}")
+                    raise
+                for item in response.get('Responses', {}).get(self.table_name, []):
+                    owners[item['PK']['S'][len(SLUG_PREFIX):]] = item['blogId']['S']
+                pending = response.get('UnprocessedKeys') or {}
+                if pending:
+                    attempt += 1
+                    time.sleep(min(0.05 * 2 ** attempt, 1.0))
+        return owners
+
+    def _query_list_shard(self, shard: int, limit: int, start_key: Optional[Dict]) -> Dict:
+        """One BlogsByDate shard's next `limit` keys, newest first"""
+        query_kwargs = {
+            'TableName': self.table_name,
+            'IndexName': 'BlogsByDate',
+            'KeyConditionExpression': 'GSI1PK = :pk',
+            'ExpressionAttributeValues': {':pk': {'S': f'{BLOG_ALL_PREFIX}#{shard}'}},
+            'ProjectionExpression': 'blogId, PK, SK, GSI1PK, GSI1SK',
+            'ScanIndexForward': False,  # Descending order (newest first)
+            'Limit': limit
+        }
+        if start_key:
+            query_kwargs['ExclusiveStartKey'] = to_item(
+                {attr: start_key.get(attr) for attr in BLOG_LIST_KEY_ATTRS}
+            )
+        response = self.client.query(**query_kwargs)
+        return {
+            'items': [from_item(item, drop=()) for item in response.get('Items', [])],
+            'more': 'LastEvaluatedKey' in response
+        }
+
+    def get_blog_ids(self, limit: int = 50, last_key: Optional[Dict] = None) -> Dict:
+        """
+        Get one page of blog IDs sorted by date - parallel Query on every BlogsByDate
+        shard, k-way merged by created_at.
+
+        last_key is a composite cursor: {'shards': {shard: key of the last item
+        returned from it}, 'done': [exhausted shards]}. Shards not yet read start
+        from the top. Each shard resumes exactly after its own last item, so
+        pages neither skip nor repeat blogs.
+        """
+        cursor = last_key or {}
+        positions = {int(shard): key for shard, key in (cursor.get('shards') or {}).items()}
+        done = {int(shard) for shard in cursor.get('done') or []}
+        live = [shard for shard in range(BLOG_LIST_SHARDS) if shard not in done]
+
         try:
-            query_kwargs = {
-                'IndexName': 'BlogsByDate',
-                'KeyConditionExpression': Key('GSI1PK').eq(BLOG_ALL_PREFIX),
-                'ScanIndexForward': False,  # Descending order (newest first)
-                'Limit': limit
+            results = dict(zip(live, _shard_pool.map(
+                lambda shard: self._query_list_shard(shard, limit, positions.get(shard)), live
+            )))
+        except Exception as e:
+            print(f"Error getting blog ids: {str(e)}")
+            raise
+
+        ids = []
+        offsets = {shard: 0 for shard in live}
+        while len(ids) < limit:
+            heads = [
+                (results[shard]['items'][offsets[shard]]['GSI1SK'], shard)
+                for shard in live if offsets[shard] < len(results[shard]['items'])
+            ]
+            # A shard with unread items beyond this fetch could hold the next newest blog
+            if not heads or any(
+                offsets[shard] == len(results[shard]['items']) and results[shard]['more'] for shard in live
+            ):
+                break
+            _, shard = max(heads)
+            item = results[shard]['items'][offsets[shard]]
+            offsets[shard] += 1
+            positions[shard] = {attr: item[attr] for attr in BLOG_LIST_KEY_ATTRS}
+            ids.append(item['blogId'])
+
+        for shard in live:
+            if offsets[shard] == len(results[shard]['items']) and not results[shard]['more']:
+                done.add(shard)
+
+        pagination_key = None
+        if len(done) < BLOG_LIST_SHARDS:
+            pagination_key = {
+                'shards': {str(shard): key for shard, key in positions.items() if shard not in done},
+                'done': sorted(done)
             }
-            
-            if last_key:
-                # Convert last_key to proper format for GSI
-                query_kwargs['ExclusiveStartKey'] = {
-                    'PK': last_key.get('PK'),
-                    'SK': last_key.get('SK'),
-                    'GSI1PK': last_key.get('GSI1PK'),
-                    'GSI1SK': last_key.get('GSI1SK')
-                }
-            
-            response = self.table.query(**query_kwargs)
-            items = response.get('Items', [])
-            
-            # Clean items and extract blog data
-            cleaned_items = []
-            for item in items:
-                # Get full blog data
-                blog_id = item.get('blogId')
-                if blog_id:
-                    blog = self.get_blog_by_id(blog_id)
-                    if blog:
-                        cleaned_items.append(blog)
-            
-            # Prepare last_key for pagination
-            last_eval_key = response.get('LastEvaluatedKey')
-            pagination_key = None
-            if last_eval_key:
-                pagination_key = {
-                    'PK': last_eval_key.get('PK'),
-                    'SK': last_eval_key.get('SK'),
-                    'GSI1PK': last_eval_key.get('GSI1PK'),
-                    'GSI1SK': last_eval_key.get('GSI1SK')
+
+        return {
+            'ids': ids,
+            'last_key': pagination_key
+        }
+
+    def get_all_blogs(self, limit: int = 50, last_key: Optional[Dict] = None, fields: Optional[tuple] = None) -> Dict:
+        """Get all blogs sorted by date - Query GSI1 for the page, then one BatchGetItem (NO SCAN)"""
+        page = self.get_blog_ids(limit, last_key)
+        blogs = self.batch_get_blogs(page['ids'], fields) if page['ids'] else {}
+        return {
+            'items': [blogs[blog_id] for blog_id in page['ids'] if blog_id in blogs],
+            'last_key': page['last_key']
+        }
+
+    def _iter_list_shard(self, shard: int, fields: tuple, page_size: Optional[int]):
+        """Yield (created_at, blog) from one BlogsByDate shard, newest first"""
+        names = dict.fromkeys((*fields, 'GSI1SK'))
+        query_kwargs = {
+            'TableName': self.table_name,
+            'IndexName': 'BlogsByDate',
+            'KeyConditionExpression': 'GSI1PK = :pk',
+            'ExpressionAttributeValues': {':pk': {'S': f'{BLOG_ALL_PREFIX}#{shard}'}},
+            **projection(tuple(names)),
+            'ScanIndexForward': False
+        }
+        if page_size:
+            query_kwargs['Limit'] = page_size
+        while True:
+            try:
+                response = self.client.query(**query_kwargs)
+            except Exception as e:
+                print(f"Error iterating blogs: {str(e)}")
+                raise
+            for item in response.get('Items', []):
+                yield int(item['GSI1SK']['N']), from_item(item)
+            if 'LastEvaluatedKey' not in response:
+                return
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def iter_blogs(self, fields: tuple = ('blogId',), page_size: Optional[int] = None):
+        """Yield every listed blog, newest first, projected to fields - paginated Query per shard, merged lazily"""
+        shards = [self._iter_list_shard(shard, fields, page_size) for shard in range(BLOG_LIST_SHARDS)]
+        for _, blog in heapq.merge(*shards, key=lambda entry: entry[0], reverse=True):
+            yield blog
+
+    def update_blog(self, blog_id: str, data: Dict) -> Optional[Dict]:
+        """
+        Update blog post, writing only the changed attributes; a slug change swaps
+        its reservation in the same transaction (SlugTakenError if taken).
+        Returns the updated blog, or None if it does not exist.
+
+        The update is conditioned on the blog existing and never writes counters,
+        so likes and comments that land mid-edit are kept and a blog deleted
+        mid-edit stays deleted.
+        """
+        key = item_key(f'{BLOG_PREFIX}{blog_id}')
+        if not data:
+            return self.get_blog_by_id(blog_id)
+        if 'slug' not in data:
+            try:
+                response = self.client.update_item(
+                    TableName=self.table_name,
+                    Key=key,
+                    ReturnValues='ALL_NEW',
+                    **blog_update_expression(blog_id, data)
+                )
+                return from_item(response['Attributes'])
+            except self.client.exceptions.ConditionalCheckFailedException:
+                return None
+            except Exception as e:
+                print(f"Error updating blog: {str(e)}")
+                raise
+
+        # The old slug's reservation is released, so it is read (and checked by the write) first
+        for _ in range(WRITE_ATTEMPTS):
+            blog = self._read_blog(key)
+            if blog is None:
+                return None
+            previous_slug = blog.get('slug')
+            update = {'TableName': self.table_name, 'Key': key, **blog_update_expression(blog_id, data, True, previous_slug)}
+            try:
+                if data['slug'] == previous_slug:
+                    response = self.client.update_item(ReturnValues='ALL_NEW', **update)
+                    return from_item(response['Attributes'])
+                self._write_with_slugs([
+                    {'Update': update},
+                    *self._slug_actions({data['slug']: blog_id}, {previous_slug: blog_id} if previous_slug else {})
+                ])
+                return {attr: value for attr, value in {**blog, **data}.items() if value is not None}
+            except self.client.exceptions.ConditionalCheckFailedException:
+                # Deleted or renamed since the read
+                continue
+            except self.client.exceptions.TransactionCanceledException as e:
+                reasons = e.response.get('CancellationReasons', [])
+                if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+                    continue
+                raise
+            except SlugTakenError:
+                raise
+            except Exception as e:
+                print(f"Error updating blog: {str(e)}")
+                raise
+        raise RuntimeError(f"Blog {blog_id} kept changing during update")
+
+    def _read_blog(self, key: Dict) -> Optional[Dict]:
+        """Strongly consistent GetItem of a blog item, for read-then-write paths"""
+        try:
+            response = self.client.get_item(TableName=self.table_name, Key=key, ConsistentRead=True)
+            return from_item(response['Item']) if 'Item' in response else None
+        except Exception as e:
+            print(f"Error reading blog: {str(e)}")
+            raise
+
+    def get_due_blog_ids(self, now: int) -> List[str]:
+        """IDs of scheduled blogs whose publish time has passed - Query GSI4 (sparse)"""
+        query_kwargs = {
+            'TableName': self.table_name,
+            'IndexName': 'PendingItems',
+            'KeyConditionExpression': 'GSI4PK = :pk AND GSI4SK <= :now',
+            'ExpressionAttributeValues': {
+                ':pk': {'S': SCHEDULED_BLOGS_PK},
+                ':now': {'S': f'{now:0{TIMESTAMP_WIDTH}d}'}
+            },
+            'ProjectionExpression': 'blogId'
+        }
+        blog_ids = []
+        while True:
+            try:
+                response = self.client.query(**query_kwargs)
+            except Exception as e:
+                print(f"Error getting due blogs: {str(e)}")
+                raise
+            blog_ids.extend(item['blogId']['S'] for item in response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                return blog_ids
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def publish_scheduled_blog(self, blog_id: str, now: int) -> Optional[Dict]:
+        """
+        Move a due scheduled blog into the list index in one conditional update.
+        Returns the published blog, or None if it was already published,
+        rescheduled or deleted in the meantime.
+        """
+        try:
+            response = self.client.update_item(
+                TableName=self.table_name,
+                Key=item_key(f'{BLOG_PREFIX}{blog_id}'),
+                UpdateExpression="SET #status = :published, GSI1PK = :shard, GSI1SK = published_at REMOVE GSI4PK, GSI4SK",
+                ConditionExpression="#status = :scheduled AND published_at <= :now",
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues={
+                    ':published': {'S': BLOG_PUBLISHED},
+                    ':scheduled': {'S': BLOG_SCHEDULED},
+                    ':shard': {'S': blog_list_shard(blog_id)},
+                    ':now': {'N': str(now)}
+                },
+                ReturnValues='ALL_NEW'
+            )
+            return from_item(response['Attributes'])
+        except self.client.exceptions.ConditionalCheckFailedException:
+            return None
+        except Exception as e:
+            print(f"Error publishing blog: {str(e)}")
+            raise
+
+    def set_blog_image_variants(self, blog_id: str, variants: Dict):
+        """Store the responsive image variants map on a blog"""
+        try:
+            self.client.update_item(
+                TableName=self.table_name,
+                Key=item_key(f'{BLOG_PREFIX}{blog_id}'),
+                UpdateExpression="SET image_variants = :variants",
+                ConditionExpression="attribute_exists(PK)",
+                ExpressionAttributeValues={
+                    ':variants': serialize(variants)
                 }
-            
-            return {
-                'items': cleaned_items,
-                'last_key': pagination_key
+            )
+        except Exception as e:
+            print(f"Error setting image variants: {str(e)}")
+            raise
+
+    def delete_blog(self, blog_id: str) -> Optional[Dict]:
+        """
+        Delete blog post and release its slug in one transaction; returns the
+        deleted blog, or None if it did not exist.
+
+        The delete is conditioned on the slug just read, so a concurrent rename
+        (which moves the reservation) makes it re-read rather than release the
+        wrong slug. A reservation held by another blog is not the post's to
+        release, and the post is deleted without touching it.
+        """
+        key = item_key(f'{BLOG_PREFIX}{blog_id}')
+        release = True
+        for _ in range(WRITE_ATTEMPTS):
+            blog = self._read_blog(key)
+            if blog is None:
+                return None
+            slug = blog.get('slug')
+
+            delete = {'TableName': self.table_name, 'Key': key}
+            if slug:
+                delete['ConditionExpression'] = 'slug = :slug'
+                delete['ExpressionAttributeValues'] = {':slug': {'S': slug}}
+            else:
+                delete['ConditionExpression'] = 'attribute_exists(PK) AND attribute_not_exists(slug)'
+            releases = self._slug_actions({}, {slug: blog_id} if slug and release else {})
+            try:
+                self.client.transact_write_items(TransactItems=[{'Delete': delete}, *releases])
+                return blog
+            except self.client.exceptions.TransactionCanceledException as e:
+                reasons = e.response.get('CancellationReasons', [])
+                if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+                    # Deleted or renamed since the read
+                    continue
+                if any(reason.get('Code') == 'ConditionalCheckFailed' for reason in reasons[1:]):
+                    release = False
+                    continue
+                raise
+            except Exception as e:
+                print(f"Error deleting blog: {str(e)}")
+                raise
+        raise RuntimeError(f"Blog {blog_id} kept changing during delete")
+
+    def bulk_write_blogs(self, creates: List[Dict], updates: List[tuple], deletes: List[Dict], atomic: bool = False) -> List[str]:
+        """
+        Write many blogs at once: puts for creates, UpdateItems of just the changed
+        attributes for updates, given as (merged blog, blog read) pairs, and
+        deletes of the given blogs, plus the slug reservations those claim and
+        release. Updates never write counters back and require the blog to still
+        exist (and, when renaming, to still have the slug read).
+
+        atomic=True applies everything in one TransactWriteItems (at most
+        MAX_TRANSACTION_ITEMS actions), conditioned on creates being new,
+        updated/deleted blogs still existing and claimed slugs being free; a
+        failed condition raises TransactionCanceledException and nothing is
+        written. Otherwise creates and deletes go out as BatchWriteItem chunks,
+        retrying unprocessed items, and updates as concurrent conditional
+        UpdateItems, so slugs must be checked first. An update whose blog was
+        deleted or renamed in the meantime is skipped with its slug changes.
+
+        Returns the IDs of skipped updates.
+        """
+        changed = [(blog, previous, blog_changes_between(blog, previous)) for blog, previous in updates]
+        changed = [(blog, previous, changes) for blog, previous, changes in changed if changes]
+        update_actions = [
+            {'Update': {
+                'TableName': self.table_name,
+                'Key': item_key(f"{BLOG_PREFIX}{blog['blogId']}"),
+                **blog_update_expression(blog['blogId'], changes, 'slug' in changes, previous.get('slug'))
+            }}
+            for blog, previous, changes in changed
+        ]
+        actions = [
+            {'Put': {'TableName': self.table_name, 'Item': self._blog_item(blog),
+                     'ConditionExpression': 'attribute_not_exists(PK)'}}
+            for blog in creates
+        ] + [
+            {'Delete': {'TableName': self.table_name, 'Key': item_key(f"{BLOG_PREFIX}{blog['blogId']}"),
+                        'ConditionExpression': 'attribute_exists(PK)'}}
+            for blog in deletes
+        ]
+
+        if atomic:
+            actions += update_actions + self._bulk_slug_actions(creates, [(blog, previous) for blog, previous, _ in changed], deletes)
+            if len(actions) > MAX_TRANSACTION_ITEMS:
+                raise ValueError(f"At most {MAX_TRANSACTION_ITEMS} writes fit in one transaction")
+            try:
+                self.client.transact_write_items(TransactItems=actions)
+                return []
+            except Exception as e:
+                print(f"Error bulk writing blogs: {str(e)}")
+                raise
+
+        def apply(action):
+            try:
+                self.client.update_item(**action['Update'])
+                return True
+            except self.client.exceptions.ConditionalCheckFailedException:
+                return False
+
+        try:
+            applied = list(_write_pool.map(apply, update_actions))
+            renamed = [(blog, previous) for (blog, previous, _), ok in zip(changed, applied) if ok]
+            actions += self._bulk_slug_actions(creates, renamed, deletes)
+            self._batch_write([
+                {'PutRequest': {'Item': action['Put']['Item']}} if 'Put' in action
+                else {'DeleteRequest': {'Key': action['Delete']['Key']}}
+                for action in actions
+            ])
+        except Exception as e:
+            print(f"Error bulk writing blogs: {str(e)}")
+            raise
+        return [blog['blogId'] for (blog, _, _), ok in zip(changed, applied) if not ok]
+
+    def _bulk_slug_actions(self, creates: List[Dict], updates: List[tuple], deletes: List[Dict]) -> List[Dict]:
+        """Slug reservation actions for a bulk write's creates, renames and deletes"""
+        claims = {blog['slug']: blog['blogId'] for blog in creates}
+        claims.update({blog['slug']: blog['blogId'] for blog, previous in updates if blog['slug'] != previous.get('slug')})
+        releases = {
+            previous['slug']: previous['blogId'] for blog, previous in updates
+            if previous.get('slug') and blog['slug'] != previous['slug']
+        }
+        releases.update({blog['slug']: blog['blogId'] for blog in deletes if blog.get('slug')})
+        return self._slug_actions(claims, releases)
+
+    def iter_blog_dependents(self, blog_id: str):
+        """
+        Yield the wire keys of items that belong to a blog: its likes (LikesByBlog GSI)
+        with their visitors' LIKED# markers, and the comments, view aggregates and any
+        leftover summary in its partition. The blog item and the cascade progress item
+        are left alone.
+        """
+        own = {METADATA_SK, CASCADE_SK}
+        markers = set()
+        queries = [
+            {
+                'IndexName': 'LikesByBlog',
+                'KeyConditionExpression': 'GSI3PK = :pk',
+                'ExpressionAttributeValues': {':pk': {'S': f'{LIKE_PREFIX}{blog_id}'}}
+            },
+            {
+                'KeyConditionExpression': 'PK = :pk',
+                'ExpressionAttributeValues': {':pk': {'S': f'{BLOG_PREFIX}{blog_id}'}}
             }
+        ]
+        for query in queries:
+            query_kwargs = {'TableName': self.table_name, 'ProjectionExpression': 'PK, SK', **query}
+            while True:
+                try:
+                    response = self.client.query(**query_kwargs)
+                except Exception as e:
+                    print(f"Error listing blog dependents: {str(e)}")
+                    raise
+                for item in response.get('Items', []):
+                    sk = item['SK']['S']
+                    if sk in own:
+                        continue
+                    yield {'PK': item['PK'], 'SK': item['SK']}
+                    # A like's SK is {timestamp}:{ip_hash}, which names its visitor's marker;
+                    # a visitor who liked again after expiry has several likes but one marker
+                    if 'IndexName' in query:
+                        ip_hash = sk.split(':', 1)[1]
+                        if ip_hash not in markers:
+                            markers.add(ip_hash)
+                            yield item_key(f'{LIKED_PREFIX}{blog_id}#{ip_hash}')
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def _batch_write(self, requests: List[Dict]):
+        """BatchWriteItem put/delete requests in chunks, retrying unprocessed items with backoff"""
+        for i in range(0, len(requests), MAX_BATCH_WRITE_ITEMS):
+            pending = {self.table_name: requests[i:i + MAX_BATCH_WRITE_ITEMS]}
+            attempt = 0
+            while pending:
+                response = self.client.batch_write_item(RequestItems=pending)
+                pending = response.get('UnprocessedItems') or {}
+                if pending:
+                    attempt += 1
+                    time.sleep(min(0.05 * 2 ** attempt, 1.0))
+
+    def delete_items(self, keys: List[Dict]):
+        """Delete items by wire key - BatchWriteItem"""
+        try:
+            self._batch_write([{'DeleteRequest': {'Key': key}} for key in keys])
         except Exception as e:
-            print(f"Error getting blogs: {str(e)}")
+            print(f"Error deleting items: {str(e)}")
             raise
-    
-    def update_blog(self, blog_id: str, data: Dict) -> Optional[Dict]:
-        """Update blog post"""
-        # Get existing blog to preserve GSI keys
-        blog = self.get_blog_by_id(blog_id)
-        if not blog:
-            return None
-        
-        # Merge updates
-        blog.update(data)
-        
-        # Reconstruct item with GSI keys
-        created_at = blog.get('created_at', int(time.time()))
-        slug = blog.get('slug', '')
-        
-        item = {
+
+    def get_cascade_progress(self, blog_id: str) -> Optional[Dict]:
+        """Progress of a blog's cascading delete ({'deleted', 'done', 'updated_at'}), if one has run"""
+        try:
+            response = self.client.get_item(
+                TableName=self.table_name,
+                Key=item_key(f'{BLOG_PREFIX}{blog_id}', CASCADE_SK),
+                ConsistentRead=True
+            )
+            return from_item(response['Item']) if 'Item' in response else None
+        except Exception as e:
+            print(f"Error getting cascade progress: {str(e)}")
+            raise
+
+    def put_cascade_progress(self, blog_id: str, deleted: int, done: bool):
+        """Record how many dependent items a blog's cascading delete has removed"""
+        now = int(time.time())
+        progress = {
             'PK': f'{BLOG_PREFIX}{blog_id}',
-            'SK': METADATA_SK,
-            'GSI1PK': BLOG_ALL_PREFIX,
-            'GSI1SK': created_at,
-            'GSI2PK': f'{SLUG_PREFIX}{slug}',
-            'GSI2SK': blog_id,
-            **blog
+            'SK': CASCADE_SK,
+            'deleted': deleted,
+            'done': done,
+            'updated_at': now
         }
-        
+        if done:
+            progress['TTL'] = now + CASCADE_PROGRESS_TTL
         try:
-            self.table.put_item(Item=item)
-            return decimal_to_int(blog)
+            self.client.put_item(TableName=self.table_name, Item=to_item(progress))
         except Exception as e:
-            print(f"Error updating blog: {str(e)}")
+            print(f"Error putting cascade progress: {str(e)}")
             raise
-    
-    def delete_blog(self, blog_id: str) -> bool:
-        """Delete blog post"""
+
+    # Like operations
+    def add_like(self, blog_id: str, ip_hash: str, timestamp: int) -> bool:
+        """
+        Add a like to a blog; False if this visitor's earlier like has not expired.
+
+        The visitor's LIKED# marker, the raw like and an ADD on the blog's
+        likes_count are written in one transaction, so the stored count stays
+        exact under concurrent likes and reads never have to recount.
+        """
+        ttl = timestamp + LIKE_TTL
+        timestamp_ip = f'{timestamp}:{ip_hash}'
         try:
-            blog = self.get_blog_by_id(blog_id)
-            if not blog:
-                return False
-            
-            self.table.delete_item(
-                Key={
-                    'PK': f'{BLOG_PREFIX}{blog_id}',
-                    'SK': METADATA_SK
+            self.client.transact_write_items(TransactItems=[
+                {
+                    'Put': {
+                        'TableName': self.table_name,
+                        'Item': to_item({'PK': f'{LIKED_PREFIX}{blog_id}#{ip_hash}', 'SK': METADATA_SK, 'TTL': ttl}),
+                        # TTL deletion lags expiry, so an expired marker counts as absent
+                        'ConditionExpression': 'attribute_not_exists(PK) OR #ttl < :now',
+                        'ExpressionAttributeNames': {'#ttl': 'TTL'},
+                        'ExpressionAttributeValues': to_values({':now': timestamp})
+                    }
+                },
+                {
+                    'Put': {
+                        'TableName': self.table_name,
+                        'Item': to_item({
+                            'PK': f'{LIKE_PREFIX}{blog_id}#{timestamp_ip}',
+                            'SK': timestamp_ip,
+                            'GSI3PK': f'{LIKE_PREFIX}{blog_id}',
+                            'GSI3SK': timestamp_ip,
+                            'TTL': ttl
+                        })
+                    }
+                },
+                {
+                    'Update': {
+                        'TableName': self.table_name,
+                        'Key': item_key(f'{BLOG_PREFIX}{blog_id}'),
+                        'UpdateExpression': 'ADD likes_count :one',
+                        'ConditionExpression': 'attribute_exists(PK)',
+                        'ExpressionAttributeValues': to_values({':one': 1})
+                    }
                 }
-            )
+            ])
             return True
+        except self.client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get('CancellationReasons', [])
+            if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+                return False
+            raise
         except Exception as e:
-            print(f"Error deleting blog: {str(e)}")
+            print(f"Error adding like: {str(e)}")
             raise
-    
-    # Like operations
-    def add_like(self, blog_id: str, timestamp_ip: str) -> bool:
-        """Add a like to a blog"""
-        try:
-            ttl = int(time.time()) + 30 * 24 * 60 * 60  # 30 days
-            
-            self.table.put_item(
-                Item={
-                    'PK': f'{LIKE_PREFIX}{blog_id}#{timestamp_ip}',
-                    'SK': timestamp_ip,
-                    'GSI3PK': f'{LIKE_PREFIX}{blog_id}',
-                    'GSI3SK': timestamp_ip,
-                    'TTL': ttl
+
+    def get_like_timestamps(self, blog_id: str, since: int) -> List[int]:
+        """Get the timestamps of a blog's likes since a point in time - Query GSI3, keys only"""
+        try:
+            timestamps = []
+            query_kwargs = {
+                'TableName': self.table_name,
+                'IndexName': 'LikesByBlog',
+                'KeyConditionExpression': 'GSI3PK = :pk AND GSI3SK >= :since',
+                'ExpressionAttributeValues': {
+                    ':pk': {'S': f'{LIKE_PREFIX}{blog_id}'},
+                    ':since': {'S': str(since)}
+                },
+                'ProjectionExpression': 'GSI3SK'
+            }
+            while True:
+                response = self.client.query(**query_kwargs)
+                timestamps.extend(int(item['GSI3SK']['S'].split(':', 1)[0]) for item in response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    return timestamps
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            print(f"Error getting like timestamps: {str(e)}")
+            raise
+
+    def has_liked(self, blog_id: str, ip_hash: str) -> bool:
+        """Check if a visitor has a live like on a blog - GetItem on their LIKED# marker"""
+        return blog_id in self.get_like_states([blog_id], ip_hash, count_ids=[])[1]
+
+    def get_like_states(self, blog_ids: List[str], ip_hash: str, count_ids: Optional[List[str]] = None):
+        """
+        The visitor's liked posts among blog_ids, and likes_count for count_ids
+        (default all of them), in one BatchGetItem of LIKED# markers and blog
+        items; returns ({blogId: likes_count} for blogs that exist, {blogIds liked}).
+        At most MAX_BATCH_GET_KEYS keys in total.
+        """
+        blog_ids = list(dict.fromkeys(blog_ids))
+        keys = [item_key(f'{LIKED_PREFIX}{blog_id}#{ip_hash}') for blog_id in blog_ids]
+        keys += [item_key(f'{BLOG_PREFIX}{blog_id}') for blog_id in (blog_ids if count_ids is None else count_ids)]
+        pending = {self.table_name: {
+            'Keys': keys,
+            'ProjectionExpression': 'PK, likes_count, #ttl',
+            'ExpressionAttributeNames': {'#ttl': 'TTL'}
+        }}
+
+        now = int(time.time())
+        like_counts, liked = {}, set()
+        attempt = 0
+        while pending:
+            try:
+                response = self.client.batch_get_item(RequestItems=pending)
+            except Exception as e:
+                print(f"Error batch getting like states: {str(e)}")
+                raise
+            for item in response.get('Responses', {}).get(self.table_name, []):
+                item = from_item(item, drop=())
+                if item['PK'].startswith(LIKED_PREFIX):
+                    if item.get('TTL', now + 1) > now:
+                        liked.add(item['PK'][len(LIKED_PREFIX):].rsplit('#', 1)[0])
+                else:
+                    like_counts[item['PK'][len(BLOG_PREFIX):]] = item.get('likes_count', 0)
+            pending = response.get('UnprocessedKeys') or {}
+            if pending:
+                attempt += 1
+                time.sleep(min(0.05 * 2 ** attempt, 1.0))
+        return like_counts, liked
+
+    # Comment operations
+    def _blog_counter_update(self, blog_id: str, attr: str, delta: int) -> Dict:
+        """Transaction item that atomically adjusts a denormalized counter on an existing blog"""
+        return {
+            'Update': {
+                'TableName': self.table_name,
+                'Key': item_key(f'{BLOG_PREFIX}{blog_id}'),
+                'UpdateExpression': 'ADD #counter :delta',
+                'ConditionExpression': 'attribute_exists(PK)',
+                'ExpressionAttributeNames': {'#counter': attr},
+                'ExpressionAttributeValues': {':delta': serialize(delta)}
+            }
+        }
+
+    def create_comment(self, comment: Dict) -> bool:
+        """
+        Create a comment; returns False if the blog does not exist.
+
+        Approved comments bump the blog's comments_count in the same transaction.
+        Pending comments go to the PendingItems index instead and are not counted.
+        A transaction cancelled by a conflicting write or throttling is retried.
+        """
+        blog_id = comment['blogId']
+        comment_id = comment['commentId']
+
+        if comment.get('status') == 'pending':
+            item = to_item({
+                **comment,
+                'PK': f'{BLOG_PREFIX}{blog_id}',
+                'SK': f'{PENDING_COMMENT_PREFIX}{comment_id}',
+                'GSI4PK': PENDING_COMMENTS_PK,
+                'GSI4SK': comment_id
+            })
+            blog_check = {
+                'ConditionCheck': {
+                    'TableName': self.table_name,
+                    'Key': item_key(f'{BLOG_PREFIX}{blog_id}'),
+                    'ConditionExpression': 'attribute_exists(PK)'
                 }
-            )
+            }
+        else:
+            item = to_item({
+                **comment,
+                'PK': f'{BLOG_PREFIX}{blog_id}',
+                'SK': f'{COMMENT_PREFIX}{comment_id}'
+            })
+            blog_check = self._blog_counter_update(blog_id, 'comments_count', 1)
+
+        for _ in range(WRITE_ATTEMPTS):
+            try:
+                self.client.transact_write_items(TransactItems=[
+                    {'Put': {'TableName': self.table_name, 'Item': item}},
+                    blog_check
+                ])
+                return True
+            except self.client.exceptions.TransactionCanceledException as e:
+                codes = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+                # Only the blog check failing means the blog is gone
+                if codes[1:2] == ['ConditionalCheckFailed']:
+                    return False
+                if not RETRYABLE_CANCELLATIONS & set(codes):
+                    raise
+            except Exception as e:
+                print(f"Error creating comment: {str(e)}")
+                raise
+        raise RuntimeError(f"Comment on blog {blog_id} kept conflicting with other writes")
+
+    def get_comments(self, blog_id: str, limit: int = 20, after: Optional[str] = None) -> Dict:
+        """Get a page of approved comments, oldest first - Query on the blog partition"""
+        try:
+            query_kwargs = {
+                'TableName': self.table_name,
+                'KeyConditionExpression': 'PK = :pk AND begins_with(SK, :prefix)',
+                'ExpressionAttributeValues': {
+                    ':pk': {'S': f'{BLOG_PREFIX}{blog_id}'},
+                    ':prefix': {'S': COMMENT_PREFIX}
+                },
+                'Limit': limit
+            }
+            if after:
+                query_kwargs['ExclusiveStartKey'] = item_key(f'{BLOG_PREFIX}{blog_id}', f'{COMMENT_PREFIX}{after}')
+
+            response = self.client.query(**query_kwargs)
+            last_eval_key = response.get('LastEvaluatedKey')
+            return {
+                'items': [from_item(item) for item in response.get('Items', [])],
+                'next': last_eval_key['SK']['S'][len(COMMENT_PREFIX):] if last_eval_key else None
+            }
+        except Exception as e:
+            print(f"Error getting comments: {str(e)}")
+            raise
+
+    def get_pending_comments(self, limit: int = 50, after: Optional[Dict] = None) -> Dict:
+        """Get comments awaiting moderation, oldest first - Query GSI4 (sparse)"""
+        try:
+            query_kwargs = {
+                'TableName': self.table_name,
+                'IndexName': 'PendingItems',
+                'KeyConditionExpression': 'GSI4PK = :pk',
+                'ExpressionAttributeValues': {':pk': {'S': PENDING_COMMENTS_PK}},
+                'Limit': limit
+            }
+            if after:
+                query_kwargs['ExclusiveStartKey'] = to_item(after)
+
+            response = self.client.query(**query_kwargs)
+            last_eval_key = response.get('LastEvaluatedKey')
+            return {
+                'items': [from_item(item) for item in response.get('Items', [])],
+                'next': from_item(last_eval_key, drop=()) if last_eval_key else None
+            }
+        except Exception as e:
+            print(f"Error getting pending comments: {str(e)}")
+            raise
+
+    def approve_comment(self, blog_id: str, comment_id: str) -> Optional[Dict]:
+        """Move a pending comment into the public thread and count it"""
+        pending_key = item_key(f'{BLOG_PREFIX}{blog_id}', f'{PENDING_COMMENT_PREFIX}{comment_id}')
+        try:
+            response = self.client.get_item(TableName=self.table_name, Key=pending_key)
+            if 'Item' not in response:
+                return None
+            comment = {**from_item(response['Item']), 'status': 'approved'}
+
+            self.client.transact_write_items(TransactItems=[
+                {
+                    'Delete': {
+                        'TableName': self.table_name,
+                        'Key': pending_key,
+                        'ConditionExpression': 'attribute_exists(PK)'
+                    }
+                },
+                {
+                    'Put': {
+                        'TableName': self.table_name,
+                        'Item': to_item({
+                            **comment,
+                            'PK': f'{BLOG_PREFIX}{blog_id}',
+                            'SK': f'{COMMENT_PREFIX}{comment_id}'
+                        })
+                    }
+                },
+                self._blog_counter_update(blog_id, 'comments_count', 1)
+            ])
+            return comment
+        except self.client.exceptions.TransactionCanceledException:
+            # Approved concurrently, or the blog was deleted
+            return None
+        except Exception as e:
+            print(f"Error approving comment: {str(e)}")
+            raise
+
+    def delete_comment(self, blog_id: str, comment_id: str) -> bool:
+        """Delete an approved or pending comment, keeping comments_count in step"""
+        try:
+            self.client.transact_write_items(TransactItems=[
+                {
+                    'Delete': {
+                        'TableName': self.table_name,
+                        'Key': item_key(f'{BLOG_PREFIX}{blog_id}', f'{COMMENT_PREFIX}{comment_id}'),
+                        'ConditionExpression': 'attribute_exists(PK)'
+                    }
+                },
+                self._blog_counter_update(blog_id, 'comments_count', -1)
+            ])
             return True
+        except self.client.exceptions.TransactionCanceledException:
+            pass
         except Exception as e:
-            print(f"Error adding like: {str(e)}")
+            print(f"Error deleting comment: {str(e)}")
+            raise
+
+        # Not an approved comment: it may still be in moderation (pending comments are not counted)
+        try:
+            response = self.client.delete_item(
+                TableName=self.table_name,
+                Key=item_key(f'{BLOG_PREFIX}{blog_id}', f'{PENDING_COMMENT_PREFIX}{comment_id}'),
+                ReturnValues='ALL_OLD'
+            )
+            return 'Attributes' in response
+        except Exception as e:
+            print(f"Error deleting comment: {str(e)}")
+            raise
+
+    # View analytics operations
+    def write_view_rollups(self, rollups: List[Dict]) -> List[str]:
+        """
+        Add flushed view counts to daily/monthly aggregate items in one transaction.
+
+        Each rollup is {'blogId', 'granularity' ('D' or 'M'), 'period', 'views', 'uniques'},
+        each for a distinct item; together with one existence check per blog, at most
+        MAX_TRANSACTION_ITEMS actions. The rollups of blogs that no longer exist are
+        dropped, so a flush never re-creates a deleted blog's aggregates; their IDs are returned.
+        """
+        dropped = []
+        while rollups:
+            blog_ids = list(dict.fromkeys(r['blogId'] for r in rollups))
+            checks = [
+                {
+                    'ConditionCheck': {
+                        'TableName': self.table_name,
+                        'Key': item_key(f'{BLOG_PREFIX}{blog_id}'),
+                        'ConditionExpression': 'attribute_exists(PK)'
+                    }
+                }
+                for blog_id in blog_ids
+            ]
+            updates = [
+                {
+                    'Update': {
+                        'TableName': self.table_name,
+                        'Key': item_key(
+                            f"{BLOG_PREFIX}{r['blogId']}",
+                            f"{VIEWS_PREFIX}{r['granularity']}#{r['period']}"
+                        ),
+                        # Views accumulate; uniques are re-estimated from the HyperLogLog each flush
+                        'UpdateExpression': 'ADD #views :views SET #uniques = :uniques, #period = :period',
+                        'ExpressionAttributeNames': {'#views': 'views', '#uniques': 'uniques', '#period': 'period'},
+                        'ExpressionAttributeValues': to_values({
+                            ':views': r['views'],
+                            ':uniques': r['uniques'],
+                            ':period': r['period']
+                        })
+                    }
+                }
+                for r in rollups
+            ]
+            try:
+                self.client.transact_write_items(TransactItems=checks + updates)
+                return dropped
+            except self.client.exceptions.TransactionCanceledException as e:
+                reasons = e.response.get('CancellationReasons', [])
+                missing = {
+                    blog_id for blog_id, reason in zip(blog_ids, reasons)
+                    if reason.get('Code') == 'ConditionalCheckFailed'
+                }
+                if not missing:
+                    print(f"Error writing view rollups: {str(e)}")
+                    raise
+                dropped.extend(sorted(missing))
+                rollups = [r for r in rollups if r['blogId'] not in missing]
+            except Exception as e:
+                print(f"Error writing view rollups: {str(e)}")
+                raise
+        return dropped
+
+    def get_view_series(self, blog_id: str, granularity: str, start: str, end: str) -> List[Dict]:
+        """Get view aggregates for a period range (inclusive) - Query on the blog partition"""
+        try:
+            prefix = f'{VIEWS_PREFIX}{granularity}#'
+            series = []
+            query_kwargs = {
+                'TableName': self.table_name,
+                'KeyConditionExpression': 'PK = :pk AND SK BETWEEN :start AND :end',
+                'ExpressionAttributeValues': {
+                    ':pk': {'S': f'{BLOG_PREFIX}{blog_id}'},
+                    ':start': {'S': f'{prefix}{start}'},
+                    ':end': {'S': f'{prefix}{end}'}
+                }
+            }
+            while True:
+                response = self.client.query(**query_kwargs)
+                series.extend(from_item(item) for item in response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    return series
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            print(f"Error getting view series: {str(e)}")
             raise
-    
-    def get_likes_count(self, blog_id: str) -> int:
-        """Get likes count for a blog - Query GSI3 operation"""
+
+    # Derived items (maintained by the stream processor)
+    def put_archive_entry(self, summary: Dict):
+        """Write a published blog's entry in its month's archive partition"""
+        published_at = summary['published_at']
         try:
-            response = self.table.query(
-                IndexName='LikesByBlog',
-                KeyConditionExpression=Key('GSI3PK').eq(f'{LIKE_PREFIX}{blog_id}'),
-                Select='COUNT'  # Only count, don't return items
+            self.client.put_item(
+                TableName=self.table_name,
+                Item=to_item({
+                    **summary,
+                    'PK': f'{ARCHIVE_PREFIX}{archive_month(published_at)}',
+                    'SK': f"{published_at:0{TIMESTAMP_WIDTH}d}#{summary['blogId']}"
+                })
             )
-            return response.get('Count', 0)
-        except Exception as e:
-            print(f"Error getting likes count: {str(e)}")
-            return 0
-    
-    def has_liked(self, blog_id: str, timestamp_ip: str) -> bool:
-        """Check if IP has already liked - Query GSI3 operation"""
-        try:
-            response = self.table.query(
-                IndexName='LikesByBlog',
-                KeyConditionExpression=Key('GSI3PK').eq(f'{LIKE_PREFIX}{blog_id}') & Key('GSI3SK').eq(timestamp_ip),
-                Limit=1
+        except Exception as e:
+            print(f"Error putting archive entry: {str(e)}")
+            raise
+
+    def delete_archive_entry(self, blog_id: str, published_at: int):
+        """Remove a blog's archive entry"""
+        try:
+            self.client.delete_item(
+                TableName=self.table_name,
+                Key=item_key(
+                    f'{ARCHIVE_PREFIX}{archive_month(published_at)}',
+                    f'{published_at:0{TIMESTAMP_WIDTH}d}#{blog_id}'
+                )
             )
-            return len(response.get('Items', [])) > 0
         except Exception as e:
-            print(f"Error checking like: {str(e)}")
+            print(f"Error deleting archive entry: {str(e)}")
+            raise
+
+    def get_archive_counts(self) -> Dict[str, int]:
+        """Published blog counts per month - one GetItem on the precomputed summary"""
+        try:
+            response = self.client.get_item(TableName=self.table_name, Key=item_key(STATS_PK, ARCHIVE_SK))
+            counts = from_item(response['Item']) if 'Item' in response else {}
+            return {month: count for month, count in counts.items() if count > 0}
+        except Exception as e:
+            print(f"Error getting archive counts: {str(e)}")
+            raise
+
+    def get_archive_month(self, month: str, limit: int = 20, after: Optional[Dict] = None) -> Dict:
+        """A month's published blogs, newest first - Query on its archive partition"""
+        try:
+            query_kwargs = {
+                'TableName': self.table_name,
+                'KeyConditionExpression': 'PK = :pk',
+                'ExpressionAttributeValues': {':pk': {'S': f'{ARCHIVE_PREFIX}{month}'}},
+                'ScanIndexForward': False,
+                'Limit': limit
+            }
+            if after:
+                query_kwargs['ExclusiveStartKey'] = to_item(after)
+
+            response = self.client.query(**query_kwargs)
+            last_eval_key = response.get('LastEvaluatedKey')
+            return {
+                'items': [from_item(item) for item in response.get('Items', [])],
+                'next': from_item(last_eval_key, drop=()) if last_eval_key else None
+            }
+        except Exception as e:
+            print(f"Error getting archive month: {str(e)}")
+            raise
+
+    def apply_counters_once(self, event_id: str, deltas: Dict[str, Dict[str, int]]) -> bool:
+        """
+        Adjust counters on STATS#GLOBAL items ({SK: {attr: delta}}) exactly once per stream event.
+
+        A short-lived marker item for the event is written in the same transaction,
+        so a redelivered record is rejected instead of counted twice.
+        """
+        updates = []
+        for sk, counters in deltas.items():
+            counters = {attr: delta for attr, delta in counters.items() if delta}
+            if not counters:
+                continue
+            names = {f'#c{n}': attr for n, attr in enumerate(counters)}
+            updates.append({
+                'Update': {
+                    'TableName': self.table_name,
+                    'Key': item_key(STATS_PK, sk),
+                    'UpdateExpression': 'ADD ' + ', '.join(f'#c{n} :d{n}' for n in range(len(counters))),
+                    'ExpressionAttributeNames': names,
+                    'ExpressionAttributeValues': {f':d{n}': serialize(delta) for n, delta in enumerate(counters.values())}
+                }
+            })
+        if not updates:
             return False
-    
+
+        try:
+            self.client.transact_write_items(TransactItems=[
+                {
+                    'Put': {
+                        'TableName': self.table_name,
+                        'Item': to_item({
+                            'PK': f'{STREAM_EVENT_PREFIX}{event_id}',
+                            'SK': METADATA_SK,
+                            'TTL': int(time.time()) + STREAM_MARKER_TTL
+                        }),
+                        'ConditionExpression': 'attribute_not_exists(PK)'
+                    }
+                },
+                *updates
+            ])
+            return True
+        except self.client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get('CancellationReasons', [])
+            if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+                # Marker exists: this event was already applied
+                return False
+            raise
+        except Exception as e:
+            print(f"Error applying counters: {str(e)}")
+            raise
+
     # User operations
     def get_user(self, email: str) -> Optional[Dict]:
         """Get user by email - GetItem operation"""
         try:
-            response = self.table.get_item(
-                Key={
-                    'PK': f'{USER_PREFIX}{email}',
-                    'SK': METADATA_SK
-                }
-            )
-            item = response.get('Item')
+            item = self._get_item(item_key(f'{USER_PREFIX}{email}'))
             if item:
-                # Remove internal keys
-                item.pop('PK', None)
-                item.pop('SK', None)
-                return decimal_to_int(item)
+                return from_item(item)
             return None
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             print(f"Error getting user: {str(e)}")
             return None
-    
+
     def update_user_login(self, email: str):
         """Update user last login time"""
         try:
-            self.table.update_item(
-                Key={
-                    'PK': f'{USER_PREFIX}{email}',
-                    'SK': METADATA_SK
-                },
+            self.client.update_item(
+                TableName=self.table_name,
+                Key=item_key(f'{USER_PREFIX}{email}'),
                 UpdateExpression="SET last_login = :login",
                 ExpressionAttributeValues={
-                    ':login': int(time.time())
+                    ':login': serialize(int(time.time()))
                 }
             )
         except Exception as e:
             print(f"Error updating user login: {str(e)}")
             # Don't raise, this is not critical
+
+    # Refresh token families: one item per login, holding only the current token's ID
+    def create_token_family(self, family_id: str, email: str, token_id: str, expires_at: int):
+        """Start a login's refresh token chain - PutItem"""
+        try:
+            self.client.put_item(
+                TableName=self.table_name,
+                Item=to_item({
+                    'PK': f'{TOKEN_FAMILY_PREFIX}{family_id}',
+                    'SK': METADATA_SK,
+                    'email': email,
+                    'current': token_id,
+                    'TTL': expires_at
+                }),
+                ConditionExpression='attribute_not_exists(PK)'
+            )
+        except Exception as e:
+            print(f"Error creating token family: {str(e)}")
+            raise
+
+    def rotate_token_family(self, family_id: str, token_id: str, new_token_id: str, expires_at: int) -> bool:
+        """
+        Replace the family's current token ID, only if token_id is still current
+        and unexpired - conditional UpdateItem. False means the token was already
+        rotated (replayed), revoked or expired.
+        """
+        try:
+            self.client.update_item(
+                TableName=self.table_name,
+                Key=item_key(f'{TOKEN_FAMILY_PREFIX}{family_id}'),
+                UpdateExpression='SET #current = :new, #ttl = :ttl',
+                # TTL deletion lags expiry, so an expired family counts as gone
+                ConditionExpression='#current = :old AND #ttl >= :now',
+                ExpressionAttributeNames={'#current': 'current', '#ttl': 'TTL'},
+                ExpressionAttributeValues=to_values({
+                    ':new': new_token_id, ':old': token_id, ':ttl': expires_at, ':now': int(time.time())
+                })
+            )
+            return True
+        except self.client.exceptions.ConditionalCheckFailedException:
+            return False
+        except Exception as e:
+            print(f"Error rotating token family: {str(e)}")
+            raise
+
+    def delete_token_family(self, family_id: str):
+        """Revoke every token of a login's chain - DeleteItem"""
+        try:
+            self.client.delete_item(TableName=self.table_name, Key=item_key(f'{TOKEN_FAMILY_PREFIX}{family_id}'))
+        except Exception as e:
+            print(f"Error deleting token family: {str(e)}")
+            raise
@@ -1,121 +1,170 @@
 """Data models for DynamoDB items"""
 
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+import time
 import uuid
 
+from db.codec import serialize
+
 
 def generate_id():
     """Generate unique ID"""
     return str(uuid.uuid4())
 
 
+def generate_sortable_id():
+    """Generate unique ID that sorts by creation time (millisecond prefix)"""
+    return f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:12]}"
+
+
 def get_timestamp():
     """Get current timestamp"""
     return int(datetime.utcnow().timestamp())
 
 
-class Portfolio:
+class Model:
+    """
+    Base for slotted item models.
+
+    ATTRS maps each Python field to its attribute name in DynamoDB and the API,
+    so decoding and encoding are a single pass over a fixed field list.
+    """
+    __slots__ = ()
+    ATTRS: ClassVar[Tuple[Tuple[str, str], ...]] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        return cls(**{name: data[attr] for name, attr in cls.ATTRS if attr in data})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {attr: getattr(self, name) for name, attr in self.ATTRS}
+
+    def to_item(self, **keys) -> Dict[str, Dict[str, Any]]:
+        """Encode straight to DynamoDB wire format, plus any key attributes"""
+        item = {k: serialize(v) for k, v in keys.items()}
+        for name, attr in self.ATTRS:
+            value = getattr(self, name)
+            if value is not None:
+                item[attr] = serialize(value)
+        return item
+
+
+@dataclass(slots=True)
+class Portfolio(Model):
     """Portfolio data model"""
-    def __init__(self, data: Dict):
-        self.user_id = data.get('userId', 'default')
-        self.profile_pic_url = data.get('profile_pic_url', '')
-        self.bio = data.get('bio', '')
-        self.email = data.get('email', '')
-        self.social_links = data.get('social_links', {})
-        self.about_content = data.get('about_content', '')
-        self.projects = data.get('projects', [])
-        self.experience = data.get('experience', [])
-        self.updated_at = data.get('updated_at', get_timestamp())
-    
-    def to_dict(self):
-        return {
-            'userId': self.user_id,
-            'profile_pic_url': self.profile_pic_url,
-            'bio': self.bio,
-            'email': self.email,
-            'social_links': self.social_links,
-            'about_content': self.about_content,
-            'projects': self.projects,
-            'experience': self.experience,
-            'updated_at': self.updated_at
-        }
-
-
-class Blog:
+    user_id: str = 'default'
+    profile_pic_url: str = ''
+    bio: str = ''
+    email: str = ''
+    social_links: Dict[str, str] = field(default_factory=dict)
+    about_content: str = ''
+    projects: List[Dict[str, Any]] = field(default_factory=list)
+    experience: List[Dict[str, Any]] = field(default_factory=list)
+    updated_at: int = field(default_factory=get_timestamp)
+
+    ATTRS: ClassVar[Tuple[Tuple[str, str], ...]] = (
+        ('user_id', 'userId'),
+        ('profile_pic_url', 'profile_pic_url'),
+        ('bio', 'bio'),
+        ('email', 'email'),
+        ('social_links', 'social_links'),
+        ('about_content', 'about_content'),
+        ('projects', 'projects'),
+        ('experience', 'experience'),
+        ('updated_at', 'updated_at'),
+    )
+
+
+# Blog publication states; only published posts are listed
+BLOG_DRAFT = 'draft'
+BLOG_SCHEDULED = 'scheduled'
+BLOG_PUBLISHED = 'published'
+BLOG_STATUSES = (BLOG_DRAFT, BLOG_SCHEDULED, BLOG_PUBLISHED)
+
+
+@dataclass(slots=True)
+class Blog(Model):
     """Blog post data model"""
-    def __init__(self, data: Dict):
-        self.blog_id = data.get('blogId', generate_id())
-        self.created_at = data.get('created_at', get_timestamp())
-        self.title = data.get('title', '')
-        self.slug = data.get('slug', '')
-        self.content = data.get('content', '')
-        self.featured_image_url = data.get('featured_image_url', '')
-        self.tags = data.get('tags', [])
-        self.category = data.get('category', '')
-        self.author = data.get('author', '')
-        self.reading_time = data.get('reading_time', 0)
-        self.likes_count = data.get('likes_count', 0)
-        self.seo_description = data.get('seo_description', '')
-        self.published_at = data.get('published_at', self.created_at)
-    
-    def to_dict(self):
-        return {
-            'blogId': self.blog_id,
-            'created_at': self.created_at,
-            'title': self.title,
-            'slug': self.slug,
-            'content': self.content,
-            'featured_image_url': self.featured_image_url,
-            'tags': self.tags,
-            'category': self.category,
-            'author': self.author,
-            'reading_time': self.reading_time,
-            'likes_count': self.likes_count,
-            'seo_description': self.seo_description,
-            'published_at': self.published_at
-        }
-    
-    def calculate_reading_time(self, content: str):
+    blog_id: str = field(default_factory=generate_id)
+    created_at: int = field(default_factory=get_timestamp)
+    title: str = ''
+    slug: str = ''
+    content: str = ''
+    featured_image_url: str = ''
+    tags: List[str] = field(default_factory=list)
+    category: str = ''
+    author: str = ''
+    reading_time: int = 0
+    likes_count: int = 0
+    seo_description: str = ''
+    published_at: Optional[int] = None
+    image_variants: Dict[str, Any] = field(default_factory=dict)
+    status: str = BLOG_PUBLISHED
+
+    ATTRS: ClassVar[Tuple[Tuple[str, str], ...]] = (
+        ('blog_id', 'blogId'),
+        ('created_at', 'created_at'),
+        ('title', 'title'),
+        ('slug', 'slug'),
+        ('content', 'content'),
+        ('featured_image_url', 'featured_image_url'),
+        ('tags', 'tags'),
+        ('category', 'category'),
+        ('author', 'author'),
+        ('reading_time', 'reading_time'),
+        ('likes_count', 'likes_count'),
+        ('seo_description', 'seo_description'),
+        ('published_at', 'published_at'),
+        ('image_variants', 'image_variants'),
+        ('status', 'status'),
+    )
+
+    def __post_init__(self):
+        # Drafts have no publication time; scheduled posts carry a future one
+        if self.published_at is None and self.status == BLOG_PUBLISHED:
+            self.published_at = self.created_at
+
+    @staticmethod
+    def calculate_reading_time(content: str):
         """Calculate reading time in minutes"""
         words_per_minute = 200
         word_count = len(content.split())
         return max(1, round(word_count / words_per_minute))
 
 
-class Comment:
+@dataclass(slots=True)
+class Comment(Model):
     """Comment data model"""
-    def __init__(self, data: Dict):
-        self.comment_id = data.get('commentId', generate_id())
-        self.created_at = data.get('created_at', get_timestamp())
-        self.blog_id = data.get('blogId', '')
-        self.author_name = data.get('author_name', '')
-        self.author_email = data.get('author_email', '')
-        self.content = data.get('content', '')
-        self.status = data.get('status', 'approved')
-    
-    def to_dict(self):
-        return {
-            'commentId': self.comment_id,
-            'created_at': self.created_at,
-            'blogId': self.blog_id,
-            'author_name': self.author_name,
-            'author_email': self.author_email,
-            'content': self.content,
-            'status': self.status
-        }
-
-
-class Like:
+    comment_id: str = field(default_factory=generate_sortable_id)
+    created_at: int = field(default_factory=get_timestamp)
+    blog_id: str = ''
+    author_name: str = ''
+    author_email: str = ''
+    content: str = ''
+    status: str = 'approved'
+
+    ATTRS: ClassVar[Tuple[Tuple[str, str], ...]] = (
+        ('comment_id', 'commentId'),
+        ('created_at', 'created_at'),
+        ('blog_id', 'blogId'),
+        ('author_name', 'author_name'),
+        ('author_email', 'author_email'),
+        ('content', 'content'),
+        ('status', 'status'),
+    )
+
+
+@dataclass(slots=True)
+class Like(Model):
     """Like data model"""
-    def __init__(self, data: Dict):
-        self.blog_id = data.get('blogId', '')
-        self.timestamp_ip = data.get('timestamp_ip', '')
-        self.ttl = data.get('ttl', get_timestamp() + 30 * 24 * 60 * 60)  # 30 days
-    
-    def to_dict(self):
-        return {
-            'blogId': self.blog_id,
-            'timestamp_ip': self.timestamp_ip,
-            'ttl': self.ttl
-        }
+    blog_id: str = ''
+    timestamp_ip: str = ''
+    ttl: int = field(default_factory=lambda: get_timestamp() + 30 * 24 * 60 * 60)  # 30 days
+
+    ATTRS: ClassVar[Tuple[Tuple[str, str], ...]] = (
+        ('blog_id', 'blogId'),
+        ('timestamp_ip', 'timestamp_ip'),
+        ('ttl', 'ttl'),
+    )
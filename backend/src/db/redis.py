@@ -1,8 +1,93 @@
 import os
 import json
+import time
 import redis
-from typing import Optional, Any
+from collections import OrderedDict
+from typing import Optional, Any, Dict, List, Tuple
 from urllib.parse import urlparse
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+# Every call is bounded by these; a slow Redis costs at most one timeout before the breaker trips
+SOCKET_TIMEOUT = float(os.environ.get('REDIS_SOCKET_TIMEOUT', '0.5'))
+CONNECT_TIMEOUT = float(os.environ.get('REDIS_CONNECT_TIMEOUT', '1.0'))
+BREAKER_THRESHOLD = int(os.environ.get('REDIS_BREAKER_THRESHOLD', '3'))
+BREAKER_COOLDOWN = float(os.environ.get('REDIS_BREAKER_COOLDOWN', '30'))
+
+# Recent cache hits kept in process and served only while Redis is failing (stale-if-error)
+LOCAL_CACHE_SIZE = int(os.environ.get('REDIS_LOCAL_CACHE_SIZE', '256'))
+LOCAL_CACHE_SECONDS = float(os.environ.get('REDIS_LOCAL_CACHE_SECONDS', '60'))
+
+# Errors that mean Redis is unreachable or slow, as opposed to a bad command
+UNAVAILABLE_ERRORS = (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError, OSError)
+
+
+# Blog list pages: a hash of page field -> ordered blog IDs, so one DEL drops every page
+BLOG_PAGES_KEY = 'blogs:pages'
+
+# Portfolio sections are cached apart (fields of the tenant's cache hash), so editing one leaves the others warm
+PORTFOLIO_SECTION_FIELDS = {
+    section: f'portfolio:{section}' for section in ('profile', 'about', 'projects', 'experience')
+}
+
+
+def tenant_cache_key(tenant: str) -> str:
+    """A tenant's cache namespace: one hash, so a single DEL drops everything cached for it"""
+    return f'tenant:{tenant}:cache'
+
+
+def tenant_version_key(tenant: str) -> str:
+    """Generation counter bumped whenever a tenant's cached data changes (kept apart so it survives a DEL)"""
+    return f'tenant:{tenant}:version'
+
+
+# View analytics keys (hour buckets are UTC, formatted YYYYMMDDHH)
+VIEWS_DIRTY_KEY = 'views:dirty'
+VIEW_BUCKET_TTL = 7 * 24 * 60 * 60
+DAY_UNIQUES_TTL = 3 * 24 * 60 * 60
+MONTH_UNIQUES_TTL = 40 * 24 * 60 * 60
+
+# Trending sorted set (see utils/trending.py for the decay model)
+TRENDING_KEY = 'trending:blogs'
+TRENDING_EPOCH_KEY = 'trending:epoch'
+
+# KEYS: trending zset, epoch; ARGV: weight, now, half-life seconds, blog id
+TRENDING_BUMP_SCRIPT = """
+local epoch = redis.call('GET', KEYS[2])
+if not epoch then
+  epoch = ARGV[2]
+  redis.call('SET', KEYS[2], epoch)
+end
+local increment = tonumber(ARGV[1]) * math.pow(2, (tonumber(ARGV[2]) - tonumber(epoch)) / tonumber(ARGV[3]))
+return redis.call('ZINCRBY', KEYS[1], increment, ARGV[4])
+"""
+
+# Token bucket, refilled continuously and taken from atomically (a negative cost gives tokens back).
+# KEYS: bucket hash; ARGV: capacity, tokens per second, now, cost. Returns {allowed, seconds until enough tokens}
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local elapsed = math.max(0, now - (tonumber(state[2]) or now))
+tokens = math.min(capacity, tokens + elapsed * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+  tokens = math.min(capacity, tokens - cost)
+  allowed = 1
+else
+  wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+"""
 
 
 class RedisClient:
@@ -20,60 +105,334 @@ class RedisClient:
             host=parsed.hostname,
             port=parsed.port or 6379,
             password=parsed.password,
-            ssl=True,
-            decode_responses=True
+            ssl=os.environ.get('REDIS_SSL', 'true').lower() == 'true',
+            decode_responses=True,
+            socket_timeout=SOCKET_TIMEOUT,
+            socket_connect_timeout=CONNECT_TIMEOUT,
+            # No client-side retries: a failed call falls back to DynamoDB instead
+            retry=Retry(NoBackoff(), 0)
+        )
+        self._trending_bump = self.client.register_script(TRENDING_BUMP_SCRIPT)
+        self._token_bucket = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+        self.breaker = CircuitBreaker(
+            'redis',
+            threshold=BREAKER_THRESHOLD,
+            cooldown=BREAKER_COOLDOWN,
+            trip_on=UNAVAILABLE_ERRORS
         )
+        self._local = OrderedDict()
+    
+    def _error(self, operation: str, e: Exception):
+        # Short-circuited calls are counted by the breaker rather than logged one by one
+        if not isinstance(e, CircuitOpenError):
+            print(f"Redis {operation} error: {str(e)}")
+    
+    def _remember(self, key: str, value: Any):
+        self._local[key] = (value, time.monotonic())
+        self._local.move_to_end(key)
+        if len(self._local) > LOCAL_CACHE_SIZE:
+            self._local.popitem(last=False)
+    
+    def _recall(self, key: str) -> Optional[Any]:
+        entry = self._local.get(key)
+        if entry is None or time.monotonic() - entry[1] > LOCAL_CACHE_SECONDS:
+            return None
+        self.breaker.stats['fallback_hits'] += 1
+        return entry[0]
     
     def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
+        """Get value from cache (a recent local copy while Redis is unavailable)"""
         try:
-            value = self.client.get(key)
+            with self.breaker:
+                value = self.client.get(key)
             if value:
-                return json.loads(value)
+                value = json.loads(value)
+                self._remember(key, value)
+                return value
             return None
         except Exception as e:
-            print(f"Redis get error: {str(e)}")
-            return None
+            self._error('get', e)
+            return self._recall(key)
     
     def set(self, key: str, value: Any, ttl: int = 3600):
         """Set value in cache with TTL"""
         try:
             serialized = json.dumps(value)
-            self.client.setex(key, ttl, serialized)
+            with self.breaker:
+                self.client.setex(key, ttl, serialized)
         except Exception as e:
-            print(f"Redis set error: {str(e)}")
+            self._error('set', e)
     
     def delete(self, key: str):
         """Delete key from cache"""
+        self._local.pop(key, None)
         try:
-            self.client.delete(key)
+            with self.breaker:
+                self.client.delete(key)
         except Exception as e:
-            print(f"Redis delete error: {str(e)}")
+            self._error('delete', e)
     
     def delete_pattern(self, pattern: str):
         """Delete all keys matching pattern"""
         try:
-            keys = self.client.keys(pattern)
-            if keys:
-                self.client.delete(*keys)
+            with self.breaker:
+                keys = self.client.keys(pattern)
+                if keys:
+                    self.client.delete(*keys)
+        except Exception as e:
+            self._error('delete_pattern', e)
+    
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get many values in one MGET (recent local copies while Redis is unavailable)"""
+        if not keys:
+            return []
+        try:
+            with self.breaker:
+                values = self.client.mget(keys)
+            values = [json.loads(value) if value else None for value in values]
+            for key, value in zip(keys, values):
+                if value is not None:
+                    self._remember(key, value)
+            return values
+        except Exception as e:
+            self._error('get_many', e)
+            return [self._recall(key) for key in keys]
+    
+    def get_entries(self, keys: List[Any]) -> List[Optional[Any]]:
+        """
+        Values for plain keys (GET) and (hash, field) pairs (HGET) in one pipelined
+        round trip (recent local copies while Redis is unavailable)
+        """
+        if not keys:
+            return []
+        local_keys = [key if isinstance(key, str) else f"{key[0]}|{key[1]}" for key in keys]
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                if isinstance(key, str):
+                    pipe.get(key)
+                else:
+                    pipe.hget(*key)
+            with self.breaker:
+                values = pipe.execute()
+            values = [json.loads(value) if value else None for value in values]
+            for key, value in zip(local_keys, values):
+                if value is not None:
+                    self._remember(key, value)
+            return values
+        except Exception as e:
+            self._error('get_entries', e)
+            return [self._recall(key) for key in local_keys]
+    
+    def get_fields(self, key: str, fields: List[str]) -> List[Optional[Any]]:
+        """Get many fields of a cache hash in one HMGET (recent local copies while Redis is unavailable)"""
+        local_keys = [f"{key}|{field}" for field in fields]
+        try:
+            with self.breaker:
+                values = self.client.hmget(key, fields)
+            values = [json.loads(value) if value else None for value in values]
+            for local_key, value in zip(local_keys, values):
+                if value is not None:
+                    self._remember(local_key, value)
+            return values
+        except Exception as e:
+            self._error('get_fields', e)
+            return [self._recall(local_key) for local_key in local_keys]
+
+    def get_list_page(self, field: str) -> Optional[Any]:
+        """Get a cached blog list page"""
+        local_key = f"{BLOG_PAGES_KEY}|{field}"
+        try:
+            with self.breaker:
+                value = self.client.hget(BLOG_PAGES_KEY, field)
+            if value:
+                value = json.loads(value)
+                self._remember(local_key, value)
+                return value
+            return None
+        except Exception as e:
+            self._error('get_list_page', e)
+            return self._recall(local_key)
+    
+    def apply_cache_changes(self, refresh: Dict[str, Any], delete: List[str], bump: List[str], ttl: int = 3600,
+                            hashes: Optional[Dict[str, Dict[str, Any]]] = None,
+                            drop_fields: Optional[Dict[str, List[str]]] = None):
+        """
+        Write, delete and version-bump many keys (and set or delete hash fields)
+        in one pipelined round trip; returns success
+        """
+        if not (refresh or delete or bump or hashes or drop_fields):
+            return True
+        for key in delete:
+            self._local.pop(key, None)
+        for key, fields in (drop_fields or {}).items():
+            for field in fields:
+                self._local.pop(f"{key}|{field}", None)
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in refresh.items():
+                pipe.setex(key, ttl, json.dumps(value))
+            if delete:
+                pipe.delete(*delete)
+            for key in bump:
+                pipe.incr(key)
+            for key, fields in (drop_fields or {}).items():
+                if fields:
+                    pipe.hdel(key, *fields)
+            # After the deletes, so a hash can be dropped and repopulated in one call
+            for key, fields in (hashes or {}).items():
+                pipe.hset(key, mapping={field: json.dumps(value) for field, value in fields.items()})
+                pipe.expire(key, ttl)
+            with self.breaker:
+                pipe.execute()
+            return True
+        except Exception as e:
+            self._error('apply_cache_changes', e)
+            return False
+    
+    def get_version(self, key: str) -> int:
+        """Get a cache generation counter (0 if unset or Redis is unavailable)"""
+        try:
+            with self.breaker:
+                return int(self.client.get(key) or 0)
+        except Exception as e:
+            self._error('get_version', e)
+            return 0
+    
+    def bump_version(self, key: str):
+        """Advance a cache generation counter, orphaning every key built from the old one"""
+        try:
+            with self.breaker:
+                self.client.incr(key)
         except Exception as e:
-            print(f"Redis delete_pattern error: {str(e)}")
+            self._error('bump_version', e)
     
-    def invalidate_portfolio_cache(self):
-        """Invalidate portfolio cache"""
-        self.delete('portfolio_data')
+    def invalidate_tenant_cache(self, tenant: str = 'default'):
+        """Drop everything cached for a tenant - one DEL and one INCR however much it holds"""
+        self.apply_cache_changes({}, [tenant_cache_key(tenant)], [tenant_version_key(tenant)])
     
     def invalidate_blog_cache(self, blog_id: Optional[str] = None):
-        """Invalidate blog cache"""
+        """Invalidate one blog's entity cache (and its projections), or every list page when no blog is given"""
         if blog_id:
-            self.delete(f"blogs:{blog_id}")
-        self.delete('blogs:list')
-        self.delete_pattern('blogs:*')
+            self.apply_cache_changes({}, [f"blogs:{blog_id}", f"blogs:{blog_id}:fields"], [])
+        else:
+            self.delete(BLOG_PAGES_KEY)
     
     def invalidate_comments_cache(self, blog_id: str):
-        """Invalidate comments cache for a blog"""
-        self.delete(f"comments:{blog_id}")
+        """Invalidate every cached comment page for a blog in O(1)"""
+        self.bump_version(f"comments:{blog_id}:version")
     
     def invalidate_likes_cache(self, blog_id: str):
         """Invalidate likes cache for a blog"""
         self.delete(f"likes_count:{blog_id}")
+
+    
+    # View analytics
+    def record_view(self, blog_id: str, visitor_hash: str, hour: str, trending: Optional[Tuple[float, float, float]] = None):
+        """
+        Count a page view in its hour bucket and the visitor in day/month HyperLogLogs.
+
+        trending is an optional (weight, now, half_life) bump for the trending set,
+        sent in the same round trip.
+        """
+        try:
+            day, month = hour[:8], hour[:6]
+            pipe = self.client.pipeline(transaction=False)
+            pipe.incr(f"views:{blog_id}:{hour}")
+            pipe.expire(f"views:{blog_id}:{hour}", VIEW_BUCKET_TTL)
+            pipe.pfadd(f"uv:{blog_id}:d:{day}", visitor_hash)
+            pipe.expire(f"uv:{blog_id}:d:{day}", DAY_UNIQUES_TTL)
+            pipe.pfadd(f"uv:{blog_id}:m:{month}", visitor_hash)
+            pipe.expire(f"uv:{blog_id}:m:{month}", MONTH_UNIQUES_TTL)
+            pipe.sadd(VIEWS_DIRTY_KEY, f"{blog_id}|{hour}")
+            with self.breaker:
+                if trending:
+                    self._trending_bump(keys=[TRENDING_KEY, TRENDING_EPOCH_KEY], args=[*trending, blog_id], client=pipe)
+                pipe.execute()
+        except Exception as e:
+            self._error('record_view', e)
+    
+    def get_dirty_view_buckets(self) -> List[Tuple[str, str]]:
+        """(blog_id, hour) pairs with views not yet flushed to DynamoDB"""
+        with self.breaker:
+            members = self.client.smembers(VIEWS_DIRTY_KEY)
+        return [tuple(member.split('|', 1)) for member in members]
+    
+    def read_view_buckets(self, buckets: List[Tuple[str, str]]) -> List[int]:
+        """View counts for (blog_id, hour) buckets"""
+        with self.breaker:
+            values = self.client.mget([f"views:{blog_id}:{hour}" for blog_id, hour in buckets])
+        return [int(v or 0) for v in values]
+    
+    def count_uniques(self, keys: List[Tuple[str, str, str]]) -> List[int]:
+        """Unique visitor estimates for (blog_id, 'd'|'m', period) HyperLogLogs"""
+        pipe = self.client.pipeline(transaction=False)
+        for blog_id, granularity, period in keys:
+            pipe.pfcount(f"uv:{blog_id}:{granularity}:{period}")
+        with self.breaker:
+            return pipe.execute()
+    
+    def clear_view_buckets(self, buckets: List[Tuple[str, str]]):
+        """Drop flushed hour buckets and their dirty markers"""
+        if not buckets:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        pipe.delete(*[f"views:{blog_id}:{hour}" for blog_id, hour in buckets])
+        pipe.srem(VIEWS_DIRTY_KEY, *[f"{blog_id}|{hour}" for blog_id, hour in buckets])
+        with self.breaker:
+            pipe.execute()
+
+    
+    # Trending
+    def bump_trending(self, blog_id: str, weight: float, now: float, half_life: float):
+        """Add a decayed event weight to a blog's trending score"""
+        try:
+            with self.breaker:
+                self._trending_bump(keys=[TRENDING_KEY, TRENDING_EPOCH_KEY], args=[weight, now, half_life, blog_id])
+        except Exception as e:
+            self._error('bump_trending', e)
+    
+    def take_token(self, key: str, capacity: float, rate: float, now: float,
+                   cost: float = 1) -> Optional[Tuple[bool, float]]:
+        """
+        Take `cost` tokens from a bucket in one atomic script call: (allowed,
+        seconds until enough tokens), or None when Redis is unavailable
+        """
+        try:
+            with self.breaker:
+                allowed, wait = self._token_bucket(keys=[key], args=[capacity, rate, now, cost])
+            return bool(allowed), float(wait)
+        except Exception as e:
+            self._error('take_token', e)
+            return None
+    
+    def get_trending(self, limit: int) -> List[Tuple[str, float]]:
+        """Top blog IDs by trending score - O(log n + k)"""
+        try:
+            with self.breaker:
+                return self.client.zrevrange(TRENDING_KEY, 0, limit - 1, withscores=True)
+        except Exception as e:
+            self._error('get_trending', e)
+            return []
+    
+    def remove_trending(self, *blog_ids: str):
+        """Drop deleted blogs from the trending set"""
+        try:
+            with self.breaker:
+                self.client.zrem(TRENDING_KEY, *blog_ids)
+        except Exception as e:
+            self._error('remove_trending', e)
+    
+    def replace_trending(self, scores: Dict[str, float], epoch: float):
+        """Atomically swap in a rebuilt trending set and its epoch"""
+        staging_key = f"{TRENDING_KEY}:rebuild"
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(staging_key)
+        if scores:
+            pipe.zadd(staging_key, scores)
+            pipe.rename(staging_key, TRENDING_KEY)
+        else:
+            pipe.delete(TRENDING_KEY)
+        pipe.set(TRENDING_EPOCH_KEY, epoch)
+        with self.breaker:
+            pipe.execute()
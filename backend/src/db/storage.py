@@ -0,0 +1,62 @@
+import os
+import boto3
+from typing import Optional
+
+
+class S3ObjectStore:
+    """S3-backed media storage"""
+
+    def __init__(self, bucket: str, base_url: Optional[str] = None):
+        self.bucket = bucket
+        self.base_url = (base_url or f'https://{bucket}.s3.amazonaws.com').rstrip('/')
+        self.client = boto3.client('s3')
+
+    def put(self, key: str, data: bytes, content_type: str) -> str:
+        """Store an object and return its public URL"""
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl='public, max-age=31536000, immutable'
+        )
+        return self.url_for(key)
+
+    def url_for(self, key: str) -> str:
+        return f'{self.base_url}/{key}'
+
+
+class LocalObjectStore:
+    """Filesystem stand-in for S3 used in local development"""
+
+    def __init__(self, root: str, base_url: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.base_url = (base_url or f'file://{self.root}').rstrip('/')
+
+    def put(self, key: str, data: bytes, content_type: str) -> str:
+        """Store an object and return its URL"""
+        path = os.path.join(self.root, *key.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return self.url_for(key)
+
+    def url_for(self, key: str) -> str:
+        return f'{self.base_url}/{key}'
+
+
+def get_object_store():
+    """Get the configured media store (S3 when MEDIA_BUCKET is set, local directory otherwise)"""
+    bucket = os.environ.get('MEDIA_BUCKET')
+    base_url = os.environ.get('MEDIA_BASE_URL')
+    if bucket:
+        return S3ObjectStore(bucket, base_url)
+    return LocalObjectStore(os.environ.get('MEDIA_ROOT', '.media'), base_url)
+
+
+def key_for_url(store, url: str) -> Optional[str]:
+    """Return the storage key of a URL served from the store, or None if it lives elsewhere"""
+    prefix = store.base_url + '/'
+    if url.startswith(prefix):
+        return url[len(prefix):].split('?', 1)[0]
+    return None
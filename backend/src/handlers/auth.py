@@ -2,46 +2,44 @@ import json
 import bcrypt
 import sys
 import os
+import time
+import hashlib
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db.dynamodb import DynamoDBClient
-from utils.jwt_handler import generate_tokens
+from db.redis import RedisClient
+from utils.jwt_handler import generate_tokens, verify_token, new_token_id, REFRESH_TOKEN_EXPIRY
 from utils.validators import validate_email, validate_password
-from utils.errors import error_response, ValidationError, UnauthorizedError
+from utils.errors import error_response, ValidationError, UnauthorizedError, RateLimitedError
+from utils.rate_limit import RateLimiter
+from utils import deadline
+from utils.deadline import DeadlineExceededError
+from handlers.blogs_utils import client_ip_hash
 
 
 db = DynamoDBClient()
+redis_client = RedisClient()
+
+# Login attempts ("N/S": a burst of N, refilled at N per S seconds; "off" disables).
+# Per IP against password spraying, per email against one account guessed from many IPs.
+# Only failed attempts from IPs the account has not logged in from count per email,
+# so flooding an email with bad passwords cannot lock its owner out of a known IP
+login_ip_limiter = RateLimiter(redis_client, 'login-ip', os.environ.get('LOGIN_IP_RATE_LIMIT', '10/60'))
+login_email_limiter = RateLimiter(redis_client, 'login-email', os.environ.get('LOGIN_EMAIL_RATE_LIMIT', '5/300'))
+# How long an IP stays known to an account after a successful login from it
+KNOWN_LOGIN_TTL = 30 * 24 * 60 * 60
 
 
 def lambda_handler(event, context):
-    """Handle authentication requests"""
+    """Handle POST /auth/login and POST /auth/refresh requests"""
+    deadline.start(context)
     try:
-        # Parse request body
-        body = json.loads(event.get('body', '{}'))
-        email = body.get('email')
-        password = body.get('password')
-        
-        # Validate input
-        email = validate_email(email)
-        password = validate_password(password)
-        
-        # Get user from database
-        user = db.get_user(email)
-        if not user:
-            raise UnauthorizedError("Invalid email or password")
-        
-        # Verify password
-        password_hash = user.get('password_hash', '')
-        if not bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8')):
-            raise UnauthorizedError("Invalid email or password")
-        
-        # Update last login
-        db.update_user_login(email)
-        
-        # Generate tokens
-        tokens = generate_tokens(email)
+        if event.get('path', '').endswith('/refresh'):
+            tokens = refresh(event)
+        else:
+            tokens = login(event)
         
         return {
             'statusCode': 200,
@@ -57,7 +55,7 @@ def lambda_handler(event, context):
             })
         }
     
-    except (ValidationError, UnauthorizedError) as e:
+    except (ValidationError, UnauthorizedError, RateLimitedError, DeadlineExceededError) as e:
         return error_response(e)
     except Exception as e:
         print(f"Unexpected error in auth handler: {str(e)}")
@@ -71,3 +69,78 @@ def lambda_handler(event, context):
                 'error': 'Internal server error'
             })
         }
+
+
+def login(event):
+    """Check email and password; start a new refresh token family"""
+    body = json.loads(event.get('body') or '{}')
+    email = body.get('email')
+    password = body.get('password')
+    
+    # Validate input
+    email = validate_email(email)
+    password = validate_password(password)
+    
+    # Before the user lookup and the (deliberately slow) bcrypt check
+    ip_hash = client_ip_hash(event)
+    login_ip_limiter.check(ip_hash)
+    known_key = known_login_key(email, ip_hash)
+    known = bool(redis_client.get(known_key))
+    if not known:
+        login_email_limiter.check(email)
+    
+    # Get user from database
+    user = db.get_user(email)
+    if not user:
+        raise UnauthorizedError("Invalid email or password")
+    
+    # Verify password
+    password_hash = user.get('password_hash', '')
+    if not bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8')):
+        raise UnauthorizedError("Invalid email or password")
+    
+    # A successful attempt does not count against the email, and vouches for the IP
+    if not known:
+        login_email_limiter.refund(email)
+    redis_client.set(known_key, True, ttl=KNOWN_LOGIN_TTL)
+    
+    # Update last login
+    db.update_user_login(email)
+    
+    # Generate tokens, the refresh token starting a new family
+    family_id, token_id = new_token_id(), new_token_id()
+    db.create_token_family(family_id, email, token_id, int(time.time()) + REFRESH_TOKEN_EXPIRY)
+    return generate_tokens(email, family_id, token_id)
+
+
+def known_login_key(email, ip_hash):
+    """Redis key marking an IP the account has logged in from (hashed, like rate limit keys)"""
+    digest = hashlib.sha256(f"{email}:{ip_hash}".encode()).hexdigest()[:32]
+    return f"login:known:{digest}"
+
+
+def refresh(event):
+    """
+    Trade a refresh token for a new access and refresh token pair.
+
+    Each refresh token works once: rotating moves its family on to the new
+    token's ID. Presenting one that is no longer current means it was copied
+    and replayed, so the whole family (the stolen copy's and the owner's
+    tokens) is revoked and the user must log in again.
+    """
+    body = json.loads(event.get('body') or '{}')
+    token = body.get('refresh_token')
+    if not token or not isinstance(token, str):
+        raise ValidationError("refresh_token is required")
+    
+    payload = verify_token(token, 'refresh')
+    family_id, token_id = payload.get('fid'), payload.get('jti')
+    if not family_id or not token_id:
+        # Issued before rotation existed
+        raise UnauthorizedError("Refresh token has been revoked")
+    
+    new_id = new_token_id()
+    if not db.rotate_token_family(family_id, token_id, new_id, int(time.time()) + REFRESH_TOKEN_EXPIRY):
+        db.delete_token_family(family_id)
+        raise UnauthorizedError("Refresh token has been revoked")
+    return generate_tokens(payload['email'], family_id, new_id)
@@ -0,0 +1,71 @@
+"""Worker that removes a deleted blog's dependent items (likes, comments, view aggregates)"""
+import sys
+import os
+import time
+from itertools import islice
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.dynamodb import DynamoDBClient, MAX_BATCH_WRITE_ITEMS
+from handlers.blogs_utils import invoke_async
+
+
+db = DynamoDBClient()
+
+# Deletes per second, so a popular post's cleanup never starves live traffic of write capacity
+CASCADE_DELETE_RATE = float(os.environ.get('CASCADE_DELETE_RATE', '200'))
+# Hand over to a fresh invocation when less than this much time is left
+HANDOFF_RESERVE_MS = 15000
+
+
+def lambda_handler(event, context):
+    """Handle asynchronous cascade invocations ({"blogId": ...})"""
+    blog_id = event.get('blogId')
+    if not blog_id:
+        print("Cascade invoked without blogId")
+        return {'deleted': 0, 'done': True}
+
+    try:
+        return cascade_delete(blog_id, context)
+    except Exception as e:
+        print(f"Error in blog_cascade handler: {str(e)}")
+        raise
+
+
+def cascade_delete(blog_id, context=None):
+    """
+    Delete a blog's dependents in BatchWriteItem chunks at CASCADE_DELETE_RATE.
+
+    Progress is recorded on the blog's CASCADE item after every chunk. Deleted
+    items drop out of the queries, so a retried or re-invoked run simply picks
+    up what is left. When the Lambda is close to its timeout the work is
+    handed to a new invocation of this function.
+    """
+    progress = db.get_cascade_progress(blog_id) or {}
+    deleted = progress.get('deleted', 0)
+    next_slot = time.monotonic()
+
+    keys = db.iter_blog_dependents(blog_id)
+    while True:
+        chunk = list(islice(keys, MAX_BATCH_WRITE_ITEMS))
+        if not chunk:
+            break
+
+        # Pace chunks to the configured rate
+        wait = next_slot - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        next_slot = max(next_slot, time.monotonic()) + len(chunk) / CASCADE_DELETE_RATE
+
+        db.delete_items(chunk)
+        deleted += len(chunk)
+        db.put_cascade_progress(blog_id, deleted, done=False)
+        print(f"Cascade {blog_id}: {deleted} items deleted")
+
+        if context is not None and context.get_remaining_time_in_millis() < HANDOFF_RESERVE_MS:
+            if invoke_async('CASCADE_FUNCTION', {'blogId': blog_id}):
+                return {'deleted': deleted, 'done': False}
+
+    db.put_cascade_progress(blog_id, deleted, done=True)
+    return {'deleted': deleted, 'done': True}
@@ -0,0 +1,217 @@
+"""Handler for bulk admin blog operations"""
+import json
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.dynamodb import DynamoDBClient, MAX_TRANSACTION_ITEMS
+from db.redis import RedisClient
+from db.models import get_timestamp
+from utils.errors import error_response, APIError, UnauthorizedError, ForbiddenError, NotFoundError, ValidationError
+from handlers.blogs_utils import (
+    cors_headers, cors_preflight_response, new_blog, blog_changes, trigger_image_pipeline,
+    trigger_cascade, write_through_blog_caches, require_tenant_admin
+)
+
+
+db = DynamoDBClient()
+redis_client = RedisClient()
+
+# One request fits in a single transaction when applied atomically
+MAX_BULK_OPERATIONS = MAX_TRANSACTION_ITEMS
+BULK_ACTIONS = ('create', 'update', 'retag', 'delete')
+
+
+def lambda_handler(event, context):
+    """Handle POST /blogs/bulk requests"""
+    try:
+        method = event.get('httpMethod', '')
+
+        # Handle CORS preflight
+        if method == 'OPTIONS':
+            return cors_preflight_response()
+
+        if method == 'POST':
+            return bulk_blogs(event)
+        else:
+            return {
+                'statusCode': 405,
+                'headers': cors_headers(),
+                'body': json.dumps({'error': 'Method not allowed'})
+            }
+
+    except APIError as e:
+        return error_response(e)
+    except Exception as e:
+        print(f"Error in blogs_bulk handler: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': cors_headers(),
+            'body': json.dumps({'error': 'Internal server error'})
+        }
+
+
+def bulk_blogs(event):
+    """
+    Apply many blog operations in one request.
+
+    Body: {"operations": [...], "atomic": false}, where each operation is one of
+      {"action": "create", "blog": {...}}
+      {"action": "update", "id": "...", "changes": {...}}
+      {"action": "retag", "id": "...", "add": [...], "remove": [...]}
+      {"action": "delete", "id": "..."}
+
+    Every operation is validated before anything is written: the blogs they
+    touch are read in one BatchGetItem and the slug reservations they claim
+    in another. Any invalid operation rejects the whole request
+    with its index. Writes go out in BatchWriteItem chunks and conditional
+    UpdateItems, or in a single transaction when "atomic" is true, and caches
+    are refreshed once. Non-atomic updates of blogs deleted or renamed since
+    the read are not applied and are listed under "skipped".
+    """
+    # Require authentication
+    try:
+        email = require_tenant_admin(db, event)
+    except (UnauthorizedError, ForbiddenError) as e:
+        return error_response(e)
+
+    body = json.loads(event.get('body') or '{}')
+    operations = body.get('operations')
+    if not isinstance(operations, list) or not operations:
+        raise ValidationError("operations must be a non-empty list")
+    if len(operations) > MAX_BULK_OPERATIONS:
+        raise ValidationError(f"At most {MAX_BULK_OPERATIONS} operations per request")
+    atomic = bool(body.get('atomic', False))
+
+    # One batched read of every blog the operations touch
+    target_ids = [
+        op['id'] for op in operations
+        if isinstance(op, dict) and op.get('action') != 'create' and isinstance(op.get('id'), str)
+    ]
+    existing = db.batch_get_blogs(target_ids) if target_ids else {}
+
+    now = get_timestamp()
+    plans, errors, seen = [], [], set()
+    for index, op in enumerate(operations):
+        try:
+            blog, previous = plan_operation(op, existing, email, now)
+            blog_id = (blog or previous)['blogId']
+            if blog_id in seen:
+                raise ValidationError(f"Blog {blog_id} appears in more than one operation")
+            seen.add(blog_id)
+            plans.append((index, op['action'], blog, previous))
+        except APIError as e:
+            errors.append({'index': index, 'error': e.message})
+
+    errors.extend(slug_conflicts(plans))
+    if errors:
+        return {
+            'statusCode': 400,
+            'headers': cors_headers(),
+            'body': json.dumps({'error': 'Invalid operations', 'errors': sorted(errors, key=lambda e: e['index'])})
+        }
+
+    creates = [blog for _, action, blog, _ in plans if action == 'create']
+    updates = [(blog, previous) for _, action, blog, previous in plans if action in ('update', 'retag')]
+    deletes = [previous for _, action, _, previous in plans if action == 'delete']
+    try:
+        skipped = set(db.bulk_write_blogs(creates, updates, deletes, atomic=atomic))
+    except ValueError:
+        # Slug reservations add writes of their own
+        raise ValidationError("Too many writes for one atomic request; split it or set atomic to false")
+    except db.client.exceptions.TransactionCanceledException:
+        raise APIError("Blogs changed during the bulk operation; nothing was written", 409)
+
+    # Updates of blogs deleted or renamed since they were read were not applied (IDs are unique per request)
+    plans = [(index, action, blog, previous) for index, action, blog, previous in plans
+             if (blog or previous)['blogId'] not in skipped]
+    # Refresh caches (and the list page) once for the whole batch
+    write_through_blog_caches(db, redis_client, [(blog, previous) for _, _, blog, previous in plans])
+    if deletes:
+        redis_client.remove_trending(*(blog['blogId'] for blog in deletes))
+
+    # Build responsive image variants in the background
+    for _, action, blog, previous in plans:
+        if blog is not None and (previous is None or any(
+            blog.get(field) != previous.get(field) for field in ('featured_image_url', 'content')
+        )):
+            trigger_image_pipeline(blog['blogId'])
+    for blog in deletes:
+        trigger_cascade(blog['blogId'])
+
+    return {
+        'statusCode': 200,
+        'headers': cors_headers(),
+        'body': json.dumps({
+            'success': True,
+            'data': {
+                'atomic': atomic,
+                'results': [
+                    {'index': index, 'action': action, 'blogId': (blog or previous)['blogId']}
+                    for index, action, blog, previous in plans
+                ],
+                'skipped': sorted(skipped)
+            }
+        })
+    }
+
+
+def plan_operation(op, existing, email, now):
+    """Validate one operation; returns (blog to write or None for a delete, blog it replaces or None)"""
+    if not isinstance(op, dict) or op.get('action') not in BULK_ACTIONS:
+        raise ValidationError(f"action must be one of: {', '.join(BULK_ACTIONS)}")
+    action = op['action']
+
+    if action == 'create':
+        blog = op.get('blog')
+        if not isinstance(blog, dict):
+            raise ValidationError("blog must be an object")
+        return new_blog(blog, email, now), None
+
+    blog_id = op.get('id')
+    previous = existing.get(blog_id) if isinstance(blog_id, str) else None
+    if previous is None:
+        raise NotFoundError("Blog not found")
+
+    if action == 'delete':
+        return None, previous
+    if action == 'update':
+        changes = op.get('changes')
+        if not isinstance(changes, dict):
+            raise ValidationError("changes must be an object")
+        return {**previous, **blog_changes(previous, changes, now)}, previous
+
+    add, remove = op.get('add', []), op.get('remove', [])
+    if not isinstance(add, list) or not isinstance(remove, list):
+        raise ValidationError("add and remove must be lists of tags")
+    tags = [tag for tag in previous.get('tags', []) if tag not in remove]
+    tags += [tag for tag in dict.fromkeys(add) if tag not in tags]
+    return {**previous, 'tags': tags}, previous
+
+
+def slug_conflicts(plans):
+    """Errors for operations claiming a slug already taken, by a stored blog or by another operation"""
+    claims = [
+        (index, blog) for index, _, blog, previous in plans
+        if blog is not None and (previous is None or blog['slug'] != previous['slug'])
+    ]
+    if not claims:
+        return []
+
+    # Slugs given up in this batch (deleted or renamed blogs) are free to claim
+    released = {
+        previous['slug'] for _, _, blog, previous in plans
+        if previous and (blog is None or blog['slug'] != previous['slug'])
+    }
+    owners = db.get_slug_owners([blog['slug'] for _, blog in claims])
+
+    errors, claimed = [], set()
+    for index, blog in claims:
+        slug = blog['slug']
+        owner = owners.get(slug)
+        if slug in claimed or (owner and owner != blog['blogId'] and slug not in released):
+            errors.append({'index': index, 'error': "A blog with this slug already exists"})
+        claimed.add(slug)
+    return errors
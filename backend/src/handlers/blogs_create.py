@@ -8,11 +8,12 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db.dynamodb import DynamoDBClient
 from db.redis import RedisClient
-from db.models import Blog
-from utils.jwt_handler import require_auth
-from utils.validators import validate_required, validate_slug
-from utils.errors import error_response, UnauthorizedError, ValidationError
-from handlers.blogs_utils import cors_headers, cors_preflight_response, generate_slug
+from db.models import get_timestamp
+from utils.errors import error_response, APIError, UnauthorizedError, ForbiddenError
+from handlers.blogs_utils import (
+    cors_headers, cors_preflight_response, new_blog, trigger_image_pipeline,
+    write_through_blog_cache, require_tenant_admin
+)
 
 
 db = DynamoDBClient()
@@ -37,6 +38,8 @@ def lambda_handler(event, context):
                 'body': json.dumps({'error': 'Method not allowed'})
             }
     
+    except APIError as e:
+        return error_response(e)
     except Exception as e:
         print(f"Error in blogs_create handler: {str(e)}")
         return {
@@ -50,45 +53,23 @@ def create_blog(event):
     """Create a new blog post"""
     # Require authentication
     try:
-        email = require_auth(event)
-    except UnauthorizedError as e:
+        email = require_tenant_admin(db, event)
+    except (UnauthorizedError, ForbiddenError) as e:
         return error_response(e)
     
     # Parse request body
     body = json.loads(event.get('body', '{}'))
     
-    # Validate required fields
-    title = validate_required(body.get('title'), 'title')
-    content = validate_required(body.get('content'), 'content')
-    slug = body.get('slug') or generate_slug(title)
-    slug = validate_slug(slug)
-    
-    # Check if slug already exists
-    existing = db.get_blog_by_slug(slug)
-    if existing:
-        return error_response(ValidationError("A blog with this slug already exists"))
-    
-    # Create blog model
-    blog = Blog({
-        'title': title,
-        'slug': slug,
-        'content': body.get('content', ''),
-        'featured_image_url': body.get('featured_image_url', ''),
-        'tags': body.get('tags', []),
-        'category': body.get('category', ''),
-        'author': email,
-        'seo_description': body.get('seo_description', ''),
-    })
+    blog_data = new_blog(body, email, get_timestamp())
     
-    # Calculate reading time
-    blog.reading_time = blog.calculate_reading_time(content)
-    
-    # Save to database
-    blog_data = blog.to_dict()
+    # Save to database; the slug is reserved in the same transaction (SlugTakenError if taken)
     created_blog = db.create_blog(blog_data)
     
-    # Invalidate cache
-    redis_client.invalidate_blog_cache()
+    # Populate caches with the new post and list page
+    write_through_blog_cache(db, redis_client, created_blog)
+    
+    # Build responsive image variants in the background
+    trigger_image_pipeline(created_blog['blogId'])
     
     return {
         'statusCode': 201,
@@ -8,9 +8,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db.dynamodb import DynamoDBClient
 from db.redis import RedisClient
-from utils.jwt_handler import require_auth
-from utils.errors import error_response, UnauthorizedError, NotFoundError, ValidationError
-from handlers.blogs_utils import cors_headers, cors_preflight_response
+from utils.errors import error_response, UnauthorizedError, ForbiddenError, NotFoundError, ValidationError
+from handlers.blogs_utils import (
+    cors_headers, cors_preflight_response, write_through_blog_cache, trigger_cascade, require_tenant_admin
+)
 
 
 db = DynamoDBClient()
@@ -52,27 +53,21 @@ def delete_blog(event, blog_id):
     """Delete a blog post"""
     # Require authentication
     try:
-        email = require_auth(event)
-    except UnauthorizedError as e:
+        email = require_tenant_admin(db, event)
+    except (UnauthorizedError, ForbiddenError) as e:
         return error_response(e)
     
-    # Check if blog exists
-    blog = db.get_blog_by_id(blog_id)
+    # Delete blog and release its slug in one transaction
+    blog = db.delete_blog(blog_id)
     if not blog:
         return error_response(NotFoundError("Blog not found"))
     
-    # Delete blog
-    success = db.delete_blog(blog_id)
+    # Drop the post's cache entries and rebuild the list page without it
+    write_through_blog_cache(db, redis_client, None, previous=blog)
+    redis_client.remove_trending(blog_id)
     
-    if not success:
-        return {
-            'statusCode': 500,
-            'headers': cors_headers(),
-            'body': json.dumps({'error': 'Failed to delete blog'})
-        }
-    
-    # Invalidate cache
-    redis_client.invalidate_blog_cache(blog_id)
+    # Likes, comments and view aggregates are removed in the background
+    trigger_cascade(blog_id)
     
     return {
         'statusCode': 200,
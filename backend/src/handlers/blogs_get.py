@@ -2,22 +2,38 @@
 import json
 import sys
 import os
+import re
+import time
+from itertools import islice
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from db.dynamodb import DynamoDBClient
+from db.dynamodb import DynamoDBClient, BLOG_SUMMARY_FIELDS, ARCHIVE_PREFIX
 from db.redis import RedisClient
-from utils.errors import error_response, NotFoundError
-from handlers.blogs_utils import cors_headers, cors_preflight_response
+from utils.errors import error_response, APIError, NotFoundError, UnauthorizedError, ForbiddenError, ValidationError
+from utils.analytics import hour_bucket
+from utils.pagination import parse_limit, encode_cursor, decode_key_cursor
+from utils.fields import parse_fields, project, fieldset_key
+from utils import deadline
+from utils.trending import VIEW_WEIGHT, HALF_LIFE_SECONDS
+from utils.tenant import DEFAULT_TENANT, resolve_tenant
+from handlers.blogs_utils import (
+    cors_headers, cors_preflight_response, client_ip_hash, BLOG_CACHE_TTL, ARCHIVE_CACHE_KEY, ARCHIVE_VERSION_KEY,
+    LIST_PAGE_SIZE, LIST_MAX_LIMIT, BLOG_FIELDS, BLOG_ALWAYS_FIELDS, blog_cache_key, blog_fields_key, slug_cache_key,
+    blog_cache_entries, hydrate_blogs, load_list_page, parse_list_cursor, is_listed, require_tenant_admin
+)
 
 
 db = DynamoDBClient()
 redis_client = RedisClient()
 
+MONTH_PATTERN = re.compile(r'^\d{4}-(0[1-9]|1[0-2])$')
+
 
 def lambda_handler(event, context):
     """Handle GET blog requests"""
+    deadline.start(context)
     try:
         method = event.get('httpMethod', '')
         path_params = event.get('pathParameters', {}) or {}
@@ -27,6 +43,16 @@ def lambda_handler(event, context):
             return cors_preflight_response()
         
         if method == 'GET':
+            # Blogs belong to the default tenant; hosted tenants only have portfolios
+            if resolve_tenant(event) != DEFAULT_TENANT:
+                raise NotFoundError("Blogs not found")
+            path = event.get('path', '').rstrip('/')
+            if path.endswith('/blogs/trending'):
+                return get_trending(event)
+            if path.endswith('/blogs/archive'):
+                return get_archive(event)
+            if path_params.get('month'):
+                return get_archive_month(event, path_params['month'])
             blog_id = path_params.get('id')
             if blog_id:
                 return get_blog(event, blog_id)
@@ -39,6 +65,8 @@ def lambda_handler(event, context):
                 'body': json.dumps({'error': 'Method not allowed'})
             }
     
+    except APIError as e:
+        return error_response(e)
     except Exception as e:
         print(f"Error in blogs_get handler: {str(e)}")
         return {
@@ -49,10 +77,41 @@ def lambda_handler(event, context):
 
 
 def get_blogs(event):
-    """Get all blogs with pagination"""
-    # Check cache
-    cached = redis_client.get('blogs:list')
+    """Get all blogs with pagination (?fields= limits each blog to those fields)"""
+    # Get query parameters
+    query_params = event.get('queryStringParameters') or {}
+    limit = parse_limit(query_params.get('limit'), default=LIST_PAGE_SIZE, maximum=LIST_MAX_LIMIT)
+    last_key = parse_list_cursor(query_params.get('last_key'))
+    fields = parse_fields(query_params.get('fields'), BLOG_FIELDS, BLOG_ALWAYS_FIELDS)
+    
+    # Cached pages hold only ordered IDs, so editing one post never evicts the list
+    page, new_pages = load_list_page(db, redis_client, limit, last_key)
+    
+    result = {
+        'items': hydrate_blogs(db, redis_client, page['ids'], pages=new_pages, fields=fields),
+        'last_key': page['last_key']
+    }
+    
+    return {
+        'statusCode': 200,
+        'headers': cors_headers(),
+        'body': json.dumps({
+            'success': True,
+            'data': result
+        })
+    }
+
+
+def get_blog(event, blog_id):
+    """Get single blog by ID or slug (?fields= returns only those fields)"""
+    query_params = event.get('queryStringParameters') or {}
+    fields = parse_fields(query_params.get('fields'), BLOG_FIELDS, BLOG_ALWAYS_FIELDS)
+
+    cached = cached_blog(blog_id, fields)
     if cached:
+        if not is_visible(event, cached):
+            return error_response(NotFoundError("Blog not found"))
+        record_view(event, cached)
         return {
             'statusCode': 200,
             'headers': cors_headers(),
@@ -62,31 +121,70 @@ def get_blogs(event):
             })
         }
     
-    # Get query parameters
-    query_params = event.get('queryStringParameters') or {}
-    limit = int(query_params.get('limit', 50))
-    last_key = query_params.get('last_key')
+    # Try to get by ID first, then by slug
+    blog = db.get_blog_by_id(blog_id, fields)
+    if not blog:
+        blog = db.get_blog_by_slug(blog_id, fields)
     
-    # Get from database
-    result = db.get_all_blogs(limit=limit, last_key=json.loads(last_key) if last_key else None)
+    if not blog:
+        return error_response(NotFoundError("Blog not found"))
     
-    # Cache for 1 hour
-    redis_client.set('blogs:list', result, ttl=60*60)
+    # Cache for 1 hour (a projection goes in the blog's fields hash, next to its slug alias)
+    if fields:
+        redis_client.apply_cache_changes(
+            {slug_cache_key(blog['slug']): blog['blogId']} if blog.get('slug') else {}, [], [], ttl=BLOG_CACHE_TTL,
+            hashes={blog_fields_key(blog['blogId']): {fieldset_key(fields): blog}}
+        )
+    else:
+        redis_client.apply_cache_changes(blog_cache_entries(blog), [], [], ttl=BLOG_CACHE_TTL)
+    
+    if not is_visible(event, blog):
+        return error_response(NotFoundError("Blog not found"))
+    record_view(event, blog)
     
     return {
         'statusCode': 200,
         'headers': cors_headers(),
         'body': json.dumps({
             'success': True,
-            'data': result
+            'data': blog
         })
     }
 
 
-def get_blog(event, blog_id):
-    """Get single blog by ID or slug"""
+def cached_blog(blog_id, fields=None):
+    """
+    A blog from cache by ID, or by slug through its alias: the cached projection
+    for the fieldset, else the cached entity cut down to it. None on a miss.
+    """
+    def entity_keys(key_id):
+        return [blog_cache_key(key_id)] + ([(blog_fields_key(key_id), fieldset_key(fields))] if fields else [])
+
+    alias, entity, *projected = redis_client.get_entries([slug_cache_key(blog_id), *entity_keys(blog_id)])
+    if entity is None and not any(projected) and alias:
+        entity, *projected = redis_client.get_entries(entity_keys(alias))
+    return (projected[0] if projected else None) or project(entity, fields)
+
+
+def is_visible(event, blog):
+    """Drafts and scheduled posts are only visible to the admin"""
+    if is_listed(blog):
+        return True
+    try:
+        require_tenant_admin(db, event)
+        return True
+    except (UnauthorizedError, ForbiddenError):
+        return False
+
+
+def get_trending(event):
+    """Get trending blogs, hydrated with summaries in one batched read"""
+    query_params = event.get('queryStringParameters') or {}
+    limit = parse_limit(query_params.get('limit'), default=10, maximum=50)
+    cache_key = f"blogs:trending:{limit}"
+    
     # Check cache
-    cached = redis_client.get(f"blogs:{blog_id}")
+    cached = redis_client.get(cache_key)
     if cached:
         return {
             'statusCode': 200,
@@ -97,22 +195,106 @@ def get_blog(event, blog_id):
             })
         }
     
-    # Try to get by ID first, then by slug
-    blog = db.get_blog_by_id(blog_id)
-    if not blog:
-        blog = db.get_blog_by_slug(blog_id)
+    ranked = redis_client.get_trending(limit)
+    if ranked:
+        # A post unpublished since it was scored stays ranked until the hourly rebuild, so status is checked here
+        blogs = db.batch_get_blogs([blog_id for blog_id, _ in ranked], BLOG_SUMMARY_FIELDS + ('status',))
+        items = [
+            {**project(blogs[blog_id], BLOG_SUMMARY_FIELDS), 'trending_score': score}
+            for blog_id, score in ranked if is_listed(blogs.get(blog_id))
+        ]
+    else:
+        # No activity recorded yet: fall back to the newest posts
+        items = list(islice(db.iter_blogs(BLOG_SUMMARY_FIELDS, page_size=limit), limit))
     
-    if not blog:
-        return error_response(NotFoundError("Blog not found"))
+    result = {'items': items}
     
-    # Cache for 1 hour
-    redis_client.set(f"blogs:{blog_id}", blog, ttl=60*60)
+    # Cache for 1 minute
+    redis_client.set(cache_key, result, ttl=60)
     
     return {
         'statusCode': 200,
         'headers': cors_headers(),
         'body': json.dumps({
             'success': True,
-            'data': blog
+            'data': result
+        })
+    }
+
+
+def get_archive(event):
+    """Get published blog counts per month (YYYY-MM), newest month first"""
+    cached = redis_client.get(ARCHIVE_CACHE_KEY)
+    if cached is None:
+        counts = db.get_archive_counts()
+        cached = {'months': [
+            {'month': month, 'count': counts[month]}
+            for month in sorted(counts, reverse=True)
+        ]}
+        # Dropped by the stream processor when a month's count changes
+        redis_client.set(ARCHIVE_CACHE_KEY, cached, ttl=BLOG_CACHE_TTL)
+
+    return {
+        'statusCode': 200,
+        'headers': cors_headers(),
+        'body': json.dumps({
+            'success': True,
+            'data': cached
+        })
+    }
+
+
+def get_archive_month(event, month):
+    """Get a page of one month's published blogs, newest first"""
+    if not MONTH_PATTERN.match(month):
+        raise ValidationError("month must be YYYY-MM")
+    query_params = event.get('queryStringParameters') or {}
+    limit = parse_limit(query_params.get('limit'), default=20, maximum=LIST_PAGE_SIZE)
+    cursor = query_params.get('cursor') or ''
+    after = decode_key_cursor(cursor, {'SK': ''}, exact={'PK': f'{ARCHIVE_PREFIX}{month}'})
+
+    # Page keys embed the archive's generation, so one INCR invalidates every month page
+    version = redis_client.get_version(ARCHIVE_VERSION_KEY)
+    cache_key = f"blogs:archive:v{version}:{month}:{limit}:{cursor}"
+
+    cached = redis_client.get(cache_key)
+    if cached:
+        return {
+            'statusCode': 200,
+            'headers': cors_headers(),
+            'body': json.dumps({
+                'success': True,
+                'data': cached
+            })
+        }
+
+    page = db.get_archive_month(month, limit=limit, after=after)
+    result = {
+        'month': month,
+        'items': page['items'],
+        'cursor': encode_cursor(page['next'])
+    }
+
+    redis_client.set(cache_key, result, ttl=BLOG_CACHE_TTL)
+
+    return {
+        'statusCode': 200,
+        'headers': cors_headers(),
+        'body': json.dumps({
+            'success': True,
+            'data': result
         })
     }
+
+
+def record_view(event, blog):
+    """
+    Count a page view in Redis (flushed to DynamoDB by the analytics flusher) and
+    bump its trending score; admin previews of unlisted posts never reach trending
+    """
+    redis_client.record_view(
+        blog['blogId'],
+        client_ip_hash(event),
+        hour_bucket(),
+        trending=(VIEW_WEIGHT, time.time(), HALF_LIFE_SECONDS) if is_listed(blog) else None
+    )
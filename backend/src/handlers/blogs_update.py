@@ -8,11 +8,12 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db.dynamodb import DynamoDBClient
 from db.redis import RedisClient
-from db.models import Blog
-from utils.jwt_handler import require_auth
-from utils.validators import validate_slug
-from utils.errors import error_response, UnauthorizedError, NotFoundError, ValidationError
-from handlers.blogs_utils import cors_headers, cors_preflight_response
+from db.models import get_timestamp
+from utils.errors import error_response, APIError, UnauthorizedError, ForbiddenError, NotFoundError, ValidationError
+from handlers.blogs_utils import (
+    cors_headers, cors_preflight_response, blog_changes, trigger_image_pipeline, write_through_blog_cache,
+    require_tenant_admin
+)
 
 
 db = DynamoDBClient()
@@ -41,6 +42,8 @@ def lambda_handler(event, context):
                 'body': json.dumps({'error': 'Method not allowed'})
             }
     
+    except APIError as e:
+        return error_response(e)
     except Exception as e:
         print(f"Error in blogs_update handler: {str(e)}")
         return {
@@ -54,8 +57,8 @@ def update_blog(event, blog_id):
     """Update a blog post"""
     # Require authentication
     try:
-        email = require_auth(event)
-    except UnauthorizedError as e:
+        email = require_tenant_admin(db, event)
+    except (UnauthorizedError, ForbiddenError) as e:
         return error_response(e)
     
     # Get existing blog
@@ -66,35 +69,20 @@ def update_blog(event, blog_id):
     # Parse request body
     body = json.loads(event.get('body', '{}'))
     
-    # Update fields
-    update_data = {}
-    if 'title' in body:
-        update_data['title'] = body['title']
-    if 'content' in body:
-        update_data['content'] = body['content']
-        # Recalculate reading time
-        update_data['reading_time'] = Blog({}).calculate_reading_time(body['content'])
-    if 'slug' in body:
-        slug = validate_slug(body['slug'])
-        # Check if slug is taken by another blog
-        existing = db.get_blog_by_slug(slug)
-        if existing and existing['blogId'] != blog_id:
-            return error_response(ValidationError("A blog with this slug already exists"))
-        update_data['slug'] = slug
-    if 'featured_image_url' in body:
-        update_data['featured_image_url'] = body['featured_image_url']
-    if 'tags' in body:
-        update_data['tags'] = body['tags']
-    if 'category' in body:
-        update_data['category'] = body['category']
-    if 'seo_description' in body:
-        update_data['seo_description'] = body['seo_description']
+    update_data = blog_changes(blog, body, get_timestamp())
     
-    # Update in database
+    # Update in database; a new slug is swapped in atomically (SlugTakenError if taken)
     updated_blog = db.update_blog(blog_id, update_data)
+    if not updated_blog:
+        # Deleted since it was read
+        return error_response(NotFoundError("Blog not found"))
+    
+    # Replace cached copies with the updated post and list page
+    write_through_blog_cache(db, redis_client, updated_blog, previous=blog)
     
-    # Invalidate cache
-    redis_client.invalidate_blog_cache(blog_id)
+    # Build responsive image variants in the background
+    if 'featured_image_url' in update_data or 'content' in update_data:
+        trigger_image_pipeline(blog_id)
     
     return {
         'statusCode': 200,
@@ -1,5 +1,344 @@
 """Shared utilities for blog handlers"""
 import re
+import os
+import json
+import hashlib
+import boto3
+
+from db.dynamodb import (
+    assemble_portfolio, portfolio_sections_for, BLOG_ALL_PREFIX, BLOG_LIST_SHARDS, BLOG_LIST_KEY_ATTRS
+)
+from db.redis import BLOG_PAGES_KEY, PORTFOLIO_SECTION_FIELDS, tenant_cache_key
+from db.models import Blog, Portfolio, BLOG_PUBLISHED
+from utils.fields import project, fieldset_key
+from utils.tenant import DEFAULT_TENANT, admin_tenants
+from utils.errors import ValidationError, ForbiddenError
+from utils.jwt_handler import require_auth
+from utils.validators import validate_required, validate_slug, validate_publication
+
+
+_lambda_client = None
+
+# Default page size of the public list endpoint (the page rebuilt after writes)
+LIST_PAGE_SIZE = 50
+# Largest ?limit= it serves; each size is cached as its own page
+LIST_MAX_LIMIT = 100
+BLOG_CACHE_TTL = 60*60
+# Archive month counts, and the generation counter embedded in archive month page keys
+ARCHIVE_CACHE_KEY = 'blogs:archive'
+ARCHIVE_VERSION_KEY = 'blogs:archive:version'
+# Generation counter the stream bumps when the listed blogs change (portfolios: tenant_version_key)
+BLOG_LIST_VERSION_KEY = 'blogs:list:version'
+PORTFOLIO_CACHE_TTL = 24*60*60
+LIKES_CACHE_TTL = 15*60
+
+# Fields a ?fields= projection may name; the `always` ones are added to every projection
+PORTFOLIO_FIELDS = tuple(attr for _, attr in Portfolio.ATTRS)
+BLOG_FIELDS = tuple(attr for _, attr in Blog.ATTRS) + ('comments_count',)
+BLOG_ALWAYS_FIELDS = ('blogId', 'slug', 'status')
+# Admin writes store fresh cache entries; set to 'false' to fall back to invalidate-and-miss
+CACHE_WRITE_THROUGH = os.environ.get('CACHE_WRITE_THROUGH', 'true').lower() == 'true'
+
+
+def invoke_async(function_env_var, payload):
+    """Fire-and-forget invoke of a worker Lambda; returns False when it is not configured"""
+    global _lambda_client
+    function_name = os.environ.get(function_env_var)
+    if not function_name:
+        return False
+    if _lambda_client is None:
+        _lambda_client = boto3.client('lambda')
+    _lambda_client.invoke(
+        FunctionName=function_name,
+        InvocationType='Event',
+        Payload=json.dumps(payload).encode('utf-8')
+    )
+    return True
+
+
+def trigger_image_pipeline(blog_id):
+    """Generate responsive image variants for a blog without failing the write that triggered it"""
+    try:
+        if not invoke_async('IMAGE_FUNCTION', {'blogId': blog_id}):
+            # No worker deployed (local development): run the pipeline inline
+            from handlers.images import process_blog_images
+            process_blog_images(blog_id)
+    except Exception as e:
+        print(f"Error triggering image pipeline: {str(e)}")
+
+
+def trigger_cascade(blog_id):
+    """Remove a deleted blog's likes, comments and view aggregates in the background"""
+    try:
+        if not invoke_async('CASCADE_FUNCTION', {'blogId': blog_id}):
+            # No worker deployed (local development): run the cascade inline
+            from handlers.blog_cascade import cascade_delete
+            cascade_delete(blog_id)
+    except Exception as e:
+        print(f"Error triggering blog cascade: {str(e)}")
+
+
+def blog_cache_key(blog_id):
+    return f"blogs:{blog_id}"
+
+
+def slug_cache_key(slug):
+    """Slugs map to the blog ID, so each blog has exactly one cached entity"""
+    return f"blogs:slug:{slug}"
+
+
+def blog_fields_key(blog_id):
+    """Hash of a blog's cached projections (fieldset -> projected blog)"""
+    return f"blogs:{blog_id}:fields"
+
+
+def list_page_field(limit, last_key=None):
+    """Field of a list page in the BLOG_PAGES_KEY hash"""
+    return f"{limit}:{json.dumps(last_key, sort_keys=True) if last_key else ''}"
+
+
+def blog_cache_entries(blog):
+    """Entity and slug alias cache entries for a blog"""
+    entries = {blog_cache_key(blog['blogId']): blog}
+    if blog.get('slug'):
+        entries[slug_cache_key(blog['slug'])] = blog['blogId']
+    return entries
+
+
+def hydrate_blogs(db, redis_client, blog_ids, pages=None, fields=None):
+    """
+    Blogs for an ordered list of IDs: one MGET of the entity keys, then one
+    BatchGetItem for the misses. Backfilled entities, plus any freshly built
+    list `pages` ({field: page}), are written back in a single pipeline.
+    IDs whose blog no longer exists are skipped.
+
+    With a fieldset, each blog's cached projection is read in the same pipeline
+    as its entity (which is cut down when present), and misses are read with a
+    ProjectionExpression and cached as projections.
+    """
+    if fields:
+        fieldset = fieldset_key(fields)
+        entries = redis_client.get_entries([
+            key for blog_id in blog_ids for key in (blog_cache_key(blog_id), (blog_fields_key(blog_id), fieldset))
+        ])
+        blogs = {
+            blog_id: projected or project(cached, fields)
+            for blog_id, cached, projected in zip(blog_ids, entries[::2], entries[1::2])
+            if cached or projected
+        }
+    else:
+        cached = redis_client.get_many([blog_cache_key(blog_id) for blog_id in blog_ids])
+        blogs = {blog_id: blog for blog_id, blog in zip(blog_ids, cached) if blog}
+
+    missing = [blog_id for blog_id in blog_ids if blog_id not in blogs]
+    backfill, hashes = {}, dict({BLOG_PAGES_KEY: pages} if pages else {})
+    if missing:
+        for blog in db.batch_get_blogs(missing, fields).values():
+            blogs[blog['blogId']] = blog
+            if fields:
+                hashes[blog_fields_key(blog['blogId'])] = {fieldset: blog}
+            else:
+                backfill[blog_cache_key(blog['blogId'])] = blog
+
+    redis_client.apply_cache_changes(backfill, [], [], ttl=BLOG_CACHE_TTL, hashes=hashes or None)
+    return [blogs[blog_id] for blog_id in blog_ids if blog_id in blogs]
+
+
+def load_list_page(db, redis_client, limit, last_key=None):
+    """
+    Ordered blog IDs of a list page ({'ids', 'last_key'}) from the page cache or
+    GSI1, plus the freshly built page ({field: page}) to write back, or None.
+    """
+    field = list_page_field(limit, last_key)
+    page = redis_client.get_list_page(field)
+    if page is not None:
+        return page, None
+    page = db.get_blog_ids(limit=limit, last_key=last_key)
+    return page, {field: page}
+
+
+def parse_list_cursor(value):
+    """
+    The composite list cursor ({'shards': {shard: key}, 'done': [shard]}) from a
+    last_key query parameter; anything get_blog_ids did not produce is a 400.
+    """
+    if not value:
+        return None
+    try:
+        cursor = json.loads(value)
+    except ValueError:
+        raise ValidationError("Invalid last_key")
+    shards = cursor.get('shards') if isinstance(cursor, dict) else None
+    done = cursor.get('done') if isinstance(cursor, dict) else None
+    if not isinstance(shards, dict) or not isinstance(done, list) or set(cursor) - {'shards', 'done'}:
+        raise ValidationError("Invalid last_key")
+    valid = {str(shard) for shard in range(BLOG_LIST_SHARDS)}
+    for shard, key in shards.items():
+        if (shard not in valid or not isinstance(key, dict) or set(key) != set(BLOG_LIST_KEY_ATTRS)
+                or key['GSI1PK'] != f'{BLOG_ALL_PREFIX}#{shard}' or not isinstance(key['PK'], str)
+                or not isinstance(key['SK'], str) or type(key['GSI1SK']) is not int):
+            raise ValidationError("Invalid last_key")
+    if any(type(shard) is not int or str(shard) not in valid for shard in done):
+        raise ValidationError("Invalid last_key")
+    return cursor
+
+
+def load_portfolio(db, redis_client, tenant=DEFAULT_TENANT, fields=None):
+    """
+    A tenant's portfolio assembled from its cached sections - one HMGET on the
+    tenant's cache hash for the sections the fieldset needs; any missing are
+    read in one Query and cached. Sections never saved come back empty (and
+    are cached that way too).
+    """
+    sections = portfolio_sections_for(fields)
+    fields_needed = [PORTFOLIO_SECTION_FIELDS[section] for section in sections]
+    values = dict(zip(sections, redis_client.get_fields(tenant_cache_key(tenant), fields_needed)))
+    missing = tuple(section for section, value in values.items() if value is None)
+    if missing:
+        loaded = db.get_portfolio_sections(tenant, missing)
+        values.update(loaded)
+        redis_client.apply_cache_changes({}, [], [], ttl=PORTFOLIO_CACHE_TTL, hashes={
+            tenant_cache_key(tenant): {PORTFOLIO_SECTION_FIELDS[section]: value for section, value in loaded.items()}
+        })
+    return project(assemble_portfolio(tenant, values), fields)
+
+
+def load_like_counts(db, redis_client, blog_ids, ip_hash=None):
+    """
+    ({blogId: likes_count} for existing blogs, {blogIds the visitor liked}).
+    Counts come from one MGET of likes_count:{id}; a single BatchGetItem reads
+    the missed counts and, given ip_hash, the visitor's like markers.
+    """
+    cached = {
+        blog_id: value
+        for blog_id, value in zip(blog_ids, redis_client.get_many([f"likes_count:{blog_id}" for blog_id in blog_ids]))
+        # Older entries cached the whole response per blog
+        if isinstance(value, int)
+    }
+
+    missing = [blog_id for blog_id in blog_ids if blog_id not in cached]
+    counts, liked = {}, set()
+    if missing or ip_hash:
+        counts, liked = db.get_like_states(blog_ids if ip_hash else [], ip_hash, count_ids=missing)
+    if counts:
+        redis_client.apply_cache_changes(
+            {f"likes_count:{blog_id}": count for blog_id, count in counts.items()}, [], [], ttl=LIKES_CACHE_TTL
+        )
+    counts.update(cached)
+    return counts, liked
+
+
+def is_listed(blog):
+    """Whether a blog appears in the public list (only published posts do)"""
+    return blog is not None and blog.get('status', BLOG_PUBLISHED) == BLOG_PUBLISHED
+
+
+def write_through_blog_cache(db, redis_client, blog, previous=None):
+    """Store fresh caches after a single blog write; see write_through_blog_caches"""
+    write_through_blog_caches(db, redis_client, [(blog, previous)])
+
+
+def write_through_blog_caches(db, redis_client, changes):
+    """
+    Store fresh blog caches after successful admin writes, in one pipelined round trip.
+
+    changes holds (blog, previous) pairs: `blog` is the entity as written (None
+    after a delete) and `previous` the version it replaced, whose keys are
+    dropped when they no longer apply. List pages only hold IDs, so an edit
+    leaves them warm; when a post enters or leaves the list (create, delete,
+    publish, unpublish) the pages are dropped and the first one rebuilt.
+    """
+    refresh, delete = {}, []
+    membership_changed = listed_changed = False
+    for blog, previous in changes:
+        if blog is not None:
+            refresh.update(blog_cache_entries(blog))
+        else:
+            delete.append(blog_cache_key(previous['blogId']))
+        delete.append(blog_fields_key((blog or previous)['blogId']))
+        if previous and previous.get('slug') and slug_cache_key(previous['slug']) not in refresh:
+            delete.append(slug_cache_key(previous['slug']))
+        membership_changed = membership_changed or is_listed(blog) != is_listed(previous)
+        listed_changed = listed_changed or is_listed(blog) or is_listed(previous)
+
+    if membership_changed:
+        delete.append(BLOG_PAGES_KEY)
+    # Responses composed from the list (the bootstrap) are keyed by its generation
+    bump = [BLOG_LIST_VERSION_KEY] if listed_changed else []
+
+    if not CACHE_WRITE_THROUGH:
+        redis_client.apply_cache_changes({}, delete + list(refresh), bump)
+        return
+
+    pages = None
+    if membership_changed:
+        try:
+            pages = {BLOG_PAGES_KEY: {list_page_field(LIST_PAGE_SIZE): db.get_blog_ids(limit=LIST_PAGE_SIZE)}}
+        except Exception as e:
+            print(f"Error rebuilding blog list cache: {str(e)}")
+
+    redis_client.apply_cache_changes(refresh, delete, bump, ttl=BLOG_CACHE_TTL, hashes=pages)
+
+
+def require_tenant_admin(db, event, tenant=DEFAULT_TENANT):
+    """
+    Authenticated admin of a tenant, i.e. one whose user item lists it in `tenants`.
+    Blogs, likes and comments all belong to the default tenant, so their admin
+    routes check that one; hosted tenants only have portfolios.
+    """
+    email = require_auth(event)
+    user = db.get_user(email)
+    if not user or tenant not in admin_tenants(user):
+        raise ForbiddenError("Not an admin of this portfolio")
+    return email
+
+
+def new_blog(body, author, now):
+    """Validate a create request body and build the blog to store (slug uniqueness is checked by the caller)"""
+    title = validate_required(body.get('title'), 'title')
+    content = validate_required(body.get('content'), 'content')
+    slug = validate_slug(body.get('slug') or generate_slug(title))
+    status, published_at = validate_publication(body.get('status', 'published'), body.get('published_at'), now)
+
+    blog = Blog.from_dict({
+        'title': title,
+        'slug': slug,
+        'content': content,
+        'featured_image_url': body.get('featured_image_url', ''),
+        'tags': body.get('tags', []),
+        'category': body.get('category', ''),
+        'author': author,
+        'seo_description': body.get('seo_description', ''),
+        'status': status,
+        'published_at': published_at,
+    })
+    blog.reading_time = blog.calculate_reading_time(content)
+    return blog.to_dict()
+
+
+def blog_changes(blog, body, now):
+    """Validate an update request body against the stored blog; returns the fields to change"""
+    update_data = {}
+    if 'title' in body:
+        update_data['title'] = body['title']
+    if 'content' in body:
+        update_data['content'] = body['content']
+        # Recalculate reading time
+        update_data['reading_time'] = Blog.calculate_reading_time(body['content'])
+    if 'slug' in body:
+        update_data['slug'] = validate_slug(body['slug'])
+    for field in ('featured_image_url', 'tags', 'category', 'seo_description'):
+        if field in body:
+            update_data[field] = body[field]
+    if 'status' in body or 'published_at' in body:
+        current = blog.get('status', BLOG_PUBLISHED)
+        status = body.get('status', current)
+        # Keep the existing publication time unless the state changes or a new one is given
+        published_at = body['published_at'] if 'published_at' in body else (
+            blog.get('published_at') if status == current else None
+        )
+        update_data['status'], update_data['published_at'] = validate_publication(status, published_at, now)
+    return update_data
 
 
 def generate_slug(title):
@@ -10,6 +349,25 @@ def generate_slug(title):
     return slug
 
 
+def get_client_ip(event):
+    """
+    Extract client IP from event: the source IP API Gateway saw, else the rightmost
+    X-Forwarded-For hop (the one API Gateway appended). Earlier hops, like
+    X-Real-Ip, are whatever the client sent, so rate limits never trust them.
+    """
+    identity = (event.get('requestContext') or {}).get('identity') or {}
+    if identity.get('sourceIp'):
+        return identity['sourceIp']
+    headers = event.get('headers', {}) or {}
+    hops = [hop.strip() for hop in headers.get('X-Forwarded-For', '').split(',') if hop.strip()]
+    return hops[-1] if hops else 'unknown'
+
+
+def client_ip_hash(event):
+    """Anonymized client identifier (the raw IP is never stored)"""
+    return hashlib.md5(get_client_ip(event).encode()).hexdigest()
+
+
 def cors_headers():
     """Get CORS headers"""
     return {
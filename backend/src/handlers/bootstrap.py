@@ -0,0 +1,132 @@
+"""Handler for the aggregated page bootstrap (portfolio, latest blogs and their like counts)"""
+import json
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.dynamodb import DynamoDBClient, BLOG_SUMMARY_FIELDS
+from db.redis import RedisClient, tenant_version_key
+from utils.errors import error_response, APIError
+from utils.pagination import parse_limit
+from utils import deadline
+from utils.deadline import DeadlineExceededError
+from utils.tenant import DEFAULT_TENANT, TENANT_RATE_LIMIT, resolve_tenant
+from utils.rate_limit import RateLimiter
+from handlers.blogs_utils import (
+    cors_headers, cors_preflight_response, LIST_PAGE_SIZE, BLOG_LIST_VERSION_KEY,
+    hydrate_blogs, load_list_page, load_portfolio, load_like_counts
+)
+
+
+db = DynamoDBClient()
+redis_client = RedisClient()
+# Shares its buckets with the portfolio routes' limiter (same name)
+tenant_limiter = RateLimiter(redis_client, 'tenant', TENANT_RATE_LIMIT)
+
+DEFAULT_BOOTSTRAP_BLOGS = 6
+# Backstop only: the key changes whenever an input does
+BOOTSTRAP_CACHE_TTL = 60*60
+
+# Portfolio, blog summaries and like counts are fetched side by side
+_pool = ThreadPoolExecutor(max_workers=3)
+
+
+def lambda_handler(event, context):
+    """Handle GET /bootstrap requests"""
+    deadline.start(context)
+    try:
+        method = event.get('httpMethod', '')
+
+        # Handle CORS preflight
+        if method == 'OPTIONS':
+            return cors_preflight_response()
+
+        if method == 'GET':
+            return get_bootstrap(event)
+        else:
+            return {
+                'statusCode': 405,
+                'headers': cors_headers(),
+                'body': json.dumps({'error': 'Method not allowed'})
+            }
+
+    except APIError as e:
+        return error_response(e)
+    except Exception as e:
+        print(f"Error in bootstrap handler: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': cors_headers(),
+            'body': json.dumps({'error': 'Internal server error'})
+        }
+
+
+def get_bootstrap(event):
+    """
+    Everything the home and blog pages render first, in one response:
+    {"portfolio", "blogs" (newest summaries), "likes" ({blogId: count}), "version"}.
+
+    The portfolio is the request's tenant's. Blogs belong to the default
+    tenant only, so a hosted tenant's bootstrap has none. The result is cached
+    under the generations of its inputs (the tenant's and the blog list's
+    counters, bumped on every change that could alter it), so a hit costs one
+    MGET and one GET. On a miss the portfolio, the blogs and their like counts
+    are loaded concurrently.
+    """
+    tenant = resolve_tenant(event)
+    if tenant != DEFAULT_TENANT:
+        tenant_limiter.check(tenant)
+    query_params = event.get('queryStringParameters') or {}
+    limit = parse_limit(query_params.get('limit'), DEFAULT_BOOTSTRAP_BLOGS, LIST_PAGE_SIZE)
+
+    # Read before the inputs, so a result is never stored under a newer version than its data
+    portfolio_version, list_version = (
+        version or 0 for version in redis_client.get_many([tenant_version_key(tenant), BLOG_LIST_VERSION_KEY])
+    )
+    has_blogs = tenant == DEFAULT_TENANT
+    if not has_blogs:
+        list_version = 0
+    version = f"{portfolio_version}.{list_version}"
+    cache_key = f"bootstrap:{tenant}:v{version}:{limit}"
+
+    result = redis_client.get(cache_key)
+    if result is None:
+        portfolio = _pool.submit(load_portfolio, db, redis_client, tenant)
+        if has_blogs:
+            # Always the first public page, which writes and the stream keep warm
+            page, new_pages = load_list_page(db, redis_client, LIST_PAGE_SIZE)
+            blog_ids = page['ids'][:limit]
+            blogs = _pool.submit(hydrate_blogs, db, redis_client, blog_ids, new_pages)
+            likes = _pool.submit(load_like_counts, db, redis_client, blog_ids)
+            portfolio, blogs, likes = gather(portfolio, blogs, likes)
+        else:
+            (portfolio,) = gather(portfolio)
+            blogs, likes = [], ({},)
+
+        result = {
+            'portfolio': portfolio,
+            'blogs': [{field: blog[field] for field in BLOG_SUMMARY_FIELDS if field in blog} for blog in blogs],
+            'likes': likes[0],
+            'version': version
+        }
+        redis_client.set(cache_key, result, ttl=BOOTSTRAP_CACHE_TTL)
+
+    return {
+        'statusCode': 200,
+        'headers': cors_headers(),
+        'body': json.dumps({
+            'success': True,
+            'data': result
+        })
+    }
+
+
+def gather(*futures):
+    """Results of concurrent sub-fetches, or DeadlineExceededError if the request budget runs out first"""
+    _, pending = wait(futures, timeout=deadline.remaining())
+    if pending:
+        raise DeadlineExceededError()
+    return [future.result() for future in futures]
@@ -0,0 +1,236 @@
+"""Handler for blog comments"""
+import json
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.dynamodb import DynamoDBClient, BLOG_PREFIX, PENDING_COMMENT_PREFIX, PENDING_COMMENTS_PK
+from db.redis import RedisClient
+from db.models import Comment
+from utils.validators import validate_required, validate_email
+from utils.pagination import encode_cursor, decode_cursor, decode_key_cursor, parse_limit
+from utils.errors import error_response, APIError, UnauthorizedError, ForbiddenError, NotFoundError, ValidationError
+from handlers.blogs_utils import cors_headers, cors_preflight_response, require_tenant_admin
+
+
+db = DynamoDBClient()
+redis_client = RedisClient()
+
+MAX_COMMENT_LENGTH = 5000
+MAX_NAME_LENGTH = 100
+MODERATION_ENABLED = os.environ.get('COMMENT_MODERATION', 'true').lower() == 'true'
+
+# Fields never exposed on public comment threads
+PRIVATE_FIELDS = ('author_email',)
+
+
+def lambda_handler(event, context):
+    """Handle comment requests"""
+    try:
+        method = event.get('httpMethod', '')
+        path = event.get('path', '')
+        path_params = event.get('pathParameters', {}) or {}
+
+        # Handle CORS preflight
+        if method == 'OPTIONS':
+            return cors_preflight_response()
+
+        if method == 'GET' and path.rstrip('/').endswith('/comments/pending'):
+            return get_pending_comments(event)
+
+        blog_id = path_params.get('id')
+        if not blog_id:
+            return error_response(ValidationError("Blog ID is required"))
+        comment_id = path_params.get('commentId')
+
+        if method == 'GET' and not comment_id:
+            return get_comments(event, blog_id)
+        elif method == 'POST' and not comment_id:
+            return create_comment(event, blog_id)
+        elif method == 'PUT' and comment_id:
+            return moderate_comment(event, blog_id, comment_id)
+        elif method == 'DELETE' and comment_id:
+            return delete_comment(event, blog_id, comment_id)
+        else:
+            return {
+                'statusCode': 405,
+                'headers': cors_headers(),
+                'body': json.dumps({'error': 'Method not allowed'})
+            }
+
+    except APIError as e:
+        return error_response(e)
+    except Exception as e:
+        print(f"Error in comments handler: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': cors_headers(),
+            'body': json.dumps({'error': 'Internal server error'})
+        }
+
+
+def public_comment(comment):
+    """Strip private fields from a comment"""
+    return {k: v for k, v in comment.items() if k not in PRIVATE_FIELDS}
+
+
+def get_comments(event, blog_id):
+    """Get a page of approved comments for a blog"""
+    query_params = event.get('queryStringParameters') or {}
+    limit = parse_limit(query_params.get('limit'), default=20, maximum=100)
+    cursor = query_params.get('cursor') or ''
+    after = decode_cursor(cursor)
+
+    # Page keys embed the thread's generation, so one INCR invalidates every page
+    version = redis_client.get_version(f"comments:{blog_id}:version")
+    cache_key = f"comments:{blog_id}:v{version}:{limit}:{cursor}"
+
+    cached = redis_client.get(cache_key)
+    if cached:
+        return {
+            'statusCode': 200,
+            'headers': cors_headers(),
+            'body': json.dumps({
+                'success': True,
+                'data': cached
+            })
+        }
+
+    page = db.get_comments(blog_id, limit=limit, after=after)
+    result = {
+        'items': [public_comment(c) for c in page['items']],
+        'cursor': encode_cursor(page['next'])
+    }
+
+    # Cache for 1 hour
+    redis_client.set(cache_key, result, ttl=60*60)
+
+    return {
+        'statusCode': 200,
+        'headers': cors_headers(),
+        'body': json.dumps({
+            'success': True,
+            'data': result
+        })
+    }
+
+
+def create_comment(event, blog_id):
+    """Create a comment (held for moderation unless moderation is disabled)"""
+    body = json.loads(event.get('body') or '{}')
+
+    author_name = validate_required(body.get('author_name'), 'author_name').strip()
+    content = validate_required(body.get('content'), 'content').strip()
+    if len(author_name) > MAX_NAME_LENGTH:
+        raise ValidationError(f"author_name must be at most {MAX_NAME_LENGTH} characters")
+    if len(content) > MAX_COMMENT_LENGTH:
+        raise ValidationError(f"content must be at most {MAX_COMMENT_LENGTH} characters")
+    author_email = validate_email(body['author_email']) if body.get('author_email') else ''
+
+    comment = Comment(
+        blog_id=blog_id,
+        author_name=author_name,
+        author_email=author_email,
+        content=content,
+        status='pending' if MODERATION_ENABLED else 'approved'
+    ).to_dict()
+
+    if not db.create_comment(comment):
+        return error_response(NotFoundError("Blog not found"))
+
+    if comment['status'] == 'approved':
+        redis_client.invalidate_comments_cache(blog_id)
+        redis_client.invalidate_blog_cache(blog_id)
+
+    return {
+        'statusCode': 201,
+        'headers': cors_headers(),
+        'body': json.dumps({
+            'success': True,
+            'data': public_comment(comment)
+        })
+    }
+
+
+def get_pending_comments(event):
+    """List comments awaiting moderation (admin)"""
+    try:
+        require_tenant_admin(db, event)
+    except (UnauthorizedError, ForbiddenError) as e:
+        return error_response(e)
+
+    query_params = event.get('queryStringParameters') or {}
+    limit = parse_limit(query_params.get('limit'), default=50, maximum=100)
+    after = decode_key_cursor(
+        query_params.get('cursor'),
+        {'PK': BLOG_PREFIX, 'SK': PENDING_COMMENT_PREFIX, 'GSI4SK': ''},
+        exact={'GSI4PK': PENDING_COMMENTS_PK}
+    )
+    page = db.get_pending_comments(limit=limit, after=after)
+
+    return {
+        'statusCode': 200,
+        'headers': cors_headers(),
+        'body': json.dumps({
+            'success': True,
+            'data': {
+                'items': page['items'],
+                'cursor': encode_cursor(page['next'])
+            }
+        })
+    }
+
+
+def moderate_comment(event, blog_id, comment_id):
+    """Approve or reject a pending comment (admin)"""
+    try:
+        require_tenant_admin(db, event)
+    except (UnauthorizedError, ForbiddenError) as e:
+        return error_response(e)
+
+    body = json.loads(event.get('body') or '{}')
+    status = body.get('status')
+
+    if status == 'approved':
+        comment = db.approve_comment(blog_id, comment_id)
+        if not comment:
+            return error_response(NotFoundError("Pending comment not found"))
+        redis_client.invalidate_comments_cache(blog_id)
+        redis_client.invalidate_blog_cache(blog_id)
+        return {
+            'statusCode': 200,
+            'headers': cors_headers(),
+            'body': json.dumps({
+                'success': True,
+                'data': comment
+            })
+        }
+    elif status == 'rejected':
+        return delete_comment(event, blog_id, comment_id)
+    else:
+        return error_response(ValidationError("status must be 'approved' or 'rejected'"))
+
+
+def delete_comment(event, blog_id, comment_id):
+    """Delete a comment (admin)"""
+    try:
+        require_tenant_admin(db, event)
+    except (UnauthorizedError, ForbiddenError) as e:
+        return error_response(e)
+
+    if not db.delete_comment(blog_id, comment_id):
+        return error_response(NotFoundError("Comment not found"))
+
+    redis_client.invalidate_comments_cache(blog_id)
+    redis_client.invalidate_blog_cache(blog_id)
+
+    return {
+        'statusCode': 200,
+        'headers': cors_headers(),
+        'body': json.dumps({
+            'success': True,
+            'message': 'Comment deleted successfully'
+        })
+    }
@@ -0,0 +1,92 @@
+"""Worker for generating responsive image variants of blog images"""
+import sys
+import os
+import requests
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.dynamodb import DynamoDBClient
+from db.redis import RedisClient
+from db.storage import get_object_store, key_for_url
+from utils.images import extract_image_urls, variant_prefix, output_formats, render_all, store_variants
+
+
+db = DynamoDBClient()
+redis_client = RedisClient()
+store = get_object_store()
+
+DOWNLOAD_TIMEOUT = 10
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
+def lambda_handler(event, context):
+    """Handle asynchronous image pipeline invocations ({"blogId": ...})"""
+    blog_id = event.get('blogId')
+    if not blog_id:
+        print("Image pipeline invoked without blogId")
+        return {'processed': 0}
+
+    try:
+        return {'processed': process_blog_images(blog_id)}
+    except Exception as e:
+        print(f"Error in images handler: {str(e)}")
+        raise
+
+
+def download(url):
+    """Fetch a source image, or None if it cannot be used (streamed, so an oversized one is never held whole)"""
+    try:
+        with requests.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > MAX_SOURCE_BYTES:
+                print(f"Skipping oversized image: {url}")
+                return None
+
+            data = bytearray()
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                data += chunk
+                # Content-Length can be missing or wrong, so the bytes actually read decide
+                if len(data) > MAX_SOURCE_BYTES:
+                    print(f"Skipping oversized image: {url}")
+                    return None
+            return bytes(data)
+    except requests.RequestException as e:
+        print(f"Error downloading image {url}: {str(e)}")
+        return None
+
+
+def process_blog_images(blog_id):
+    """Generate variants for a blog's new images and store the srcset map on the blog"""
+    blog = db.get_blog_by_id(blog_id)
+    if not blog:
+        return 0
+
+    existing = blog.get('image_variants') or {}
+    urls = extract_image_urls(blog)
+    pending = [url for url in urls if url not in existing]
+
+    sources = []
+    for url in pending:
+        data = download(url)
+        if data:
+            sources.append((url, data))
+
+    variants = {url: existing[url] for url in urls if url in existing}
+    if sources:
+        rendered = render_all([data for _, data in sources], output_formats())
+        for (url, _), result in zip(sources, rendered):
+            if result is None:
+                continue
+            prefix = variant_prefix(url, key_for_url(store, url), blog_id)
+            variants[url] = store_variants(store, prefix, result)
+
+    # Nothing new and nothing removed
+    if variants == existing:
+        return 0
+
+    db.set_blog_image_variants(blog_id, variants)
+    redis_client.invalidate_blog_cache(blog_id)
+    return len(sources)
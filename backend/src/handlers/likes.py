@@ -1,20 +1,28 @@
 import json
 import sys
 import os
-import hashlib
 import time
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from db.dynamodb import DynamoDBClient
+from db.dynamodb import DynamoDBClient, MAX_BATCH_GET_KEYS
 from db.redis import RedisClient
-from utils.errors import error_response, NotFoundError, ValidationError
+from utils.errors import error_response, NotFoundError, ValidationError, RateLimitedError
+from utils.rate_limit import RateLimiter
+from utils.trending import LIKE_WEIGHT, HALF_LIFE_SECONDS
+from handlers.blogs_utils import client_ip_hash, load_like_counts, is_listed
 
 
 db = DynamoDBClient()
 redis_client = RedisClient()
 
+# Likes per visitor (IP): a burst of N, refilled at N per S seconds ("N/S"; "off" disables)
+like_limiter = RateLimiter(redis_client, 'like', os.environ.get('LIKE_RATE_LIMIT', '20/60'))
+
+# Each blog needs two keys (its count and the visitor's marker) in the one BatchGetItem
+MAX_LIKES_BATCH = MAX_BATCH_GET_KEYS // 2
+
 
 def lambda_handler(event, context):
     """Handle like requests"""
@@ -36,6 +44,8 @@ def lambda_handler(event, context):
             }
         
         blog_id = path_params.get('id')
+        if method == 'GET' and path.rstrip('/').endswith('/blogs/likes'):
+            return get_likes_batch(event)
         if not blog_id:
             return error_response(ValidationError("Blog ID is required"))
         
@@ -65,59 +75,45 @@ def lambda_handler(event, context):
         }
 
 
-def get_client_ip(event):
-    """Extract client IP from event"""
-    headers = event.get('headers', {})
-    ip = (
-        headers.get('X-Forwarded-For', '').split(',')[0].strip() or
-        headers.get('X-Real-Ip', '') or
-        event.get('requestContext', {}).get('identity', {}).get('sourceIp', '') or
-        'unknown'
-    )
-    return ip
+def like_states(blog_ids, ip_hash):
+    """
+    {blogId: {'likes_count', 'has_liked'}} for existing blogs - one Redis MGET
+    and one BatchGetItem (see load_like_counts). Nothing is written back to the blogs.
+    """
+    counts, liked = load_like_counts(db, redis_client, blog_ids, ip_hash)
+    return {
+        blog_id: {'likes_count': counts[blog_id], 'has_liked': blog_id in liked}
+        for blog_id in blog_ids if blog_id in counts
+    }
 
 
 def get_likes(event, blog_id):
-    """Get likes count for a blog"""
-    # Check cache
-    cached = redis_client.get(f"likes_count:{blog_id}")
-    if cached:
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'success': True,
-                'data': cached
-            })
-        }
-    
-    # Get from database
-    likes_count = db.get_likes_count(blog_id)
-    
-    # Update blog likes count
-    blog = db.get_blog_by_id(blog_id)
-    if blog:
-        db.update_blog(blog_id, {'likes_count': likes_count})
+    """Get likes count for a blog and whether the caller has liked it"""
+    result = like_states([blog_id], client_ip_hash(event)).get(blog_id)
+    if result is None:
+        return error_response(NotFoundError("Blog not found"))
     
-    result = {
-        'likes_count': likes_count,
-        'has_liked': False
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': json.dumps({
+            'success': True,
+            'data': result
+        })
     }
-    
-    # Check if current IP has liked
-    client_ip = get_client_ip(event)
-    ip_hash = hashlib.md5(client_ip.encode()).hexdigest()
-    timestamp = int(time.time())
-    timestamp_ip = f"{timestamp}:{ip_hash}"
-    
-    if db.has_liked(blog_id, timestamp_ip):
-        result['has_liked'] = True
-    
-    # Cache for 15 minutes
-    redis_client.set(f"likes_count:{blog_id}", result, ttl=15*60)
+
+
+def get_likes_batch(event):
+    """Get likes counts and has-liked flags for many blogs (?ids=a,b,c); unknown IDs are omitted"""
+    query_params = event.get('queryStringParameters', {}) or {}
+    blog_ids = list(dict.fromkeys(i for i in (query_params.get('ids') or '').split(',') if i))
+    if not blog_ids:
+        return error_response(ValidationError("ids is required"))
+    if len(blog_ids) > MAX_LIKES_BATCH:
+        return error_response(ValidationError(f"At most {MAX_LIKES_BATCH} ids per request"))
     
     return {
         'statusCode': 200,
@@ -127,28 +123,29 @@ def get_likes(event, blog_id):
         },
         'body': json.dumps({
             'success': True,
-            'data': result
+            'data': like_states(blog_ids, client_ip_hash(event))
         })
     }
 
 
 def add_like(event, blog_id):
     """Add a like to a blog"""
+    ip_hash = client_ip_hash(event)
+    # Before any DynamoDB work
+    try:
+        like_limiter.check(ip_hash)
+    except RateLimitedError as e:
+        return error_response(e)
+    
     # Check if blog exists
     blog = db.get_blog_by_id(blog_id)
     if not blog:
         return error_response(NotFoundError("Blog not found"))
+    likes_count = blog.get('likes_count', 0)
     
-    # Get client IP
-    client_ip = get_client_ip(event)
-    ip_hash = hashlib.md5(client_ip.encode()).hexdigest()
-    timestamp = int(time.time())
-    timestamp_ip = f"{timestamp}:{ip_hash}"
-    
-    # Check if already liked (basic check - in production, use better rate limiting)
-    if db.has_liked(blog_id, timestamp_ip):
+    # One like per visitor until it expires; the marker check is part of the write
+    if not db.add_like(blog_id, ip_hash, int(time.time())):
         # Still return success but don't increment
-        likes_count = db.get_likes_count(blog_id)
         return {
             'statusCode': 200,
             'headers': {
@@ -161,19 +158,15 @@ def add_like(event, blog_id):
                 'data': {'likes_count': likes_count}
             })
         }
-    
-    # Add like
-    db.add_like(blog_id, timestamp_ip)
-    
-    # Get updated count
-    likes_count = db.get_likes_count(blog_id)
-    
-    # Update blog likes count
-    db.update_blog(blog_id, {'likes_count': likes_count})
+    likes_count += 1
     
     # Invalidate cache
     redis_client.invalidate_likes_cache(blog_id)
     
+    # Count towards trending (public posts only; trending is served to everyone)
+    if is_listed(blog):
+        redis_client.bump_trending(blog_id, LIKE_WEIGHT, time.time(), HALF_LIFE_SECONDS)
+    
     return {
         'statusCode': 200,
         'headers': {
@@ -185,3 +178,4 @@ def add_like(event, blog_id):
             'data': {'likes_count': likes_count}
         })
     }
+
@@ -5,19 +5,29 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from db.dynamodb import DynamoDBClient
-from db.redis import RedisClient
-from db.models import Portfolio
-from utils.jwt_handler import require_auth
-from utils.errors import error_response, UnauthorizedError, NotFoundError
+from db.codec import INTERNAL_KEYS
+from db.dynamodb import DynamoDBClient, PORTFOLIO_SECTIONS, PORTFOLIO_LIST_SECTIONS
+from db.redis import RedisClient, PORTFOLIO_SECTION_FIELDS, tenant_cache_key, tenant_version_key
+from db.models import generate_sortable_id, get_timestamp
+from utils.errors import error_response, APIError, UnauthorizedError, NotFoundError, ValidationError
+from utils import deadline
+from utils.fields import parse_fields
+from utils.tenant import DEFAULT_TENANT, TENANT_RATE_LIMIT, resolve_tenant
+from utils.rate_limit import RateLimiter
+from handlers.blogs_utils import (
+    CACHE_WRITE_THROUGH, PORTFOLIO_CACHE_TTL, PORTFOLIO_FIELDS, load_portfolio, require_tenant_admin
+)
 
 
 db = DynamoDBClient()
 redis_client = RedisClient()
 
+tenant_limiter = RateLimiter(redis_client, 'tenant', TENANT_RATE_LIMIT)
+
 
 def lambda_handler(event, context):
     """Handle portfolio requests"""
+    deadline.start(context)
     try:
         method = event.get('httpMethod', '')
         path = event.get('path', '')
@@ -34,10 +44,26 @@ def lambda_handler(event, context):
                 'body': ''
             }
         
-        if method == 'GET':
-            return get_portfolio(event)
-        elif method == 'PUT':
-            return update_portfolio(event)
+        path_params = event.get('pathParameters', {}) or {}
+        section = path_params.get('section')
+        item_id = path_params.get('itemId')
+        # Which hosted portfolio: /t/{tenant}/portfolio, or the site's hostname
+        tenant = resolve_tenant(event)
+        if tenant != DEFAULT_TENANT:
+            tenant_limiter.check(tenant)
+
+        if method == 'GET' and not section:
+            return get_portfolio(event, tenant)
+        elif method == 'PUT' and not section:
+            return update_portfolio(event, tenant)
+        elif method == 'PUT' and section and not item_id:
+            return update_section(event, tenant, section)
+        elif method == 'POST' and section and not item_id:
+            return create_item(event, tenant, section)
+        elif method == 'PUT' and item_id:
+            return update_item(event, tenant, section, item_id)
+        elif method == 'DELETE' and item_id:
+            return delete_item(event, tenant, section, item_id)
         else:
             return {
                 'statusCode': 405,
@@ -48,6 +74,8 @@ def lambda_handler(event, context):
                 'body': json.dumps({'error': 'Method not allowed'})
             }
     
+    except APIError as e:
+        return error_response(e)
     except Exception as e:
         print(f"Error in portfolio handler: {str(e)}")
         return {
@@ -60,44 +88,11 @@ def lambda_handler(event, context):
         }
 
 
-def get_portfolio(event):
-    """Get portfolio data"""
-    user_id = 'default'  # Single user portfolio
-    
-    # Check cache
-    cached = redis_client.get('portfolio_data')
-    if cached:
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'success': True,
-                'data': cached
-            })
-        }
-    
-    # Get from database
-    portfolio = db.get_portfolio(user_id)
-    
-    if not portfolio:
-        # Return empty portfolio structure
-        portfolio = {
-            'userId': user_id,
-            'profile_pic_url': '',
-            'bio': '',
-            'email': '',
-            'social_links': {},
-            'about_content': '',
-            'projects': [],
-            'experience': [],
-            'updated_at': 0
-        }
-    
-    # Cache for 24 hours
-    redis_client.set('portfolio_data', portfolio, ttl=24*60*60)
+def get_portfolio(event, tenant):
+    """Get portfolio data (?fields=bio,email returns only those fields)"""
+    query_params = event.get('queryStringParameters') or {}
+    fields = parse_fields(query_params.get('fields'), PORTFOLIO_FIELDS)
+    portfolio = load_portfolio(db, redis_client, tenant, fields=fields)
     
     return {
         'statusCode': 200,
@@ -112,26 +107,127 @@ def get_portfolio(event):
     }
 
 
-def update_portfolio(event):
-    """Update portfolio data"""
+def update_portfolio(event, tenant):
+    """
+    Update portfolio data given as one document. Each section present is
+    written on its own (projects/experience replace the whole list); prefer
+    the per-section and per-item routes, which touch only what changed.
+    """
     # Require authentication
     try:
-        email = require_auth(event)
+        require_tenant_admin(db, event, tenant)
     except UnauthorizedError as e:
         return error_response(e)
     
     # Parse request body
-    body = json.loads(event.get('body', '{}'))
-    user_id = 'default'
+    body = json.loads(event.get('body') or '{}')
+    for section in PORTFOLIO_LIST_SECTIONS:
+        if body.get(section) is not None:
+            body[section] = [entry_fields(entry) for entry in body[section]]
     
     # Update portfolio
-    updated = db.update_portfolio(user_id, body)
-    
-    # Invalidate cache
-    redis_client.invalidate_portfolio_cache()
+    updated = db.update_portfolio(tenant, body)
+    refresh_section_caches(tenant, {section: None for section in PORTFOLIO_SECTIONS})
     
+    return write_response(updated)
+
+
+def update_section(event, tenant, section):
+    """PUT /portfolio/{section}: update the profile or about attributes in the body"""
+    require_tenant_admin(db, event, tenant)
+    if section in PORTFOLIO_LIST_SECTIONS or section not in PORTFOLIO_SECTIONS:
+        raise NotFoundError("Unknown portfolio section")
+
+    body = json.loads(event.get('body') or '{}')
+    attrs = PORTFOLIO_SECTIONS[section][1]
+    data = {attr: body[attr] for attr in attrs if attr in body}
+    if not data:
+        raise ValidationError(f"Provide at least one of: {', '.join(attrs)}")
+
+    updated = db.update_portfolio_section(tenant, section, data)
+    refresh_section_caches(tenant, {section: updated})
+    return write_response(updated)
+
+
+def create_item(event, tenant, section):
+    """POST /portfolio/{section}: add a project or experience entry (appended unless a sort_order is given)"""
+    require_tenant_admin(db, event, tenant)
+    list_section(section)
+
+    entry = entry_fields(json.loads(event.get('body') or '{}'))
+    entry['id'] = generate_sortable_id()
+    entry.setdefault('sort_order', get_timestamp() * 1000)
+
+    created = db.create_portfolio_item(tenant, section, entry)
+    refresh_section_caches(tenant, {section: None})
+    return write_response(created, 201)
+
+
+def update_item(event, tenant, section, item_id):
+    """PUT /portfolio/{section}/{itemId}: update one project or experience entry"""
+    require_tenant_admin(db, event, tenant)
+    list_section(section)
+
+    changes = entry_fields(json.loads(event.get('body') or '{}'))
+    changes.pop('id', None)
+    if not changes:
+        raise ValidationError("No changes given")
+
+    updated = db.update_portfolio_item(tenant, section, item_id, changes)
+    if updated is None:
+        raise NotFoundError("Portfolio item not found")
+    refresh_section_caches(tenant, {section: None})
+    return write_response(updated)
+
+
+def delete_item(event, tenant, section, item_id):
+    """DELETE /portfolio/{section}/{itemId}: remove one project or experience entry"""
+    require_tenant_admin(db, event, tenant)
+    list_section(section)
+
+    deleted = db.delete_portfolio_item(tenant, section, item_id)
+    if deleted is None:
+        raise NotFoundError("Portfolio item not found")
+    refresh_section_caches(tenant, {section: None})
+    return write_response({'id': item_id, 'deleted': True})
+
+
+def list_section(section):
+    if section not in PORTFOLIO_LIST_SECTIONS:
+        raise NotFoundError("Unknown portfolio section")
+
+
+def entry_fields(entry):
+    """A project/experience entry from a request body, without key or bookkeeping attributes"""
+    if not isinstance(entry, dict):
+        raise ValidationError("Each entry must be an object")
+    order = entry.get('sort_order', 0)
+    if not isinstance(order, (int, float)) or isinstance(order, bool):
+        raise ValidationError("sort_order must be a number")
+    return {key: value for key, value in entry.items() if key not in INTERNAL_KEYS and key != 'updated_at'}
+
+
+def refresh_section_caches(tenant, sections):
+    """
+    After a write: store the new value of a profile/about section in the
+    tenant's cache hash (so the next read is a hit), drop the others (value
+    None) to be rebuilt by the next read, and bump the tenant's version
+    """
+    refresh = {
+        PORTFOLIO_SECTION_FIELDS[section]: value for section, value in sections.items()
+        if CACHE_WRITE_THROUGH and section not in PORTFOLIO_LIST_SECTIONS and value is not None
+    }
+    drop = [PORTFOLIO_SECTION_FIELDS[section] for section in sections if PORTFOLIO_SECTION_FIELDS[section] not in refresh]
+    redis_client.apply_cache_changes(
+        {}, [], [tenant_version_key(tenant)], ttl=PORTFOLIO_CACHE_TTL,
+        hashes={tenant_cache_key(tenant): refresh} if refresh else None,
+        drop_fields={tenant_cache_key(tenant): drop}
+    )
+
+
+def write_response(data, status_code=200):
     return {
-        'statusCode': 200,
+        'statusCode': status_code,
         'headers': {
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*',
@@ -139,6 +235,6 @@ def update_portfolio(event):
         },
         'body': json.dumps({
             'success': True,
-            'data': updated
+            'data': data
         })
     }
@@ -0,0 +1,46 @@
+"""Scheduled promoter: publishes scheduled blogs whose time has come"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.dynamodb import DynamoDBClient
+from db.redis import RedisClient
+from db.models import get_timestamp
+from handlers.blogs_utils import write_through_blog_caches
+
+
+db = DynamoDBClient()
+redis_client = RedisClient()
+
+
+def publish_handler(event, context):
+    """Scheduled: publish every due scheduled blog"""
+    try:
+        published = publish_due_blogs()
+        print(f"Published {published} scheduled blogs")
+        return {'published': published}
+    except Exception as e:
+        print(f"Error publishing scheduled blogs: {str(e)}")
+        raise
+
+
+def publish_due_blogs(now=None):
+    """
+    Publish due blogs; returns how many were published.
+
+    Due posts are read from the sparse scheduled index. Each one is moved into
+    the list index by a conditional update, so overlapping runs cannot publish
+    a post twice. Caches for the whole batch are refreshed in one round trip.
+    """
+    now = now if now is not None else get_timestamp()
+    changes = []
+    for blog_id in db.get_due_blog_ids(now):
+        blog = db.publish_scheduled_blog(blog_id, now)
+        if blog:
+            changes.append((blog, {**blog, 'status': 'scheduled'}))
+
+    if changes:
+        write_through_blog_caches(db, redis_client, changes)
+    return len(changes)
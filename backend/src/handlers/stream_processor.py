@@ -0,0 +1,177 @@
+"""DynamoDB Streams consumer: keeps Redis caches and derived items in step with the table"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.codec import from_item
+from db.dynamodb import (
+    DynamoDBClient, BLOG_PREFIX, LIKE_PREFIX, PORTFOLIO_PREFIX, COMMENT_PREFIX,
+    METADATA_SK, ARCHIVE_SK, BLOG_SUMMARY_FIELDS, PORTFOLIO_LIST_SECTIONS, archive_month, portfolio_section_of,
+    portfolio_section_value
+)
+from db.redis import RedisClient, BLOG_PAGES_KEY, PORTFOLIO_SECTION_FIELDS, tenant_cache_key, tenant_version_key
+from handlers.blogs_utils import (
+    LIST_PAGE_SIZE, ARCHIVE_CACHE_KEY, ARCHIVE_VERSION_KEY, BLOG_LIST_VERSION_KEY,
+    blog_cache_key, blog_fields_key, slug_cache_key, list_page_field,
+    blog_cache_entries, is_listed
+)
+
+
+db = DynamoDBClient()
+redis_client = RedisClient()
+
+
+class CacheChanges:
+    """Cache writes collected across a batch and applied in one pipeline; the last change to a key wins"""
+
+    def __init__(self):
+        self.refresh = {}
+        self.delete = set()
+        self.bump = set()
+        self.fields = {}
+        self.dropped_fields = {}
+        self.list_changed = False
+
+    def set(self, key, value):
+        self.delete.discard(key)
+        self.refresh[key] = value
+
+    def drop(self, key):
+        self.refresh.pop(key, None)
+        self.delete.add(key)
+
+    def set_field(self, key, field, value):
+        self.dropped_fields.get(key, set()).discard(field)
+        self.fields.setdefault(key, {})[field] = value
+
+    def drop_field(self, key, field):
+        self.fields.get(key, {}).pop(field, None)
+        self.dropped_fields.setdefault(key, set()).add(field)
+
+    def bump_version(self, key):
+        self.bump.add(key)
+
+    def flush(self):
+        hashes = {key: fields for key, fields in self.fields.items() if fields}
+        if self.list_changed:
+            # Drop every list page and rebuild the first once per batch instead of leaving a cold miss
+            self.drop(BLOG_PAGES_KEY)
+            try:
+                hashes[BLOG_PAGES_KEY] = {list_page_field(LIST_PAGE_SIZE): db.get_blog_ids(limit=LIST_PAGE_SIZE)}
+            except Exception as e:
+                print(f"Error rebuilding blog list cache: {str(e)}")
+        return redis_client.apply_cache_changes(
+            self.refresh, sorted(self.delete), sorted(self.bump), hashes=hashes,
+            drop_fields={key: sorted(fields) for key, fields in self.dropped_fields.items() if fields}
+        )
+
+
+def lambda_handler(event, context):
+    """
+    Process a batch of stream records in order.
+
+    Every action is idempotent (cache writes, archive entry puts,
+    marker-guarded counters), so a retried batch is safe. On failure the
+    record's sequence number is reported through ReportBatchItemFailures, so
+    Lambda checkpoints everything before it and retries from there.
+    """
+    records = event.get('Records', [])
+    cache = CacheChanges()
+    failures = []
+
+    for record in records:
+        try:
+            process_record(record, cache)
+        except Exception as e:
+            print(f"Error processing stream record {record.get('eventID')}: {str(e)}")
+            failures.append({'itemIdentifier': record['dynamodb']['SequenceNumber']})
+            break
+
+    if not cache.flush() and records:
+        # Redis missed this batch's cache changes: retry it whole (every action is idempotent)
+        failures = [{'itemIdentifier': records[0]['dynamodb']['SequenceNumber']}]
+    return {'batchItemFailures': failures}
+
+
+def process_record(record, cache):
+    """Route one change record by its key shape"""
+    change = record['dynamodb']
+    keys = from_item(change['Keys'], drop=())
+    pk, sk = keys.get('PK', ''), keys.get('SK', '')
+    new = from_item(change['NewImage']) if 'NewImage' in change else None
+    old = from_item(change['OldImage']) if 'OldImage' in change else None
+
+    if pk.startswith(BLOG_PREFIX) and sk == METADATA_SK:
+        handle_blog_change(record, pk[len(BLOG_PREFIX):], old, new, cache)
+    elif pk.startswith(BLOG_PREFIX) and sk.startswith(COMMENT_PREFIX):
+        blog_id = pk[len(BLOG_PREFIX):]
+        cache.bump_version(f"comments:{blog_id}:version")
+    elif pk.startswith(LIKE_PREFIX):
+        # PK=LIKE#{blogId}#{timestamp}:{ipHash}
+        blog_id = pk[len(LIKE_PREFIX):].rsplit('#', 1)[0]
+        cache.drop(f"likes_count:{blog_id}")
+    elif pk.startswith(PORTFOLIO_PREFIX) and portfolio_section_of(sk):
+        tenant, section = pk[len(PORTFOLIO_PREFIX):], portfolio_section_of(sk)
+        # A list section is one entry per item, so it is rebuilt on the next read
+        if section in PORTFOLIO_LIST_SECTIONS or new is None:
+            cache.drop_field(tenant_cache_key(tenant), PORTFOLIO_SECTION_FIELDS[section])
+        else:
+            value = portfolio_section_value(section, [new])
+            cache.set_field(tenant_cache_key(tenant), PORTFOLIO_SECTION_FIELDS[section], value)
+        cache.bump_version(tenant_version_key(tenant))
+    # Anything else (derived items, markers, view aggregates, users) needs no follow-up
+
+
+def blog_summary(blog):
+    return {field: blog[field] for field in BLOG_SUMMARY_FIELDS if field in blog}
+
+
+def archive_position(blog):
+    """(month, published_at) of a listed blog's archive entry, or None"""
+    if not is_listed(blog):
+        return None
+    published_at = blog.get('published_at') or blog['created_at']
+    return archive_month(published_at), published_at
+
+
+def handle_blog_change(record, blog_id, old, new, cache):
+    """Refresh blog caches and the blog's archive entry and month counts"""
+
+    # Entity cache: refresh from the new image rather than waiting for a miss
+    if new is not None:
+        for key, value in blog_cache_entries(new).items():
+            cache.set(key, value)
+    else:
+        cache.drop(blog_cache_key(blog_id))
+    cache.drop(blog_fields_key(blog_id))
+    if old is not None and old.get('slug') and (new is None or new.get('slug') != old['slug']):
+        cache.drop(slug_cache_key(old['slug']))
+    # List pages hold IDs only, so just membership changes touch them
+    if is_listed(old) != is_listed(new):
+        cache.list_changed = True
+
+    # Composed list responses and archive entries hold the list fields
+    summary = blog_summary(new) if new is not None else None
+    summary_changed = old is None or new is None or blog_summary(old) != summary
+    if summary_changed and (is_listed(old) or is_listed(new)):
+        # Likes land here too (they ADD likes_count), so composed list responses refresh with them
+        cache.bump_version(BLOG_LIST_VERSION_KEY)
+
+    # Archive entry: moved when the publish month/time or listed-ness changes
+    before, after = archive_position(old), archive_position(new)
+    if before != after:
+        month_deltas = {}
+        if before is not None:
+            db.delete_archive_entry(blog_id, before[1])
+            month_deltas[before[0]] = month_deltas.get(before[0], 0) - 1
+        if after is not None:
+            db.put_archive_entry({**summary, 'published_at': after[1]})
+            month_deltas[after[0]] = month_deltas.get(after[0], 0) + 1
+        db.apply_counters_once(record['eventID'], {ARCHIVE_SK: month_deltas})
+        cache.drop(ARCHIVE_CACHE_KEY)
+    elif after is not None and summary_changed:
+        db.put_archive_entry({**summary, 'published_at': after[1]})
+    if before != after or (after is not None and summary_changed):
+        cache.bump_version(ARCHIVE_VERSION_KEY)
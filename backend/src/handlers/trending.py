@@ -0,0 +1,66 @@
+"""Scheduled rebuild of the trending blogs sorted set from DynamoDB"""
+import sys
+import os
+import time
+from datetime import datetime, timezone
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.dynamodb import DynamoDBClient
+from db.redis import RedisClient
+from utils.trending import LIKE_WEIGHT, VIEW_WEIGHT, REBUILD_WINDOW_DAYS, decayed
+
+
+db = DynamoDBClient()
+redis_client = RedisClient()
+
+
+def rebuild_handler(event, context):
+    """Recompute every trending score against a fresh epoch"""
+    try:
+        count = rebuild_trending()
+        print(f"Rebuilt trending scores for {count} blogs")
+        return {'blogs': count}
+    except Exception as e:
+        print(f"Error rebuilding trending: {str(e)}")
+        raise
+
+
+def _bucket_midpoint(period, fmt, length, now):
+    """Representative timestamp for a day/hour bucket, never in the future"""
+    start = datetime.strptime(period, fmt).replace(tzinfo=timezone.utc).timestamp()
+    return min(start + length / 2, now)
+
+
+def rebuild_trending(now=None):
+    """
+    Score each blog from its likes and views inside the rebuild window.
+
+    DynamoDB is the source of truth: raw like items (GSI3) and daily view
+    aggregates. Hour buckets the analytics flusher has not written yet are
+    read from Redis so recent views are not dropped.
+    """
+    now = now or time.time()
+    since = now - REBUILD_WINDOW_DAYS * 24 * 60 * 60
+    start_day = datetime.fromtimestamp(since, timezone.utc).strftime('%Y%m%d')
+    end_day = datetime.fromtimestamp(now, timezone.utc).strftime('%Y%m%d')
+
+    scores = {}
+    listed = set()
+    for blog in db.iter_blogs(('blogId',)):
+        blog_id = blog['blogId']
+        listed.add(blog_id)
+        score = sum(decayed(LIKE_WEIGHT, ts, now) for ts in db.get_like_timestamps(blog_id, int(since)))
+        for row in db.get_view_series(blog_id, 'D', start_day, end_day):
+            score += decayed(VIEW_WEIGHT * row.get('views', 0), _bucket_midpoint(row['period'], '%Y%m%d', 86400, now), now)
+        if score > 0:
+            scores[blog_id] = score
+
+    unflushed = redis_client.get_dirty_view_buckets()
+    for (blog_id, hour), views in zip(unflushed, redis_client.read_view_buckets(unflushed)):
+        if blog_id in listed and views:
+            scores[blog_id] = scores.get(blog_id, 0) + decayed(VIEW_WEIGHT * views, _bucket_midpoint(hour, '%Y%m%d%H', 3600, now), now)
+
+    redis_client.replace_trending(scores, now)
+    return len(scores)
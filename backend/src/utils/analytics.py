@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from .errors import ValidationError
+
+
+# Rollup granularities: API name -> (storage code, period format, display format)
+GRANULARITIES = {
+    'day': ('D', '%Y%m%d', '%Y-%m-%d'),
+    'month': ('M', '%Y%m', '%Y-%m'),
+}
+DEFAULT_SPANS = {'day': 30, 'month': 12}
+MAX_SPANS = {'day': 366, 'month': 120}
+
+
+def hour_bucket(timestamp: Optional[float] = None) -> str:
+    """UTC hour bucket (YYYYMMDDHH) for a timestamp, default now"""
+    moment = datetime.fromtimestamp(timestamp, timezone.utc) if timestamp is not None else datetime.now(timezone.utc)
+    return moment.strftime('%Y%m%d%H')
+
+
+def _step(moment: datetime, granularity: str, periods: int = 1) -> datetime:
+    """Move a period start forward (or backward, with negative periods)"""
+    if granularity == 'day':
+        return moment + timedelta(days=periods)
+    year, month = divmod(moment.year * 12 + moment.month - 1 + periods, 12)
+    return moment.replace(year=year, month=month + 1)
+
+
+def _span(granularity: str, start: datetime, end: datetime) -> int:
+    if granularity == 'day':
+        return (end - start).days + 1
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+
+def parse_range(granularity: str, start: Optional[str], end: Optional[str]):
+    """Validate a ?granularity=&from=&to= range; returns (start, end) datetimes"""
+    if granularity not in GRANULARITIES:
+        raise ValidationError("granularity must be 'day' or 'month'")
+    display = GRANULARITIES[granularity][2]
+
+    try:
+        end_dt = datetime.strptime(end, display) if end else None
+        start_dt = datetime.strptime(start, display) if start else None
+    except ValueError:
+        raise ValidationError("from/to must be formatted " + ('YYYY-MM-DD' if granularity == 'day' else 'YYYY-MM'))
+
+    if end_dt is None:
+        end_dt = datetime.strptime(datetime.now(timezone.utc).strftime(display), display)
+    if start_dt is None:
+        start_dt = _step(end_dt, granularity, 1 - DEFAULT_SPANS[granularity])
+    if start_dt > end_dt:
+        raise ValidationError("from must not be after to")
+    if _span(granularity, start_dt, end_dt) > MAX_SPANS[granularity]:
+        raise ValidationError(f"Range may cover at most {MAX_SPANS[granularity]} {granularity}s")
+    return start_dt, end_dt
+
+
+def fill_series(granularity: str, start: datetime, end: datetime, rows: List[Dict]) -> List[Dict]:
+    """Dense series over [start, end], zero-filling periods with no aggregate item"""
+    _, period_format, display = GRANULARITIES[granularity]
+    by_period = {row['period']: row for row in rows}
+
+    series = []
+    moment = start
+    while moment <= end:
+        row = by_period.get(moment.strftime(period_format), {})
+        series.append({
+            'period': moment.strftime(display),
+            'views': row.get('views', 0),
+            'uniques': row.get('uniques', 0)
+        })
+        moment = _step(moment, granularity)
+    return series
@@ -0,0 +1,99 @@
+"""
+Circuit breaker for a dependency the caller can do without.
+
+After `threshold` consecutive failures the circuit opens. Calls then fail fast
+with CircuitOpenError for `cooldown` seconds, with no network round trip.
+After that a single probe call is let through (half-open): success closes the
+circuit, failure re-opens it for another cooldown.
+"""
+import time
+import threading
+from typing import Callable, Tuple, Type
+
+from .metrics import emit_metrics
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the dependency while its circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Guards calls to one dependency; use as a context manager around each call.
+
+    Only exceptions in trip_on count as failures. Other errors (bad arguments,
+    wrong key types) show that the dependency answered, so they count as success.
+    """
+
+    def __init__(self, name: str, threshold: int = 3, cooldown: float = 30.0,
+                 trip_on: Tuple[Type[BaseException], ...] = (Exception,),
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.trip_on = trip_on
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.stats = {'failures': 0, 'short_circuits': 0, 'fallback_hits': 0}
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (claims the probe when half-open)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.stats['failures'] += 1
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.threshold):
+                self.opened_at = self.clock()
+                self._transition(OPEN)
+
+    def _transition(self, state: str):
+        """Change state and report the calls skipped or served from fallbacks since the last change"""
+        self.state = state
+        emit_metrics({
+            f'CircuitState_{state}': 1,
+            'ShortCircuits': self.stats['short_circuits'],
+            'FallbackHits': self.stats['fallback_hits'],
+            'Failures': self.stats['failures'],
+        }, Dependency=self.name)
+        self.stats.update(short_circuits=0, fallback_hits=0, failures=0)
+        print(f"{self.name} circuit {state}")
+
+    def __enter__(self):
+        if not self.allow():
+            self.stats['short_circuits'] += 1
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and issubclass(exc_type, self.trip_on):
+            self.record_failure()
+        else:
+            self.record_success()
+        return False
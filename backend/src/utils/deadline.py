@@ -0,0 +1,49 @@
+"""
+Per-request deadline derived from the Lambda context.
+
+A Lambda container serves one request at a time, so the deadline is module
+state: handlers call start() on entry, and data-access code asks remaining()
+how long it may still wait. Outside Lambda (local runs, scripts) no deadline
+is set and remaining() returns None.
+"""
+import os
+import time
+from typing import Optional
+
+from .errors import APIError
+
+
+# Time kept back for building and returning the response after the last read
+RESERVE_SECONDS = float(os.environ.get('DEADLINE_RESERVE_MS', '500')) / 1000
+
+_deadline = None
+
+
+class DeadlineExceededError(APIError):
+    """The request ran out of time before its data arrived"""
+    def __init__(self, message="Request timed out, please retry"):
+        super().__init__(message, 503)
+
+
+def start(context):
+    """Begin a request's budget from context.get_remaining_time_in_millis()"""
+    global _deadline
+    remaining_ms = getattr(context, 'get_remaining_time_in_millis', None)
+    if remaining_ms is None:
+        _deadline = None
+        return
+    _deadline = time.monotonic() + remaining_ms() / 1000 - RESERVE_SECONDS
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current request's budget (None when unbounded)"""
+    if _deadline is None:
+        return None
+    return _deadline - time.monotonic()
+
+
+def check():
+    """Raise DeadlineExceededError if the budget is spent"""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError()
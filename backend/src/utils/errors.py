@@ -12,6 +12,12 @@ class ValidationError(APIError):
         super().__init__(message, 400)
 
 
+class SlugTakenError(ValidationError):
+    """Slug already reserved by another blog"""
+    def __init__(self, message="A blog with this slug already exists"):
+        super().__init__(message)
+
+
 class NotFoundError(APIError):
     """Resource not found error"""
     def __init__(self, message="Resource not found"):
@@ -30,17 +36,27 @@ class ForbiddenError(APIError):
         super().__init__(message, 403)
 
 
+class RateLimitedError(APIError):
+    """Too many requests; retry_after is in whole seconds"""
+    def __init__(self, retry_after, message="Too many requests, please slow down"):
+        super().__init__(message, 429)
+        self.retry_after = retry_after
+
+
 def error_response(error):
     """Convert exception to API Gateway response"""
     import json
+    headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
+    }
+    if isinstance(error, RateLimitedError):
+        headers['Retry-After'] = str(error.retry_after)
     return {
         'statusCode': error.status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
-        },
+        'headers': headers,
         'body': json.dumps({
             'error': error.message
         })
@@ -0,0 +1,29 @@
+from .errors import ValidationError
+
+
+def parse_fields(value, allowed, always=()):
+    """
+    Parse a sparse fieldset query parameter ("a,b,c") into a sorted tuple.
+
+    Returns None when absent (the whole item). Unknown names are rejected;
+    `always` fields (identity, visibility) are added to every fieldset.
+    """
+    if not value:
+        return None
+    fields = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = sorted(fields - set(allowed))
+    if unknown:
+        raise ValidationError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return tuple(sorted(fields | set(always)))
+
+
+def project(item, fields):
+    """An item cut down to a fieldset (unchanged when fields is None)"""
+    if item is None or fields is None:
+        return item
+    return {field: item[field] for field in fields if field in item}
+
+
+def fieldset_key(fields):
+    """Cache key fragment for a fieldset"""
+    return ','.join(fields)
@@ -0,0 +1,93 @@
+"""
+Hedged requests for idempotent reads.
+
+A read that has not answered by the recent p95 latency is most likely stuck
+behind a slow node or connection. A duplicate sent then usually lands on a
+healthy one, and whichever answers first wins. That costs about 5% extra
+reads and cuts the tail to roughly p95 plus one typical latency.
+"""
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Optional
+
+from . import deadline
+from .deadline import DeadlineExceededError
+
+
+HEDGE_PERCENTILE = float(os.environ.get('HEDGE_PERCENTILE', '95')) / 100
+# Bounds on the hedge delay, and the delay used until enough samples exist
+MIN_HEDGE_DELAY = 0.005
+MAX_HEDGE_DELAY = 1.0
+DEFAULT_HEDGE_DELAY = 0.05
+MIN_SAMPLES = 20
+
+# Shared by every hedged call in the process; each call uses at most two workers
+_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('HEDGE_WORKERS', '8')))
+
+
+class LatencyTracker:
+    """Rolling window of call latencies, in seconds"""
+
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            if len(self.samples) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    def hedge_delay(self) -> float:
+        observed = self.percentile(HEDGE_PERCENTILE)
+        if observed is None:
+            return DEFAULT_HEDGE_DELAY
+        return min(max(observed, MIN_HEDGE_DELAY), MAX_HEDGE_DELAY)
+
+
+def hedged_call(call: Callable, tracker: LatencyTracker, stats: Optional[dict] = None):
+    """
+    Run call(), sending one duplicate if it is slower than the tracker's hedge
+    delay. Returns the first successful result. Raises the error when every
+    attempt fails, and DeadlineExceededError when the request budget runs out
+    first. The losing attempt is left to finish in the background.
+    """
+    def timed():
+        started = time.perf_counter()
+        try:
+            return call()
+        finally:
+            tracker.record(time.perf_counter() - started)
+
+    deadline.check()
+    budget = deadline.remaining()
+    pending = {_executor.submit(timed)}
+
+    delay = tracker.hedge_delay()
+    done, pending = wait(pending, timeout=delay if budget is None else min(delay, budget))
+    if not done:
+        deadline.check()
+        if stats is not None:
+            stats['hedges'] = stats.get('hedges', 0) + 1
+        pending.add(_executor.submit(timed))
+
+    error = None
+    while True:
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+        if not pending:
+            raise error
+        budget = deadline.remaining()
+        if budget is not None and budget <= 0:
+            raise DeadlineExceededError()
+        done, pending = wait(pending, timeout=budget, return_when=FIRST_COMPLETED)
@@ -0,0 +1,118 @@
+"""Responsive image variant generation"""
+import io
+import os
+import re
+import base64
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageOps, features
+
+
+VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+PLACEHOLDER_WIDTH = 16
+CONTENT_TYPES = {'webp': 'image/webp', 'avif': 'image/avif'}
+QUALITY = {'webp': 80, 'avif': 60}
+
+IMG_SRC_PATTERN = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def output_formats() -> Tuple[str, ...]:
+    """Formats the installed Pillow build can encode (AVIF needs libavif)"""
+    if features.check('avif'):
+        return ('avif', 'webp')
+    return ('webp',)
+
+
+def extract_image_urls(blog: Dict) -> List[str]:
+    """Featured image followed by in-content images, de-duplicated in order"""
+    urls = []
+    featured = blog.get('featured_image_url')
+    if featured:
+        urls.append(featured)
+    urls.extend(IMG_SRC_PATTERN.findall(blog.get('content', '') or ''))
+
+    unique = []
+    for url in urls:
+        if not url.startswith('data:') and url not in unique:
+            unique.append(url)
+    return unique
+
+
+def variant_prefix(url: str, original_key: Optional[str], blog_id: str) -> str:
+    """Storage prefix for a source image's variants, next to the original when we host it"""
+    if original_key:
+        return os.path.splitext(original_key)[0]
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+    return f'blogs/{blog_id}/images/{digest}'
+
+
+def render_variants(source: bytes, formats: Tuple[str, ...]) -> Dict:
+    """
+    Decode one image and encode all its variants.
+
+    Runs in a worker process, so it only takes and returns picklable values.
+    """
+    with Image.open(io.BytesIO(source)) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+        width, height = img.size
+
+        widths = [w for w in VARIANT_WIDTHS if w < width] + [width]
+        encoded = {}
+        for w in sorted(set(widths)):
+            resized = img if w == width else img.resize((w, round(height * w / width)), Image.LANCZOS)
+            for fmt in formats:
+                buf = io.BytesIO()
+                resized.save(buf, format=fmt.upper(), quality=QUALITY[fmt])
+                encoded[(fmt, w)] = buf.getvalue()
+
+        tiny = img.resize((PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))), Image.BILINEAR)
+        buf = io.BytesIO()
+        tiny.save(buf, format='WEBP', quality=30)
+        placeholder = 'data:image/webp;base64,' + base64.b64encode(buf.getvalue()).decode('ascii')
+
+    return {
+        'width': width,
+        'height': height,
+        'placeholder': placeholder,
+        'encoded': encoded
+    }
+
+
+def render_or_none(source: bytes, formats: Tuple[str, ...]) -> Optional[Dict]:
+    """render_variants that reports undecodable images as None instead of failing the batch"""
+    try:
+        return render_variants(source, formats)
+    except Exception as e:
+        print(f"Error rendering image variants: {str(e)}")
+        return None
+
+
+def render_all(sources: List[bytes], formats: Tuple[str, ...]) -> List[Optional[Dict]]:
+    """Render variants for many images in a process pool, serially if processes are unavailable"""
+    if len(sources) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(len(sources), os.cpu_count() or 1)) as pool:
+                return list(pool.map(render_or_none, sources, [formats] * len(sources)))
+        except (OSError, NotImplementedError) as e:
+            # AWS Lambda has no /dev/shm, so multiprocessing queues cannot be created there
+            print(f"Process pool unavailable, rendering serially: {str(e)}")
+    return [render_or_none(source, formats) for source in sources]
+
+
+def store_variants(store, prefix: str, rendered: Dict) -> Dict:
+    """Upload rendered variants and build the srcset-ready entry for a blog record"""
+    srcset = {}
+    for (fmt, width), data in sorted(rendered['encoded'].items()):
+        url = store.put(f'{prefix}-{width}w.{fmt}', data, CONTENT_TYPES[fmt])
+        srcset.setdefault(fmt, []).append(f'{url} {width}w')
+
+    return {
+        'width': rendered['width'],
+        'height': rendered['height'],
+        'placeholder': rendered['placeholder'],
+        'srcset': {fmt: ', '.join(entries) for fmt, entries in srcset.items()}
+    }
@@ -1,6 +1,10 @@
 import os
 import jwt
 import time
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from .errors import UnauthorizedError
 
@@ -10,9 +14,25 @@ JWT_ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRY = 15 * 60  # 15 minutes
 REFRESH_TOKEN_EXPIRY = 7 * 24 * 60 * 60  # 7 days
 
+# Verified access token claims kept per container, keyed by token digest, so a burst of
+# admin requests with the same token decodes it once (0 disables)
+CLAIMS_CACHE_SIZE = int(os.environ.get('JWT_CLAIMS_CACHE_SIZE', '128'))
+_claims_cache = OrderedDict()
+_claims_lock = threading.Lock()
 
-def generate_tokens(email):
-    """Generate access and refresh tokens"""
+
+def new_token_id():
+    """Random ID for a refresh token or token family"""
+    return uuid.uuid4().hex
+
+
+def generate_tokens(email, family_id=None, token_id=None):
+    """
+    Generate access and refresh tokens.
+
+    A refresh token carries its family (one per login) and its own ID, which
+    the refresh endpoint checks against the family's current one.
+    """
     now = datetime.utcnow()
     
     access_token_payload = {
@@ -28,6 +48,9 @@ def generate_tokens(email):
         'exp': now + timedelta(seconds=REFRESH_TOKEN_EXPIRY),
         'iat': now
     }
+    if family_id:
+        refresh_token_payload['fid'] = family_id
+        refresh_token_payload['jti'] = token_id
     
     access_token = jwt.encode(access_token_payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
     refresh_token = jwt.encode(refresh_token_payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
@@ -41,6 +64,38 @@ def generate_tokens(email):
 
 def verify_token(token, token_type='access'):
     """Verify and decode JWT token"""
+    if token_type == 'access':
+        return _verify_access_token(token)
+    return _decode_token(token, token_type)
+
+
+def _verify_access_token(token):
+    """verify_token for access tokens, through the claims cache; a hit still honours exp"""
+    if CLAIMS_CACHE_SIZE <= 0:
+        return _decode_token(token, 'access')
+    digest = hashlib.sha256(token.encode()).digest()
+    with _claims_lock:
+        payload = _claims_cache.get(digest)
+        if payload is not None:
+            _claims_cache.move_to_end(digest)
+    if payload is not None:
+        if payload['exp'] > time.time():
+            return payload
+        with _claims_lock:
+            _claims_cache.pop(digest, None)
+        raise UnauthorizedError("Token has expired")
+
+    # Only tokens that verified are cached; failures are decoded (and rejected) every time
+    payload = _decode_token(token, 'access')
+    with _claims_lock:
+        _claims_cache[digest] = payload
+        if len(_claims_cache) > CLAIMS_CACHE_SIZE:
+            _claims_cache.popitem(last=False)
+    return payload
+
+
+def _decode_token(token, token_type):
+    """Check a token's signature, expiry and type"""
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         
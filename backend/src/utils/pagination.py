@@ -0,0 +1,56 @@
+import json
+import base64
+from .errors import ValidationError
+
+
+def encode_cursor(value):
+    """Encode a pagination position as an opaque URL-safe token"""
+    if value is None:
+        return None
+    raw = json.dumps(value, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a token produced by encode_cursor"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        raise ValidationError("Invalid cursor")
+
+
+def decode_key_cursor(token, prefixes, exact=None):
+    """
+    Decode a cursor holding a DynamoDB key of string attributes; anything a Query
+    could not have returned as LastEvaluatedKey is a 400 rather than a failed Query.
+    `prefixes` maps attributes to the prefix their value starts with, `exact` to their value.
+    """
+    key = decode_cursor(token)
+    if key is None:
+        return None
+    exact = exact or {}
+    if not isinstance(key, dict) or set(key) != set(prefixes) | set(exact):
+        raise ValidationError("Invalid cursor")
+    if any(not isinstance(value, str) for value in key.values()):
+        raise ValidationError("Invalid cursor")
+    if any(not key[attr].startswith(prefix) for attr, prefix in prefixes.items()):
+        raise ValidationError("Invalid cursor")
+    if any(key[attr] != value for attr, value in exact.items()):
+        raise ValidationError("Invalid cursor")
+    return key
+
+
+def parse_limit(value, default, maximum):
+    """Parse a page size query parameter"""
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError("limit must be an integer")
+    if limit < 1:
+        raise ValidationError("limit must be positive")
+    return min(limit, maximum)
@@ -0,0 +1,85 @@
+"""
+Token-bucket rate limits for expensive routes (login's bcrypt, likes' transaction).
+
+A limit is "N/S": a bucket of N tokens refilled at N per S seconds, so a
+client may burst N requests and then sustain N every S seconds. Buckets live
+in Redis, where one Lua script refills and takes atomically across every
+Lambda container. Callers are identified by a hash of the IP, email or
+tenant, so raw identifiers never reach Redis. While Redis is unavailable each
+container falls back to its own in-memory buckets. That is looser than the
+shared limit, but it is never unlimited.
+"""
+import os
+import math
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .errors import RateLimitedError
+
+
+# Buckets kept per container for the local fallback (least recently used dropped first)
+LOCAL_BUCKETS = int(os.environ.get('RATE_LIMIT_LOCAL_BUCKETS', '1024'))
+
+
+def parse_limit_spec(spec: str) -> Optional[Tuple[float, float]]:
+    """'N/S' -> (capacity N, refill rate N/S per second); '' or 'off' -> None (no limit)"""
+    spec = (spec or '').strip().lower()
+    if spec in ('', 'off'):
+        return None
+    count, _, seconds = spec.partition('/')
+    capacity, period = float(count), float(seconds or 1)
+    if capacity <= 0 or period <= 0:
+        raise ValueError(f"Invalid rate limit: {spec}")
+    return capacity, capacity / period
+
+
+class RateLimiter:
+    """One named limit, e.g. RateLimiter(redis_client, 'login-ip', '10/60')"""
+
+    def __init__(self, redis_client, name: str, spec: str, clock=time.time):
+        self.redis = redis_client
+        self.name = name
+        self.limit = parse_limit_spec(spec)
+        self.clock = clock
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, identity: str, cost: float = 1):
+        """Take a token for this caller, or raise RateLimitedError (429) with Retry-After"""
+        if self.limit is None or not identity:
+            return
+        allowed, wait = self._take(identity, cost)
+        if not allowed:
+            raise RateLimitedError(max(1, math.ceil(wait)))
+
+    def refund(self, identity: str, cost: float = 1):
+        """Give back tokens taken by check, for a request that should not count against the caller"""
+        if self.limit is None or not identity:
+            return
+        self._take(identity, -cost)
+
+    def _take(self, identity: str, cost: float) -> Tuple[bool, float]:
+        """Run the bucket in Redis, or in process while Redis is unavailable"""
+        capacity, rate = self.limit
+        digest = hashlib.sha256(f"{self.name}:{identity}".encode()).hexdigest()[:32]
+        now = self.clock()
+
+        result = self.redis.take_token(f"ratelimit:{self.name}:{digest}", capacity, rate, now, cost)
+        if result is None:
+            result = self._take_local(digest, capacity, rate, now, cost)
+        return result
+
+    def _take_local(self, digest: str, capacity: float, rate: float, now: float, cost: float) -> Tuple[bool, float]:
+        """The token bucket script's logic on an in-process bucket"""
+        with self._lock:
+            tokens, updated = self._local.pop(digest, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+            allowed = tokens >= cost
+            wait = 0.0 if allowed else (cost - tokens) / rate
+            self._local[digest] = (min(capacity, tokens - cost) if allowed else tokens, now)
+            if len(self._local) > LOCAL_BUCKETS:
+                self._local.popitem(last=False)
+        return allowed, wait
@@ -0,0 +1,64 @@
+"""
+Tenant resolution: which hosted portfolio a request is for.
+
+A request names its tenant by path (/t/{tenant}/...), or by the site it
+comes from: the Origin header (the browser's page, since the API has its
+own domain) or else the Host header (a custom domain mapped straight to the
+API). Hosts map to tenants through TENANT_DOMAINS ("alice.dev=alice,...")
+or as subdomains of TENANT_BASE_DOMAIN (alice.example.com -> alice).
+Anything else is the default tenant, the single portfolio of old.
+"""
+import os
+import re
+from urllib.parse import urlparse
+
+from .errors import ValidationError
+
+
+DEFAULT_TENANT = 'default'
+# Lowercase DNS label, so any tenant can also be served as a subdomain
+TENANT_PATTERN = re.compile(r'^[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?$')
+
+TENANT_DOMAINS = {
+    host.strip().lower(): tenant.strip().lower()
+    for host, _, tenant in (
+        entry.partition('=') for entry in os.environ.get('TENANT_DOMAINS', '').split(',') if '=' in entry
+    )
+}
+TENANT_BASE_DOMAIN = os.environ.get('TENANT_BASE_DOMAIN', '').strip().lower()
+# Requests per hosted tenant across its routes ("N/S", see utils/rate_limit.py), so one busy portfolio
+# cannot starve the rest; the default tenant is not limited
+TENANT_RATE_LIMIT = os.environ.get('TENANT_RATE_LIMIT', '100/1')
+
+
+def admin_tenants(user):
+    """Tenants a user item may administer; an admin created without any manages the default portfolio"""
+    return user.get('tenants') or [DEFAULT_TENANT]
+
+
+def resolve_tenant(event):
+    """The request's tenant; an invalid name in the path is a 400"""
+    tenant = (event.get('pathParameters') or {}).get('tenant')
+    if tenant is None:
+        headers = {name.lower(): value for name, value in (event.get('headers') or {}).items()}
+        tenant = (
+            tenant_for_host(urlparse(headers.get('origin') or '').hostname)
+            or tenant_for_host(headers.get('host', '').split(':')[0])
+            or DEFAULT_TENANT
+        )
+    tenant = tenant.lower()
+    if not TENANT_PATTERN.match(tenant):
+        raise ValidationError("Invalid tenant")
+    return tenant
+
+
+def tenant_for_host(host):
+    """Tenant a hostname is mapped to, or None"""
+    host = (host or '').lower()
+    if host in TENANT_DOMAINS:
+        return TENANT_DOMAINS[host]
+    if TENANT_BASE_DOMAIN and host.endswith(f'.{TENANT_BASE_DOMAIN}'):
+        label = host[:-len(TENANT_BASE_DOMAIN) - 1]
+        if '.' not in label:
+            return label
+    return None
@@ -0,0 +1,23 @@
+"""
+Trending score model: exponentially decayed likes and views.
+
+Scores use forward decay. An event at time t adds weight * 2^((t - epoch) / HALF_LIFE)
+to its blog's score, relative to a fixed epoch. Older events then count for
+less without any score ever being rewritten, and ranking by score is ranking by
+decayed popularity. The periodic rebuild recomputes every score against a fresh
+epoch, which keeps the growing exponent bounded.
+"""
+import os
+
+
+HALF_LIFE_SECONDS = float(os.environ.get('TRENDING_HALF_LIFE_HOURS', '24')) * 60 * 60
+LIKE_WEIGHT = 5.0
+VIEW_WEIGHT = 1.0
+
+# How far back the rebuild reads likes and daily view aggregates
+REBUILD_WINDOW_DAYS = 14
+
+
+def decayed(weight: float, timestamp: float, epoch: float) -> float:
+    """Contribution of an event at timestamp, relative to epoch"""
+    return weight * 2 ** ((timestamp - epoch) / HALF_LIFE_SECONDS)
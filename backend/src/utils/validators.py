@@ -36,3 +36,25 @@ def validate_slug(slug):
     if not re.match(pattern, slug):
         raise ValidationError("Invalid slug format. Use lowercase letters, numbers, and hyphens only")
     return slug
+
+
+def validate_publication(status, published_at, now):
+    """
+    Validate a blog's status and published_at; returns the normalized pair.
+
+    A scheduled time that has already passed publishes immediately, and a
+    post published without a time is published now.
+    """
+    if status not in ('draft', 'scheduled', 'published'):
+        raise ValidationError("status must be 'draft', 'scheduled' or 'published'")
+    if published_at is not None and (isinstance(published_at, bool) or not isinstance(published_at, int)):
+        raise ValidationError("published_at must be a Unix timestamp in seconds")
+    if status == 'draft':
+        return status, None
+    if status == 'scheduled':
+        if published_at is None:
+            raise ValidationError("published_at is required to schedule a blog")
+        if published_at <= now:
+            return 'published', published_at
+        return status, published_at
+    return status, published_at if published_at is not None else now
@@ -20,8 +20,8 @@ export default function AdminDashboardPage() {
   const fetchStats = async () => {
     try {
       const [portfolioRes, blogsRes] = await Promise.all([
-        portfolioAPI.get(),
-        blogsAPI.getAll({ limit: 1 }),
+        portfolioAPI.get({ fields: 'projects,experience' }),
+        blogsAPI.getAll({ limit: 1, fields: 'blogId' }),
       ])
       
       setStats({
@@ -39,7 +39,7 @@ export default function EditExperiencePage() {
 
   const fetchExperience = async () => {
     try {
-      const response = await portfolioAPI.get()
+      const response = await portfolioAPI.get({ fields: 'experience' })
       setExperience(response.data.data.experience || [])
     } catch (err) {
       console.error('Error fetching experience:', err)
@@ -48,23 +48,9 @@ export default function EditExperiencePage() {
     }
   }
 
-  const handleSave = async () => {
-    setSaving(true)
-    try {
-      await portfolioAPI.update({ experience })
-      alert('Experience updated successfully!')
-      setEditingIndex(null)
-    } catch (err) {
-      console.error('Error saving experience:', err)
-      alert('Failed to save experience')
-    } finally {
-      setSaving(false)
-    }
-  }
-
   const handleAdd = () => {
+    // Saved (and given an id) on Update
     const newExp: Experience = {
-      id: Date.now().toString(),
       title: '',
       position: '',
       company: '',
@@ -84,20 +70,48 @@ export default function EditExperiencePage() {
     setFormData(experience[index])
   }
 
-  const handleUpdate = () => {
+  const handleUpdate = async () => {
     if (editingIndex === null) return
-    const updated = [...experience]
-    updated[editingIndex] = { ...formData }
-    setExperience(updated)
+    setSaving(true)
+    try {
+      const { id, ...data } = formData
+      const response = id
+        ? await portfolioAPI.updateItem('experience', id, data)
+        : await portfolioAPI.createItem('experience', data)
+      const updated = [...experience]
+      updated[editingIndex] = response.data.data
+      setExperience(updated)
+      setEditingIndex(null)
+    } catch (err) {
+      console.error('Error saving experience entry:', err)
+      alert('Failed to save experience entry')
+    } finally {
+      setSaving(false)
+    }
+  }
+
+  const handleCancel = () => {
+    // A new entry that was never saved is discarded
+    if (editingIndex !== null && !experience[editingIndex].id) {
+      setExperience(experience.filter((_, i) => i !== editingIndex))
+    }
     setEditingIndex(null)
   }
 
-  const handleDelete = (index: number) => {
+  const handleDelete = async (index: number) => {
     if (confirm('Are you sure you want to delete this experience entry?')) {
-      const updated = experience.filter((_, i) => i !== index)
-      setExperience(updated)
-      if (editingIndex === index) {
-        setEditingIndex(null)
+      const id = experience[index].id
+      try {
+        if (id) {
+          await portfolioAPI.deleteItem('experience', id)
+        }
+        setExperience(experience.filter((_, i) => i !== index))
+        if (editingIndex === index) {
+          setEditingIndex(null)
+        }
+      } catch (err) {
+        console.error('Error deleting experience entry:', err)
+        alert('Failed to delete experience entry')
       }
     }
   }
@@ -146,13 +160,6 @@ export default function EditExperiencePage() {
             >
               Add Experience
             </button>
-            <button
-              onClick={handleSave}
-              disabled={saving}
-              className="px-4 py-2 bg-primary-600 text-white rounded-lg hover:bg-primary-700 disabled:opacity-50"
-            >
-              {saving ? 'Saving...' : 'Save All'}
-            </button>
           </div>
         </div>
 
@@ -263,12 +270,13 @@ export default function EditExperiencePage() {
                   <div className="flex gap-2">
                     <button
                       onClick={handleUpdate}
-                      className="px-4 py-2 bg-primary-600 text-white rounded-lg"
+                      disabled={saving}
+                      className="px-4 py-2 bg-primary-600 text-white rounded-lg disabled:opacity-50"
                     >
-                      Update
+                      {saving ? 'Saving...' : 'Update'}
                     </button>
                     <button
-                      onClick={() => setEditingIndex(null)}
+                      onClick={handleCancel}
                       className="px-4 py-2 bg-gray-600 text-white rounded-lg"
                     >
                       Cancel
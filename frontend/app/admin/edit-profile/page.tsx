@@ -26,7 +26,9 @@ export default function EditProfilePage() {
 
   const fetchProfile = async () => {
     try {
-      const response = await portfolioAPI.get()
+      const response = await portfolioAPI.get({
+        fields: 'profile_pic_url,bio,email,social_links,about_content',
+      })
       const data = response.data.data
       setFormData({
         profile_pic_url: data.profile_pic_url || '',
@@ -52,7 +54,11 @@ export default function EditProfilePage() {
     setSaving(true)
 
     try {
-      await portfolioAPI.update(formData)
+      const { about_content, ...profile } = formData
+      await Promise.all([
+        portfolioAPI.updateSection('profile', profile),
+        portfolioAPI.updateSection('about', { about_content }),
+      ])
       alert('Profile updated successfully!')
     } catch (err: any) {
       console.error('Error updating profile:', err)
@@ -33,7 +33,7 @@ export default function EditProjectsPage() {
 
   const fetchProjects = async () => {
     try {
-      const response = await portfolioAPI.get()
+      const response = await portfolioAPI.get({ fields: 'projects' })
       setProjects(response.data.data.projects || [])
     } catch (err) {
       console.error('Error fetching projects:', err)
@@ -42,23 +42,9 @@ export default function EditProjectsPage() {
     }
   }
 
-  const handleSave = async () => {
-    setSaving(true)
-    try {
-      await portfolioAPI.update({ projects })
-      alert('Projects updated successfully!')
-      setEditingIndex(null)
-    } catch (err) {
-      console.error('Error saving projects:', err)
-      alert('Failed to save projects')
-    } finally {
-      setSaving(false)
-    }
-  }
-
   const handleAdd = () => {
+    // Saved (and given an id) on Update
     const newProject: Project = {
-      id: Date.now().toString(),
       title: '',
       description: '',
       image_url: '',
@@ -75,20 +61,48 @@ export default function EditProjectsPage() {
     setFormData(projects[index])
   }
 
-  const handleUpdate = () => {
+  const handleUpdate = async () => {
     if (editingIndex === null) return
-    const updated = [...projects]
-    updated[editingIndex] = { ...formData }
-    setProjects(updated)
+    setSaving(true)
+    try {
+      const { id, ...data } = formData
+      const response = id
+        ? await portfolioAPI.updateItem('projects', id, data)
+        : await portfolioAPI.createItem('projects', data)
+      const updated = [...projects]
+      updated[editingIndex] = response.data.data
+      setProjects(updated)
+      setEditingIndex(null)
+    } catch (err) {
+      console.error('Error saving project:', err)
+      alert('Failed to save project')
+    } finally {
+      setSaving(false)
+    }
+  }
+
+  const handleCancel = () => {
+    // A new entry that was never saved is discarded
+    if (editingIndex !== null && !projects[editingIndex].id) {
+      setProjects(projects.filter((_, i) => i !== editingIndex))
+    }
     setEditingIndex(null)
   }
 
-  const handleDelete = (index: number) => {
+  const handleDelete = async (index: number) => {
     if (confirm('Are you sure you want to delete this project?')) {
-      const updated = projects.filter((_, i) => i !== index)
-      setProjects(updated)
-      if (editingIndex === index) {
-        setEditingIndex(null)
+      const id = projects[index].id
+      try {
+        if (id) {
+          await portfolioAPI.deleteItem('projects', id)
+        }
+        setProjects(projects.filter((_, i) => i !== index))
+        if (editingIndex === index) {
+          setEditingIndex(null)
+        }
+      } catch (err) {
+        console.error('Error deleting project:', err)
+        alert('Failed to delete project')
       }
     }
   }
@@ -123,13 +137,6 @@ export default function EditProjectsPage() {
             >
               Add Project
             </button>
-            <button
-              onClick={handleSave}
-              disabled={saving}
-              className="px-4 py-2 bg-primary-600 text-white rounded-lg hover:bg-primary-700 disabled:opacity-50"
-            >
-              {saving ? 'Saving...' : 'Save All'}
-            </button>
           </div>
         </div>
 
@@ -209,12 +216,13 @@ export default function EditProjectsPage() {
                   <div className="flex gap-2">
                     <button
                       onClick={handleUpdate}
-                      className="px-4 py-2 bg-primary-600 text-white rounded-lg"
+                      disabled={saving}
+                      className="px-4 py-2 bg-primary-600 text-white rounded-lg disabled:opacity-50"
                     >
-                      Update
+                      {saving ? 'Saving...' : 'Update'}
                     </button>
                     <button
-                      onClick={() => setEditingIndex(null)}
+                      onClick={handleCancel}
                       className="px-4 py-2 bg-gray-600 text-white rounded-lg"
                     >
                       Cancel
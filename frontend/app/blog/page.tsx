@@ -2,7 +2,7 @@
 
 import { motion } from 'framer-motion'
 import { useEffect, useState } from 'react'
-import { blogsAPI } from '@/lib/api'
+import { bootstrapAPI } from '@/lib/api'
 import BlogCard from '@/components/BlogCard'
 
 export default function BlogPage() {
@@ -17,8 +17,14 @@ export default function BlogPage() {
   const fetchBlogs = async () => {
     try {
       setLoading(true)
-      const response = await blogsAPI.getAll({ limit: 50 })
-      setBlogs(response.data.data.items || [])
+      // Posts and fresh like counts in one request
+      const response = await bootstrapAPI.get({ limit: 50 })
+      const { blogs: items, likes } = response.data.data
+      setBlogs(
+        items.map((blog: any) =>
+          blog.blogId in likes ? { ...blog, likes_count: likes[blog.blogId] } : blog
+        )
+      )
       setError(null)
     } catch (err: any) {
       console.error('Error fetching blogs:', err)
@@ -3,7 +3,7 @@
 import Hero from '@/components/Hero'
 import { motion } from 'framer-motion'
 import { useEffect, useState } from 'react'
-import { portfolioAPI } from '@/lib/api'
+import { bootstrapAPI } from '@/lib/api'
 import ProjectCard from '@/components/ProjectCard'
 
 export default function Home() {
@@ -11,10 +11,10 @@ export default function Home() {
   const [loading, setLoading] = useState(true)
 
   useEffect(() => {
-    portfolioAPI
+    bootstrapAPI
       .get()
       .then((res) => {
-        setPortfolio(res.data.data)
+        setPortfolio(res.data.data.portfolio)
       })
       .catch((err) => {
         console.error('Error fetching portfolio:', err)
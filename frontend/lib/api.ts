@@ -20,19 +20,50 @@ api.interceptors.request.use((config) => {
   return config
 })
 
+// One refresh at a time: a refresh token works once, so concurrent 401s share the same request
+let refreshing: Promise<string> | null = null
+
+const refreshAccessToken = (): Promise<string> => {
+  if (!refreshing) {
+    const refreshToken = localStorage.getItem('refresh_token')
+    refreshing = (refreshToken
+      ? axios.post(`${API_BASE_URL}/auth/refresh`, { refresh_token: refreshToken }).then((response) => {
+          const { access_token, refresh_token } = response.data.data
+          localStorage.setItem('access_token', access_token)
+          localStorage.setItem('refresh_token', refresh_token)
+          return access_token as string
+        })
+      : Promise.reject(new Error('No refresh token'))
+    ).finally(() => {
+      refreshing = null
+    })
+  }
+  return refreshing
+}
+
 // Handle auth errors
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
-    if (error.response?.status === 401) {
-      // Clear tokens and redirect to login
-      if (typeof window !== 'undefined') {
-        localStorage.removeItem('access_token')
-        localStorage.removeItem('refresh_token')
-        if (window.location.pathname.startsWith('/admin')) {
-          window.location.href = '/admin/login'
+  async (error) => {
+    const original = error.config
+    if (error.response?.status === 401 && typeof window !== 'undefined') {
+      // Retry once with a refreshed access token
+      if (original && !original._retried && !original.url?.startsWith('/auth/')) {
+        original._retried = true
+        try {
+          const token = await refreshAccessToken()
+          original.headers.Authorization = `Bearer ${token}`
+          return api(original)
+        } catch {
+          // Fall through to logging out
         }
       }
+      // Clear tokens and redirect to login
+      localStorage.removeItem('access_token')
+      localStorage.removeItem('refresh_token')
+      if (window.location.pathname.startsWith('/admin')) {
+        window.location.href = '/admin/login'
+      }
     }
     return Promise.reject(error)
   }
@@ -42,25 +73,60 @@ export default api
 
 // API functions
 export const portfolioAPI = {
-  get: () => api.get('/portfolio'),
+  get: (params?: { fields?: string }) => api.get('/portfolio', { params }),
   update: (data: any) => api.put('/portfolio', data),
+  updateSection: (section: 'profile' | 'about', data: any) => api.put(`/portfolio/${section}`, data),
+  createItem: (section: 'projects' | 'experience', data: any) => api.post(`/portfolio/${section}`, data),
+  updateItem: (section: 'projects' | 'experience', id: string, data: any) =>
+    api.put(`/portfolio/${section}/${id}`, data),
+  deleteItem: (section: 'projects' | 'experience', id: string) => api.delete(`/portfolio/${section}/${id}`),
 }
 
 export const blogsAPI = {
-  getAll: (params?: { limit?: number; last_key?: string }) =>
+  getAll: (params?: { limit?: number; last_key?: string; fields?: string }) =>
     api.get('/blogs', { params }),
-  getById: (id: string) => api.get(`/blogs/${id}`),
+  getById: (id: string, params?: { fields?: string }) => api.get(`/blogs/${id}`, { params }),
+  getTrending: (params?: { limit?: number }) => api.get('/blogs/trending', { params }),
+  getArchive: () => api.get('/blogs/archive'),
+  getArchiveMonth: (month: string, params?: { limit?: number; cursor?: string }) =>
+    api.get(`/blogs/archive/${month}`, { params }),
   create: (data: any) => api.post('/blogs', data),
   update: (id: string, data: any) => api.put(`/blogs/${id}`, data),
   delete: (id: string) => api.delete(`/blogs/${id}`),
+  bulk: (operations: any[], atomic = false) => api.post('/blogs/bulk', { operations, atomic }),
+}
+
+export const bootstrapAPI = {
+  get: (params?: { limit?: number }) => api.get('/bootstrap', { params }),
 }
 
 export const likesAPI = {
   get: (blogId: string) => api.get(`/blogs/${blogId}/likes`),
+  getMany: (blogIds: string[]) => api.get('/blogs/likes', { params: { ids: blogIds.join(',') } }),
   add: (blogId: string) => api.post(`/blogs/${blogId}/likes`),
 }
 
 export const authAPI = {
   login: (email: string, password: string) =>
     api.post('/auth/login', { email, password }),
+  refresh: (refreshToken: string) =>
+    api.post('/auth/refresh', { refresh_token: refreshToken }),
+}
+
+export const commentsAPI = {
+  get: (blogId: string, params?: { limit?: number; cursor?: string }) =>
+    api.get(`/blogs/${blogId}/comments`, { params }),
+  create: (blogId: string, data: { author_name: string; author_email?: string; content: string }) =>
+    api.post(`/blogs/${blogId}/comments`, data),
+  getPending: (params?: { limit?: number; cursor?: string }) =>
+    api.get('/comments/pending', { params }),
+  moderate: (blogId: string, commentId: string, status: 'approved' | 'rejected') =>
+    api.put(`/blogs/${blogId}/comments/${commentId}`, { status }),
+  delete: (blogId: string, commentId: string) =>
+    api.delete(`/blogs/${blogId}/comments/${commentId}`),
+}
+
+export const analyticsAPI = {
+  getViews: (blogId: string, params?: { granularity?: 'day' | 'month'; from?: string; to?: string }) =>
+    api.get(`/blogs/${blogId}/views`, { params }),
 }